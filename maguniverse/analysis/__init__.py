@@ -0,0 +1,43 @@
+# DCF estimates
+from maguniverse.analysis.dcf import (dcf_inputs, dcf_variants, default_scatter, dcf_field,
+                                      dcf_table, dcf_monte_carlo)
+# Zeeman B - n inference
+from maguniverse.analysis.zeeman_bayes import (ProjectionTable, ZeemanFit, projection_table,
+                                               fit_zeeman, sample_zeeman)
+# Angular dispersion functions
+from maguniverse.analysis.adf import adf_catalogs, angular_dispersion, dispersion_all
+# Stokes parameters and regridding
+from maguniverse.analysis.stokes import (stokes_catalogs, debias_estimators, debias_p,
+                                         stokes_table, regrid_stokes)
+# Alignment statistics
+from maguniverse.analysis.alignment import (alignment_models, alignment_catalogs, ReferenceCDF,
+                                            projected_angles, reference_cdf, ks_ad,
+                                            angle_differences, alignment_test)
+
+__all__ = [ "dcf_inputs",
+            "dcf_variants",
+            "default_scatter",
+            "dcf_field",
+            "dcf_table",
+            "dcf_monte_carlo",
+            "ProjectionTable",
+            "ZeemanFit",
+            "projection_table",
+            "fit_zeeman",
+            "sample_zeeman",
+            "adf_catalogs",
+            "angular_dispersion",
+            "dispersion_all",
+            "stokes_catalogs",
+            "debias_estimators",
+            "debias_p",
+            "stokes_table",
+            "regrid_stokes",
+            "alignment_models",
+            "alignment_catalogs",
+            "ReferenceCDF",
+            "projected_angles",
+            "reference_cdf",
+            "ks_ad",
+            "angle_differences",
+            "alignment_test"]
@@ -0,0 +1,591 @@
+# -*- coding: utf-8 -*-
+"""
+zeeman_bayes.py
+-----------
+
+Bayesian inference of the total field strength - density relation from
+Zeeman measurements, after Crutcher et al. (2010).
+
+The model: the total field of a cloud of density ``n`` is uniformly
+distributed between ``f B_max(n)`` and ``B_max(n)``, with
+
+    B_max(n) = B0                  for n < n0
+    B_max(n) = B0 (n / n0)^alpha   for n >= n0,
+
+its direction is isotropic, and the measured line-of-sight component
+``B_Z`` carries Gaussian noise ``sigma``. Integrating over the direction
+and the noise, one measurement has the likelihood
+
+    L(B_max, f) = [J(B_max) - J(f B_max)] / ((1 - f) B_max),
+    J(B) = int_0^B [Phi((b - |B_Z|) / sigma) - Phi((-b - |B_Z|) / sigma)] / (2 b) db,
+
+where the projection integral ``J`` depends on the measurement only. `J` is
+tabulated once per measurement on a log-spaced field grid shared by all
+measurements (`ProjectionTable`), memoized in memory per measurement and on
+disk per catalog, so a refit, or a fit of a catalog with a few new rows,
+only looks values up. `fit_zeeman` turns the tables of a chunk of
+measurements into ln L at every field node and each f of the grid; every
+point of the parameter grid then reads its ln L by one broadcast,
+interpolated gather at its B_max, in place of two table lookups and a log
+per point. `sample_zeeman` runs Metropolis chains on the same tables,
+optionally one process per chain.
+
+References
+----------
+.. [1] Crutcher, R. M., Wandelt, B., Heiles, C., Falgarone, E., & Troland, T. H. (2010)
+       The Astrophysical Journal, 725(1), 466-479. DOI: 10.1088/0004-637X/725/1/466
+"""
+
+import hashlib
+import math
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+try:
+    from scipy.special import ndtr as _ndtr
+    _HAS_SCIPY = True
+except ImportError:  # pragma: no cover - optional dependency
+    _HAS_SCIPY = False
+
+from maguniverse.utils.table_cache import get_default_table_cache
+
+# Bump to invalidate cached projection tables after a change to their layout
+_TABLE_VERSION = 1
+# Field grid of the projection tables (μG), uniform in ln B
+_LN_B_MIN = math.log(1e-3)
+_LN_B_MAX = math.log(1e10)
+_N_NODES = 12288
+_LN_B_STEP = (_LN_B_MAX - _LN_B_MIN) / (_N_NODES - 1)
+# Grid points x measurements evaluated at once
+_BLOCK_SIZE = 1 << 19
+
+# Columns of `get_crutcher2010` read by default
+zeeman_columns = {'n': 'n_H (cm^-3)', 'b_z': 'B_Z (muG)', 'sigma': 'sigma (muG)'}
+# Parameters of the model, in grid order
+zeeman_parameters = ['B0', 'n0', 'alpha', 'f']
+
+_rows_cache = {}
+_rows_cache_lock = threading.Lock()
+
+
+def default_grid():
+    """
+    Default parameter grid of `fit_zeeman`.
+
+    B0 (μG) and n0 (cm^-3) are log-spaced, i.e. log-uniform priors; alpha
+    and f are linear.
+
+    Returns
+    -------
+    dict
+        Parameter name to 1-D array of grid values.
+    """
+    return {
+        'B0': np.geomspace(1.0, 100.0, 41),
+        'n0': np.geomspace(10.0, 1e4, 41),
+        'alpha': np.linspace(0.3, 1.0, 29),
+        'f': np.linspace(0.0, 0.95, 20),
+    }
+
+
+def _phi(x):
+    """Standard normal CDF."""
+    if _HAS_SCIPY:
+        return _ndtr(x)
+    return 0.5 * np.vectorize(math.erfc, otypes=[np.float64])(-np.asarray(x) / math.sqrt(2.0))
+
+
+def _projection_rows(b_z, sigma):
+    """Projection integrals J on the field grid, one row per measurement."""
+    b = np.exp(_LN_B_MIN + _LN_B_STEP * np.arange(_N_NODES))
+    t = np.abs(b_z)[:, None]
+    s = sigma[:, None]
+    # Phi(a) - Phi(-b) written with arguments <= 0 where the tails are accurate
+    kernel = (_phi((b - t) / s) - _phi((-b - t) / s)) / (2.0 * b)
+    # J below the first node: the kernel there is its limit at b = 0
+    start = kernel[:, :1] * b[0]
+    steps = 0.5 * (kernel[:, 1:] + kernel[:, :-1]) * np.diff(b)
+    return np.concatenate([start, start + np.cumsum(steps, axis=1)], axis=1), kernel[:, 0]
+
+
+class ProjectionTable():
+    """
+    Projection integrals of a set of Zeeman measurements.
+
+    Parameters
+    ----------
+    b_z, sigma : array-like
+        Line-of-sight field strengths and their uncertainties (μG).
+    """
+
+    def __init__(self, b_z, sigma) -> None:
+        self.b_z = np.asarray(b_z, dtype=np.float64)
+        self.sigma = np.asarray(sigma, dtype=np.float64)
+        self.cumulative, self.density = self._rows()
+        # flat view for broadcast lookups
+        self._flat = self.cumulative.ravel()
+        self._offsets = np.arange(len(self.b_z)) * _N_NODES
+        return
+
+    def _rows(self):
+        """Rows of the memoized measurements, computing only the new ones."""
+        keys = list(zip(np.abs(self.b_z).tolist(), self.sigma.tolist()))
+        with _rows_cache_lock:
+            missing = sorted({key for key in keys if key not in _rows_cache})
+        if missing:
+            values = np.array(missing, dtype=np.float64).reshape(-1, 2)
+            cumulative, density = _projection_rows(values[:, 0], values[:, 1])
+            with _rows_cache_lock:
+                for key, row, k0 in zip(missing, cumulative, density):
+                    _rows_cache[key] = (row, k0)
+        with _rows_cache_lock:
+            rows = [_rows_cache[key] for key in keys]
+        cumulative = np.array([row for row, _ in rows]).reshape(len(keys), _N_NODES)
+        return cumulative, np.array([k0 for _, k0 in rows], dtype=np.float64)
+
+    def __len__(self):
+        return len(self.b_z)
+
+    def lookup(self, ln_b, rows=None):
+        """
+        J at fields ``exp(ln_b)``.
+
+        Parameters
+        ----------
+        ln_b : numpy.ndarray
+            ln B (μG), of shape (..., measurements); -inf stands for B = 0.
+        rows : numpy.ndarray, optional
+            Measurements along the last axis of `ln_b`, if not all.
+
+        Returns
+        -------
+        numpy.ndarray
+            J of each measurement, shaped like `ln_b`.
+        """
+        position = ln_b - _LN_B_MIN
+        position *= 1.0 / _LN_B_STEP
+        node = np.clip(position, 0.0, _N_NODES - 1.000001)
+        weight = node.copy()
+        node = node.astype(np.intp)
+        weight -= node
+        rows = slice(None) if rows is None else rows
+        node += self._offsets[rows]
+        values = self._flat[node + 1]
+        values -= self._flat[node]
+        values *= weight
+        values += self._flat[node]
+        below = position < 0
+        if below.any():
+            # J grows linearly below the grid
+            density = np.broadcast_to(self.density[rows], ln_b.shape)
+            values[below] = density[below] * np.exp(ln_b[below])
+        above = position > _N_NODES - 1
+        if above.any():
+            # the kernel falls as 1 / (2 B) above the grid
+            last = np.broadcast_to(self.cumulative[rows, -1], ln_b.shape)
+            values[above] = last[above] + 0.5 * (ln_b[above] - _LN_B_MAX)
+        return values
+
+    def save(self, path):
+        """Write the table to an ``.npz`` file."""
+        np.savez(path, version=_TABLE_VERSION, b_z=self.b_z, sigma=self.sigma,
+                 cumulative=self.cumulative, density=self.density)
+
+    @classmethod
+    def load(cls, path):
+        """Read a table written by `save`; None if it is unusable."""
+        try:
+            with np.load(path) as data:
+                if int(data['version']) != _TABLE_VERSION:
+                    return None
+                table = cls.__new__(cls)
+                table.b_z, table.sigma = data['b_z'], data['sigma']
+                table.cumulative, table.density = data['cumulative'], data['density']
+        except (OSError, KeyError, ValueError):
+            return None
+        if table.cumulative.shape != (len(table.b_z), _N_NODES):
+            return None
+        table._flat = table.cumulative.ravel()
+        table._offsets = np.arange(len(table.b_z)) * _N_NODES
+        # later tables of the same measurements reuse these rows
+        with _rows_cache_lock:
+            for key, row, k0 in zip(zip(np.abs(table.b_z).tolist(), table.sigma.tolist()),
+                                    table.cumulative, table.density):
+                _rows_cache.setdefault(key, (row, k0))
+        return table
+
+
+def projection_table(b_z, sigma):
+    """
+    Return the `ProjectionTable` of a set of measurements, reusing cached tables.
+
+    Rows are memoized per measurement in memory; whole tables are stored as
+    ``.zeeman.npz`` files in the ``tables`` directory of the cache.
+
+    Parameters
+    ----------
+    b_z, sigma : array-like
+        Line-of-sight field strengths and their uncertainties (μG).
+
+    Returns
+    -------
+    ProjectionTable
+    """
+    b_z = np.ascontiguousarray(b_z, dtype=np.float64)
+    sigma = np.ascontiguousarray(sigma, dtype=np.float64)
+    digest = hashlib.sha256(f"zeeman:{_TABLE_VERSION}:{_N_NODES}:{len(b_z)}".encode('utf-8'))
+    digest.update(np.abs(b_z).tobytes())
+    digest.update(sigma.tobytes())
+
+    cache_dir = get_default_table_cache().cache_dir
+    path = os.path.join(cache_dir, digest.hexdigest() + '.zeeman.npz')
+    table = ProjectionTable.load(path) if os.path.exists(path) else None
+    if table is None:
+        table = ProjectionTable(b_z, sigma)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp.npz"
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            table.save(tmp_path)
+            os.replace(tmp_path, path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+    return table
+
+
+def _measurements(df, columns):
+    """ln n, B_Z and sigma of the usable rows, and their index labels."""
+    columns = {**zeeman_columns, **(columns or {})}
+    n, b_z, sigma = (pd.to_numeric(df[columns[name]], errors='coerce')
+                     .to_numpy(dtype=np.float64, na_value=np.nan)
+                     for name in ('n', 'b_z', 'sigma'))
+    usable = np.isfinite(b_z) & (n > 0) & (sigma > 0)
+    return np.log(n[usable]), b_z[usable], sigma[usable], df.index[usable]
+
+
+def _log_likelihood(table, ln_n, ln_b0, ln_n0, alpha, f):
+    """
+    Summed ln L over the measurements.
+
+    `ln_b0`, `ln_n0` and `alpha` are broadcast together to shape (m,); `f`
+    has shape (k,). Returns shape (m, k).
+    """
+    # ln B_max of every point and measurement: (m, N)
+    ln_b_max = ln_b0[:, None] + alpha[:, None] * np.maximum(ln_n[None, :] - ln_n0[:, None], 0.0)
+    upper = table.lookup(ln_b_max)
+    # J at f B_max: (m, k, N); J(0) = 0
+    positive = f > 0
+    difference = np.repeat(upper[:, None, :], len(f), axis=1)
+    if positive.any():
+        lower = ln_b_max[:, None, :] + np.log(f[positive])[None, :, None]
+        difference[:, positive] -= table.lookup(lower)
+    np.maximum(difference, np.finfo(np.float64).tiny, out=difference)
+    ln_l = np.log(difference).sum(axis=2)
+    ln_l -= ln_b_max.sum(axis=1)[:, None]
+    ln_l -= len(ln_n) * np.log1p(-f)[None, :]
+    return ln_l
+
+
+def _node_log_likelihood(table, rows, f, nodes):
+    """
+    ln L of measurements `rows` with B_max at the given nodes of the field grid.
+
+    Returns float32 values and slopes to the next node, of shape
+    (k, rows, nodes).
+    """
+    x = _LN_B_MIN + _LN_B_STEP * nodes
+    upper = table.cumulative[rows][:, nodes]
+    ln_l = np.empty((len(f), len(rows), len(nodes)))
+    for i, value in enumerate(f):
+        difference = upper.copy()
+        if value > 0:
+            difference -= table.lookup(np.repeat(x[:, None] + np.log(value), len(rows), axis=1),
+                                       rows).T
+        np.maximum(difference, np.finfo(np.float64).tiny, out=difference)
+        ln_l[i] = np.log(difference) - x - np.log1p(-value)
+    slopes = np.diff(ln_l, axis=2, append=ln_l[:, :, -1:])
+    return ln_l.astype(np.float32), slopes.astype(np.float32)
+
+
+class ZeemanFit():
+    """
+    Posterior of the B - n relation over a parameter grid.
+
+    Attributes
+    ----------
+    grid : dict
+        Parameter name to its grid values.
+    log_likelihood : numpy.ndarray
+        Summed ln L, of shape (B0, n0, alpha, f).
+    rows : pandas.Index
+        Index labels of the measurements used.
+    """
+
+    def __init__(self, grid, log_likelihood, rows) -> None:
+        self.grid = grid
+        self.log_likelihood = log_likelihood
+        self.rows = rows
+        return
+
+    @property
+    def posterior(self):
+        """Posterior probability of each grid point (flat prior over the grid)."""
+        weights = np.exp(self.log_likelihood - np.max(self.log_likelihood))
+        return weights / weights.sum()
+
+    @property
+    def best(self):
+        """Parameters of the most probable grid point."""
+        point = np.unravel_index(np.argmax(self.log_likelihood), self.log_likelihood.shape)
+        return {name: float(self.grid[name][i]) for name, i in zip(zeeman_parameters, point)}
+
+    def marginal(self, name):
+        """
+        Marginal posterior of one parameter.
+
+        Returns
+        -------
+        pandas.Series
+            Probability of each grid value of `name`.
+        """
+        axis = zeeman_parameters.index(name)
+        other = tuple(i for i in range(len(zeeman_parameters)) if i != axis)
+        return pd.Series(self.posterior.sum(axis=other), index=self.grid[name], name=name)
+
+    def summary(self, percentiles=(16, 50, 84)):
+        """
+        Percentiles of the marginal posteriors.
+
+        Returns
+        -------
+        pandas.DataFrame
+            One row per parameter, one column per percentile, plus 'best'.
+        """
+        rows = {}
+        for name in zeeman_parameters:
+            marginal = self.marginal(name)
+            cdf = np.cumsum(marginal.to_numpy())
+            values = marginal.index.to_numpy(dtype=np.float64)
+            rows[name] = [float(np.interp(p / 100.0, cdf, values)) for p in percentiles] \
+                + [self.best[name]]
+        return pd.DataFrame.from_dict(rows, orient='index',
+                                      columns=[f"p{p:g}" for p in percentiles] + ['best'])
+
+
+def fit_zeeman(df, grid=None, columns=None):
+    """
+    Grid posterior of the Crutcher et al. (2010) B - n model.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Zeeman measurements, e.g. ``get_crutcher2010()``. Rows missing a
+        density, field or uncertainty are left out.
+    grid : dict, optional
+        Parameter name (see `zeeman_parameters`) to 1-D grid values;
+        parameters not given keep `default_grid`. f must stay below 1.
+    columns : dict, optional
+        Keys 'n', 'b_z', 'sigma' to column names, for tables whose columns
+        differ from `zeeman_columns`.
+
+    Returns
+    -------
+    ZeemanFit
+
+    Examples
+    --------
+    >>> fit = fit_zeeman(get_crutcher2010())
+    >>> fit.summary()
+    """
+    grid = {**default_grid(), **(grid or {})}
+    grid = {name: np.asarray(grid[name], dtype=np.float64).ravel() for name in zeeman_parameters}
+    if np.any(grid['f'] < 0) or np.any(grid['f'] >= 1):
+        raise ValueError("f must lie in [0, 1)")
+    if np.any(grid['B0'] <= 0) or np.any(grid['n0'] <= 0):
+        raise ValueError("B0 and n0 must be positive")
+    ln_n, b_z, sigma, rows = _measurements(df, columns)
+    table = projection_table(b_z, sigma)
+
+    # points of the (B0, n0, alpha) grid, flattened
+    ln_b0, ln_n0, alpha = (x.ravel() for x in np.meshgrid(
+        np.log(grid['B0']), np.log(grid['n0']), grid['alpha'], indexing='ij'))
+    f = grid['f']
+    log_likelihood = np.zeros((len(ln_b0), len(f)))
+    # measurements in chunks; each point of the grid reads the ln L of a
+    # chunk at its B_max by linear interpolation between nodes, for every f
+    chunk = max(1, _BLOCK_SIZE // max(1, len(ln_b0)))
+    for start in range(0, len(ln_n), chunk):
+        chunk_rows = np.arange(start, min(start + chunk, len(ln_n)))
+        ln_b_max = ln_b0[:, None] + alpha[:, None] * np.maximum(ln_n[chunk_rows] - ln_n0[:, None],
+                                                                0.0)
+        # B_max is clamped to the field grid, below which ln L is constant
+        position = np.clip((ln_b_max - _LN_B_MIN) / _LN_B_STEP, 0.0, _N_NODES - 1)
+        node = position.astype(np.intp)
+        weight = (position - node).astype(np.float32)
+        # ln L is tabulated over the nodes the chunk reaches only
+        first = node.min()
+        nodes = np.arange(first, min(node.max() + 2, _N_NODES))
+        values, slopes = _node_log_likelihood(table, chunk_rows, f, nodes)
+        node += np.arange(len(chunk_rows)) * len(nodes) - first
+        for i in range(len(f)):
+            ln_l = values[i].ravel()[node]
+            ln_l += weight * slopes[i].ravel()[node]
+            log_likelihood[:, i] += ln_l.sum(axis=1, dtype=np.float64)
+    shape = tuple(len(grid[name]) for name in zeeman_parameters)
+    return ZeemanFit(grid, log_likelihood.reshape(shape), rows)
+
+
+def _log_posterior(table, ln_n, theta, bounds):
+    """ln posterior at one point (ln B0, ln n0, alpha, f); flat inside `bounds`."""
+    if np.any(theta < bounds[:, 0]) or np.any(theta > bounds[:, 1]):
+        return -np.inf
+    ln_l = _log_likelihood(table, ln_n, theta[:1], theta[1:2], theta[2:3], theta[3:])
+    return float(ln_l[0, 0])
+
+
+def _run_chain(table, ln_n, start, step, bounds, n_steps, seed):
+    """Random-walk Metropolis chain; returns (samples, ln posterior)."""
+    rng = np.random.default_rng(seed)
+    theta = np.array(start, dtype=np.float64)
+    current = _log_posterior(table, ln_n, theta, bounds)
+    samples = np.empty((n_steps, len(theta)))
+    log_posterior = np.empty(n_steps)
+    jumps = rng.standard_normal((n_steps, len(theta))) * step
+    thresholds = np.log(rng.random(n_steps))
+    for i in range(n_steps):
+        proposal = theta + jumps[i]
+        value = _log_posterior(table, ln_n, proposal, bounds)
+        if value - current > thresholds[i]:
+            theta, current = proposal, value
+        samples[i] = theta
+        log_posterior[i] = current
+    return samples, log_posterior
+
+
+def sample_zeeman(df, n_steps=5000, n_chains=4, processes=None, bounds=None, step=None,
+                  start=None, seed=0, columns=None):
+    """
+    Metropolis samples of the Crutcher et al. (2010) B - n model.
+
+    Chains sample (ln B0, ln n0, alpha, f) under flat priors inside
+    `bounds`, i.e. log-uniform in B0 and n0. Each chain has its own seed
+    spawned from `seed`, so results do not depend on `processes`.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Zeeman measurements, e.g. ``get_crutcher2010()``.
+    n_steps : int, optional
+        Steps per chain.
+    n_chains : int, optional
+        Number of independent chains.
+    processes : int, optional
+        Worker processes; chains run in this process if None or 1.
+    bounds : dict, optional
+        Parameter name to (low, high); defaults span `default_grid`.
+    step : dict, optional
+        Parameter name to the proposal scale (in ln for B0 and n0).
+    start : dict, optional
+        Parameter name to the starting value of every chain; by default
+        the best point of a coarse `fit_zeeman` grid. Chains are scattered
+        around it by one proposal step.
+    seed : int, optional
+        Seed of the chains.
+    columns : dict, optional
+        Column names, as in `fit_zeeman`.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Columns 'chain', 'step', B0, n0, alpha, f and 'log_posterior', one
+        row per chain step. Discard the first steps as burn-in.
+    """
+    defaults = default_grid()
+    bounds = {**{name: (values.min(), values.max()) for name, values in defaults.items()},
+              **(bounds or {})}
+    step = {**{'B0': 0.1, 'n0': 0.2, 'alpha': 0.03, 'f': 0.05}, **(step or {})}
+    if start is None:
+        coarse = {name: np.linspace(*bounds[name], 9) if name in ('alpha', 'f')
+                  else np.geomspace(*bounds[name], 9) for name in zeeman_parameters}
+        start = fit_zeeman(df, grid=coarse, columns=columns).best
+    ln_n, b_z, sigma, _ = _measurements(df, columns)
+    table = projection_table(b_z, sigma)
+
+    # sampled in (ln B0, ln n0, alpha, f)
+    log_scale = np.array([True, True, False, False])
+    to_theta = lambda values: np.where(log_scale, np.log(np.maximum(values, 1e-300)), values)
+    theta_bounds = np.array([to_theta(np.array([bounds[name][i] for name in zeeman_parameters]))
+                             for i in (0, 1)]).T
+    theta_bounds[3, 1] = min(theta_bounds[3, 1], np.nextafter(1.0, 0.0))
+    theta_step = np.array([step[name] for name in zeeman_parameters], dtype=np.float64)
+    theta_start = to_theta(np.array([start[name] for name in zeeman_parameters]))
+
+    seeds = np.random.SeedSequence(seed).spawn(n_chains)
+    starts = [np.clip(theta_start + theta_step * np.random.default_rng(s).standard_normal(4),
+                      theta_bounds[:, 0], theta_bounds[:, 1]) for s in seeds]
+    arguments = [(table, ln_n, starts[i], theta_step, theta_bounds, n_steps, seeds[i])
+                 for i in range(n_chains)]
+    if processes is None or processes <= 1:
+        chains = [_run_chain(*args) for args in arguments]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            chains = list(pool.map(_run_chain, *zip(*arguments)))
+
+    parts = []
+    for i, (samples, log_posterior) in enumerate(chains):
+        part = pd.DataFrame(np.where(log_scale, np.exp(samples), samples),
+                            columns=zeeman_parameters)
+        part.insert(0, 'step', np.arange(n_steps))
+        part.insert(0, 'chain', i)
+        part['log_posterior'] = log_posterior
+        parts.append(part)
+    return pd.concat(parts, ignore_index=True)
+
+
+if __name__ == "__main__":
+    # Benchmark: grid posterior of a synthetic catalog, per-point loop vs. broadcast
+    import sys
+    import time
+
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 150
+    rng = np.random.default_rng(0)
+    n = 10 ** rng.uniform(1, 7, n_rows)
+    b_max = 10.0 * np.maximum(n / 300.0, 1.0) ** 0.65
+    b_true = b_max * rng.uniform(0.03, 1.0, n_rows) * rng.uniform(-1.0, 1.0, n_rows)
+    sigma = np.maximum(0.1 * np.abs(b_true), 3.0)
+    catalog = pd.DataFrame({'n_H (cm^-3)': n, 'sigma (muG)': sigma,
+                            'B_Z (muG)': b_true + sigma * rng.standard_normal(n_rows)})
+
+    t0 = time.perf_counter()
+    table = ProjectionTable(catalog['B_Z (muG)'], catalog['sigma (muG)'])
+    t_table = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    fit = fit_zeeman(catalog)
+    t_fit = time.perf_counter() - t0
+    # an updated catalog: one new measurement, the others memoized
+    catalog.loc[n_rows] = [1e4, 5.0, 40.0]
+    t0 = time.perf_counter()
+    fit_zeeman(catalog)
+    t_refit = time.perf_counter() - t0
+
+    # per-point loop over a slice of the grid, extrapolated to the full grid
+    ln_n, b_z, sig, _ = _measurements(catalog.iloc[:n_rows], None)
+    bounds = np.array([[-np.inf, np.inf]] * 4)
+    points = [(b0, n0, a, f) for b0 in fit.grid['B0'][:2] for n0 in fit.grid['n0'][:5]
+              for a in fit.grid['alpha'][:5] for f in fit.grid['f'][:4]]
+    t0 = time.perf_counter()
+    for b0, n0, a, f in points:
+        _log_posterior(table, ln_n, np.array([np.log(b0), np.log(n0), a, f]), bounds)
+    t_loop = (time.perf_counter() - t0) / len(points) * fit.log_likelihood.size
+
+    print(f"measurements     : {n_rows}")
+    print(f"grid points      : {fit.log_likelihood.size}")
+    print(f"projection table : {t_table:.2f} s")
+    print(f"per-point loop   : {t_loop:.1f} s (extrapolated)")
+    print(f"grid fit         : {t_fit:.2f} s")
+    print(f"refit, +1 row    : {t_refit:.2f} s")
+    print(fit.summary())
@@ -8,31 +8,16 @@ J/ApJS/125/161
 
 """
 
-from io import StringIO
-import pandas as pd
-
 from maguniverse.data.gas import gas_sources
 from maguniverse.utils import get_ascii, get_default_data_paths
+from maguniverse.utils.compact import compact_frame
+from maguniverse.utils.converters import attach_units
+from maguniverse.utils.fixed_width import FixedWidthSchema
+from maguniverse.utils.names import add_name_key
+from maguniverse.utils.table_cache import cached_parse, write_chunks, write_table
 
-def get_jijina1999(file_path=None, file_url=None, save_path=None, save_src_data_path=None):
-    """
-    Load the Jijina et al. (1999) Ammonia gas properties data table into a DataFrame.
-
-    Parameters
-    ----------
-    file_path : str, optional
-        Local filesystem path to the ASCII data. If None, defaults are used.
-    file_url : str, optional
-        URL to download the ASCII data. If None, defaults are used.
-    save_path : str, optional
-        If provided, the resulting DataFrame is written to this CSV path.
-    save_src_data_path : str, optional
-        If provided, the raw ASCII data is saved to this path.
-        
-    Returns
-    -------
-    DataFrame
-        Columns are:
+_JIJINA1999_SCHEMA = FixedWidthSchema(
+    names=[
         'Seq',              # Database reference number
         'n_Seq',            # Note on Seq
         'Name',             # Name of the NH_3_(1,1) source
@@ -47,18 +32,83 @@ def get_jijina1999(file_path=None, file_url=None, save_path=None, save_src_data_
         'R (pc)',           # Core size
         'u_R',              # Uncertainty
         'a/b'               # Projected aspect ratio
-    """
+    ],
+    colspecs=[
+        (0,  3),  # Seq (I3)
+        (4,  5),  # n_Seq (A1)
+        (6, 22),  # Name (a16)
+        (23, 27), # logNNH3 ([cm-2]) (F4.1)
+        (28, 29), # u_logNNH3 (A1)
+        (30, 35), # DVint (km/s) (F5.2)
+        (36, 37), # u_DVint (A1)
+        (38, 43), # Tkin (K) (F5.1)
+        (44, 45), # u_Tkin (A1)
+        (46, 50), # logNtot ([cm-3]) (F4.1)
+        (51, 52), # u_logNtot (A1)
+        (53, 58), # R (pc) (F5.2)
+        (59, 60), # u_R (A1)
+        (61, 65)  # a/b (F4.1)
+    ],
+    dtypes=['int', 'str', 'str', 'float', 'str', 'float', 'str', 'float', 'str',
+            'float', 'str', 'float', 'str', 'float'],
+)
+
+_JIJINA1999_UNITS = {
+    'logNNH3 ([cm-2])': '[cm-2]',
+    'DVint (km/s)': 'km/s',
+    'Tkin (K)': 'K',
+    'logNtot ([cm-3])': '[cm-3]',
+    'R (pc)': 'pc',
+}
+
+def _parse_jijina1999(src):
+    """Decode the fixed-width table at `src` with the compiled schema."""
+    df = _JIJINA1999_SCHEMA.decode_file(src, skiprows=55)
+    add_name_key(df, 'Name')
+    return attach_units(df, _JIJINA1999_UNITS)
+
+def _iter_parse_jijina1999(src, chunksize):
+    """Decode the fixed-width table at `src` in chunks of `chunksize` rows."""
+    for df in _JIJINA1999_SCHEMA.iter_decode_file(src, skiprows=55, chunksize=chunksize):
+        yield attach_units(add_name_key(df, 'Name'), _JIJINA1999_UNITS)
+
+def _fetch_jijina1999(file_path, file_url, save_src_data_path):
+    """Return the path of the raw ASCII file."""
     if file_path is None and file_url is None:
         file_path, file_url = get_default_data_paths(
             file_path,
             gas_sources['Jijina1999']['data_link']['t2_gas_properties']
         )
 
-    # Fetch raw ASCII (prefers local copy to avoid CAPTCHA)
-    raw = get_ascii(file_path, file_url, save_src_data_path, fmt='txt')
+    # Fetch raw ASCII (prefers local copy to avoid CAPTCHA), streamed to disk
+    return get_ascii(file_path, file_url, save_src_data_path, fmt='txt', stream=True)
+
+def get_jijina1999(file_path=None, file_url=None, save_path=None, save_src_data_path=None,
+                   compact=False):
+    """
+    Load the Jijina et al. (1999) Ammonia gas properties data table into a DataFrame.
 
-    # Define column names and read into DataFrame
-    column_names = [
+    Parameters
+    ----------
+    file_path : str, optional
+        Local filesystem path to the ASCII data. If None, defaults are used.
+    file_url : str, optional
+        URL to download the ASCII data. If None, defaults are used.
+    save_path : str, optional
+        If provided, the resulting DataFrame is written to this path (CSV, or
+        Parquet / Feather for a ``.parquet`` / ``.feather`` extension).
+    save_src_data_path : str, optional
+        If provided, the raw ASCII data is saved to this path.
+    compact : bool, optional
+        If True, repeated strings become categoricals, other strings
+        Arrow-backed strings, and numerics are downcast where precision
+        allows (see `maguniverse.utils.compact.compact_frame`). The memory
+        usage before and after is stored in ``df.attrs['memory_usage']``.
+        
+    Returns
+    -------
+    DataFrame
+        Columns are:
         'Seq',              # Database reference number
         'n_Seq',            # Note on Seq
         'Name',             # Name of the NH_3_(1,1) source
@@ -72,36 +122,53 @@ def get_jijina1999(file_path=None, file_url=None, save_path=None, save_src_data_
         'u_logNtot',        # Uncertainty
         'R (pc)',           # Core size
         'u_R',              # Uncertainty
-        'a/b'               # Projected aspect ratio
-    ]
-    colspecs = [
-        (0,  3),  # Seq (I3)
-        (4,  5),  # n_Seq (A1)
-        (6, 22),  # Name (a16)
-        (23, 27), # logNNH3 ([cm-2]) (F4.1)
-        (28, 29), # u_logNNH3 (A1)
-        (30, 35), # DVint (km/s) (F5.2)
-        (36, 37), # u_DVint (A1)
-        (38, 43), # Tkin (K) (F5.1)
-        (44, 45), # u_Tkin (A1)
-        (46, 50), # logNtot ([cm-3]) (F4.1)
-        (51, 52), # u_logNtot (A1)
-        (53, 58), # R (pc) (F5.2)
-        (59, 60), # u_R (A1)
-        (61, 65)  # a/b (F4.1)
-    ]      
-    df = pd.read_fwf(
-        StringIO(raw),
-        names=column_names,
-        skiprows=55,
-        colspecs=colspecs
-    )
+        'a/b',              # Projected aspect ratio
+        'name_key'          # Canonical key of Name (see maguniverse.utils.names)
+    """
+    src = _fetch_jijina1999(file_path, file_url, save_src_data_path)
+
+    # Decode the fixed-width table, or load the cached parse of the same file
+    df = cached_parse(src, _parse_jijina1999)
+
+    # Memory-compact dtypes, if requested
+    if compact:
+        df = compact_frame(df)
 
     if save_path:
-        df.to_csv(save_path, index=False)
+        write_table(df, save_path)
 
     return df
 
+def iter_jijina1999(file_path=None, file_url=None, save_path=None, save_src_data_path=None,
+                    chunksize=10000):
+    """
+    Iterate over the Jijina et al. (1999) Ammonia gas properties table in chunks.
+
+    Same table as `get_jijina1999`, decoded from disk `chunksize` lines at a
+    time, so that memory stays bounded.
+
+    Parameters
+    ----------
+    file_path : str, optional
+        Local filesystem path to the ASCII data. If None, defaults are used.
+    file_url : str, optional
+        URL to download the ASCII data. If None, defaults are used.
+    save_path : str, optional
+        If provided, each chunk is appended to this path as it is yielded
+        (CSV, or Parquet / Feather for a ``.parquet`` / ``.feather`` extension).
+    save_src_data_path : str, optional
+        If provided, the raw ASCII data is saved to this path.
+    chunksize : int, optional
+        Maximum number of rows per chunk.
+
+    Returns
+    -------
+    iterator of pandas.DataFrame
+        Chunks with the columns documented in `get_jijina1999`.
+    """
+    src = _fetch_jijina1999(file_path, file_url, save_src_data_path)
+    return write_chunks(_iter_parse_jijina1999(src, chunksize), save_path)
+
 if __name__ == "__main__":
     # Example usage
     import os
@@ -1,12 +1,16 @@
 # paper sources
 from maguniverse.data.polarization.sources import polarization_sources
 # getters
-from maguniverse.data.polarization.dotson2010 import get_dotson2010
-from maguniverse.data.polarization.matthews2009 import get_matthews2009
-from maguniverse.data.polarization.harris2018 import get_harris2018
+from maguniverse.data.polarization.dotson2010 import (get_dotson2010, iter_dotson2010,
+                                                    join_dotson2010)
+from maguniverse.data.polarization.matthews2009 import get_matthews2009, iter_matthews2009
+from maguniverse.data.polarization.harris2018 import get_harris2018, iter_harris2018
 
 __all__ = [ "polarization_sources",
             "get_dotson2010",
             "get_matthews2009",
-            "get_harris2018"]
-
+            "get_harris2018",
+            "iter_dotson2010",
+            "iter_matthews2009",
+            "iter_harris2018",
+            "join_dotson2010"]
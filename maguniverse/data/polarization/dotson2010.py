@@ -21,11 +21,30 @@ References
        DOI: 10.1088/0067-0049/186/2/406
 """
 
-from io import StringIO
+import numpy as np
 import pandas as pd
 
 from maguniverse.data.polarization import polarization_sources
 from maguniverse.utils import get_ascii, get_default_data_paths
+from maguniverse.utils.compact import compact_frame
+from maguniverse.utils.coordinates import add_coordinates, deproject_offsets, parse_sexagesimal
+from maguniverse.utils.converters import attach_units
+from maguniverse.utils.mrt import read_mrt_schema
+from maguniverse.utils.names import add_name_key, table_keys
+from maguniverse.utils.preslice import preslice, stream_preslice
+from maguniverse.utils.table_cache import cached_parse, split_frame, write_chunks, write_table
+
+# Units of the table 2 columns
+_T2_UNITS = {
+    'ΔR.A.': 'arcsec',
+    'ΔDecl.': 'arcsec',
+    'Δx': 'arcsec',
+    'Δy': 'arcsec',
+    'P': '%',
+    'sigma(P)': '%',
+    'theta': 'deg',
+    'sigma(theta)': 'deg',
+}
 
 
 def _get_table_config(table):
@@ -43,7 +62,8 @@ def _get_table_config(table):
         - column_names : list
             Names of columns in the table
         - skip_rows : int
-            Number of header rows to skip
+            Number of header rows to skip (for table 2, only used when the
+            file has no MRT header)
         - skip_footer : int
             Number of footer rows to skip
         - data_key_local : str
@@ -94,88 +114,14 @@ def _get_table_config(table):
         }
 
 
-def get_dotson2010(file_path=None, file_url=None, save_path=None, 
-                   save_src_data_path=None, table='t2'):
-    """Load the Dotson et al. (2010) polarization measurements into a DataFrame.
-
-    This function reads and processes the polarization data table from Dotson et al. (2010),
-    which contains measurements of dust emission polarization.
-
-    Parameters
-    ----------
-    file_path : str, optional
-        Local filesystem path to the ASCII data. If None, defaults are used.
-    file_url : str, optional
-        URL to download the ASCII data. If None, defaults are used.
-    save_path : str, optional
-        If provided, the resulting DataFrame is written to this CSV path.
-    save_src_data_path : str, optional
-        If provided, the raw ASCII data is saved to this path.
-    table : {'t1', 't2'}, optional
-        Which table to load:
-        - 't1': table 1 data
-        - 't2': table 2 data (default)
-
-    Returns
-    -------
-    pandas.DataFrame
-        For table='t2' (default):
-            A DataFrame containing the following columns:
-            - ID : Measurement identification number
-            - ΔR.A. : Right ascension offset (arcsec)
-            - ΔDecl. : Declination offset (arcsec)
-            - Δx : X-axis offset (arcsec)
-            - Δy : Y-axis offset (arcsec)
-            - P : Polarization percentage (%)
-            - sigma(P) : Uncertainty in polarization percentage (%)
-            - theta : Polarization angle (degrees)
-            - sigma(theta) : Uncertainty in polarization angle (degrees)
-            - Intensity : Measured intensity (units as in paper)
-            - sigma(Intensity) : Uncertainty in intensity
-            - Number of Observations : Number of independent measurements
-
-        For table='t1':
-            - Source : Source name
-            - Runs : Run number
-            - alpha (2000) : Right ascension (hh:mm:ss.s)
-            - delta (2000) : Declination (dd:mm:ss)
-            - l : Galactic longitude (deg)
-            - b : Galactic latitude (deg)
-            - Chop Throw : Chop throw (arcsec)
-            - Chop Angle : Chop angle (degrees E of N)
-            - Peak Intensity : Peak intensity (Jy beam^-1)
-            - Intensity Reference : Reference number
-            - Previously Published : Whether the source has been previously published
-
-    Raises
-    ------
-    ValueError
-        If table is not 't1' or 't2', or if both file_path and file_url are provided but point to different sources.
-    TypeError
-        If save_path or save_src_data_path are not strings when provided.
-    """
-    # Input validation
-    if table not in ['t1', 't2']:
-        raise ValueError("table must be either 't1' or 't2'")
-    if save_path is not None and not isinstance(save_path, str):
-        raise TypeError("save_path must be a string")
-    if save_src_data_path is not None and not isinstance(save_src_data_path, str):
-        raise TypeError("save_src_data_path must be a string")
-
-    # Get table configuration
+def _parse_dotson2010(src, table):
+    """Parse table `table` of Dotson et al. (2010) from the file at `src`."""
     config = _get_table_config(table)
 
-    # Get default paths if none provided
-    if file_path is None and file_url is None:
-        file_path, file_url = get_default_data_paths(
-            polarization_sources['Dotson2010']['data_link'][config['data_key_local']],
-            polarization_sources['Dotson2010']['data_link'][config['data_key_ascii']]
-        )
-
-    # Fetch raw ASCII (prefers local copy to avoid CAPTCHA)
-    raw = get_ascii(file_path, file_url, save_src_data_path, fmt='txt')
- 
     if table == 't1':
+        with open(src, 'r', encoding='utf-8') as f:
+            raw = f.read()
+
         # Table 1 has irregular spacing
         # Need to manually parse the data section
         lines = raw.split('\n')
@@ -232,23 +178,281 @@ def get_dotson2010(file_path=None, file_url=None, save_path=None,
         
         if current_row: parsed_data.append(current_row)
         df = pd.DataFrame(parsed_data) 
+        # Decimal-degree positions (the table lists Galactic l, b already)
+        add_coordinates(df,
+                        parse_sexagesimal(df['alpha (2000)'], hours=True),
+                        parse_sexagesimal(df['delta (2000)']))
+        add_name_key(df, 'Source')
 
     else:
         # table 2
+        # Header and footer are trimmed beforehand, so the C engine applies
         df = pd.read_csv(
-            StringIO(raw),
-            sep=r'\s+',         # Use regex to match whitespace
+            preslice(src, _t2_data_start(src, config), config['skip_footer']),
+            sep=r'\s+',         # Match whitespace
             names=config['column_names'],
-            skiprows=config['skip_rows'],
-            skipfooter=config['skip_footer'],
-            engine='python'     # Required for skipfooter
+            engine='c'
+        )
+        df = _finish_t2(df)
+
+    return df
+
+
+def _t2_data_start(src, config):
+    """Number of header lines of table 2."""
+    try:
+        # The data start right after the MRT byte-by-byte header
+        return read_mrt_schema(src).data_start
+    except ValueError:
+        return config['skip_rows']
+
+
+def _finish_t2(df):
+    """Restore the blanks in the IDs of table 2, add their name keys and attach the units."""
+    df['ID'] = df['ID'].str.replace('_', ' ')
+    add_name_key(df, 'ID')
+    return attach_units(df, _T2_UNITS)
+
+
+def _iter_parse_dotson2010(src, table, chunksize):
+    """Parse table `table` from the file at `src` in chunks of `chunksize` rows."""
+    if table == 't1':
+        # short table with continuation lines: parsed as a whole, then split
+        yield from split_frame(cached_parse(src, _parse_dotson2010, 't1'), chunksize)
+        return
+
+    config = _get_table_config(table)
+    # fixed float columns, so that every chunk has the same dtypes
+    floats = {name: 'float64' for name in config['column_names'][1:-1]}
+    reader = pd.read_csv(
+        stream_preslice(src, _t2_data_start(src, config), config['skip_footer']),
+        sep=r'\s+',
+        names=config['column_names'],
+        dtype=floats,
+        engine='c',
+        chunksize=chunksize
+    )
+    with reader:
+        for df in reader:
+            yield _finish_t2(df)
+
+
+def _fetch_dotson2010(file_path, file_url, save_path, save_src_data_path, table):
+    """Validate the getter arguments and return the path of the raw ASCII file."""
+    # Input validation
+    if table not in ['t1', 't2']:
+        raise ValueError("table must be either 't1' or 't2'")
+    if save_path is not None and not isinstance(save_path, str):
+        raise TypeError("save_path must be a string")
+    if save_src_data_path is not None and not isinstance(save_src_data_path, str):
+        raise TypeError("save_src_data_path must be a string")
+
+    # Get table configuration
+    config = _get_table_config(table)
+
+    # Get default paths if none provided
+    if file_path is None and file_url is None:
+        file_path, file_url = get_default_data_paths(
+            polarization_sources['Dotson2010']['data_link'][config['data_key_local']],
+            polarization_sources['Dotson2010']['data_link'][config['data_key_ascii']]
         )
-        df['ID'] = df['ID'].str.replace('_', ' ')
+
+    # Fetch raw ASCII (prefers local copy to avoid CAPTCHA), streamed to disk
+    return get_ascii(file_path, file_url, save_src_data_path, fmt='txt', stream=True)
+
+
+def get_dotson2010(file_path=None, file_url=None, save_path=None, 
+                   save_src_data_path=None, table='t2', compact=False):
+    """Load the Dotson et al. (2010) polarization measurements into a DataFrame.
+
+    This function reads and processes the polarization data table from Dotson et al. (2010),
+    which contains measurements of dust emission polarization.
+
+    Parameters
+    ----------
+    file_path : str, optional
+        Local filesystem path to the ASCII data. If None, defaults are used.
+    file_url : str, optional
+        URL to download the ASCII data. If None, defaults are used.
+    save_path : str, optional
+        If provided, the resulting DataFrame is written to this path (CSV, or
+        Parquet / Feather for a ``.parquet`` / ``.feather`` extension).
+    save_src_data_path : str, optional
+        If provided, the raw ASCII data is saved to this path.
+    table : {'t1', 't2'}, optional
+        Which table to load:
+        - 't1': table 1 data
+        - 't2': table 2 data (default)
+    compact : bool, optional
+        If True, repeated strings become categoricals, other strings
+        Arrow-backed strings, and numerics are downcast where precision
+        allows (see `maguniverse.utils.compact.compact_frame`). The memory
+        usage before and after is stored in ``df.attrs['memory_usage']``.
+
+    Returns
+    -------
+    pandas.DataFrame
+        For table='t2' (default):
+            A DataFrame containing the following columns:
+            - ID : Measurement identification number
+            - ΔR.A. : Right ascension offset (arcsec)
+            - ΔDecl. : Declination offset (arcsec)
+            - Δx : X-axis offset (arcsec)
+            - Δy : Y-axis offset (arcsec)
+            - P : Polarization percentage (%)
+            - sigma(P) : Uncertainty in polarization percentage (%)
+            - theta : Polarization angle (degrees)
+            - sigma(theta) : Uncertainty in polarization angle (degrees)
+            - Intensity : Measured intensity (units as in paper)
+            - sigma(Intensity) : Uncertainty in intensity
+            - Number of Observations : Number of independent measurements
+            - name_key : Canonical key of ID (see `maguniverse.utils.names`)
+
+        For table='t1':
+            - Source : Source name
+            - Runs : Run number
+            - alpha (2000) : Right ascension (hh:mm:ss.s)
+            - delta (2000) : Declination (dd:mm:ss)
+            - l : Galactic longitude (deg)
+            - b : Galactic latitude (deg)
+            - Chop Throw : Chop throw (arcsec)
+            - Chop Angle : Chop angle (degrees E of N)
+            - Peak Intensity : Peak intensity (Jy beam^-1)
+            - Intensity Reference : Reference number
+            - Previously Published : Whether the source has been previously published
+            - ra_deg, dec_deg : J2000 position in decimal degrees
+            - name_key : Canonical key of Source (see `maguniverse.utils.names`)
+
+    Raises
+    ------
+    ValueError
+        If table is not 't1' or 't2', or if both file_path and file_url are provided but point to different sources.
+    TypeError
+        If save_path or save_src_data_path are not strings when provided.
+    """
+    src = _fetch_dotson2010(file_path, file_url, save_path, save_src_data_path, table)
+
+    # Parse the table, or load the cached parse of the same file
+    df = cached_parse(src, _parse_dotson2010, table)
+
+    # Memory-compact dtypes, if requested
+    if compact:
+        df = compact_frame(df)
 
     # Save processed data if requested
     if save_path:
-        df.to_csv(save_path, index=False)
+        write_table(df, save_path)
+
+    return df
+
+
+def iter_dotson2010(file_path=None, file_url=None, save_path=None,
+                    save_src_data_path=None, table='t2', chunksize=10000):
+    """Iterate over the Dotson et al. (2010) polarization measurements in chunks.
+
+    Same table as `get_dotson2010`, yielded as typed DataFrames of at most
+    `chunksize` rows, so that memory stays bounded for any table size.
+    Table 2 is streamed from disk; the short table 1 is parsed as a whole.
+
+    Parameters
+    ----------
+    file_path : str, optional
+        Local filesystem path to the ASCII data. If None, defaults are used.
+    file_url : str, optional
+        URL to download the ASCII data. If None, defaults are used.
+    save_path : str, optional
+        If provided, each chunk is appended to this path as it is yielded
+        (CSV, or Parquet / Feather for a ``.parquet`` / ``.feather`` extension).
+        The file is complete once the iterator is exhausted.
+    save_src_data_path : str, optional
+        If provided, the raw ASCII data is saved to this path.
+    table : {'t1', 't2'}, optional
+        Which table to load (default 't2').
+    chunksize : int, optional
+        Maximum number of rows per chunk.
+
+    Returns
+    -------
+    iterator of pandas.DataFrame
+        Chunks with the columns documented in `get_dotson2010`; the index
+        continues across chunks. Arguments are checked and the raw data are
+        fetched when this function is called, parsing happens on iteration.
+
+    Examples
+    --------
+    >>> for chunk in iter_dotson2010(save_path='dotson2010t2.parquet'):
+    ...     pass
+    """
+    src = _fetch_dotson2010(file_path, file_url, save_path, save_src_data_path, table)
+    return write_chunks(_iter_parse_dotson2010(src, table, chunksize), save_path)
+
+
+def join_dotson2010(vectors=None, sources=None):
+    """Attach the parent source and the absolute position to every table 2 vector.
+
+    Each vector of table 2 is mapped to the table 1 source named by its ID
+    through a hashed name index (`pandas.Index.get_indexer`, one lookup per
+    vector), and its ΔR.A. / ΔDecl. offsets are deprojected from the source
+    position onto the sky in one vectorized pass (see
+    `maguniverse.utils.coordinates.deproject_offsets`).
+
+    Parameters
+    ----------
+    vectors : pandas.DataFrame, optional
+        Table 2, as returned by ``get_dotson2010(table='t2')``. Loaded with
+        the default paths if None.
+    sources : pandas.DataFrame, optional
+        Table 1, as returned by ``get_dotson2010(table='t1')``. Loaded with
+        the default paths if None.
+
+    Returns
+    -------
+    pandas.DataFrame
+        A copy of `vectors` with the additional columns
+        - Source : Matching table 1 source name (NaN if none)
+        - ra_deg, dec_deg : Absolute J2000 position of the vector (degrees)
+        - l_deg, b_deg : Galactic longitude and latitude (degrees)
+
+        Names match by their canonical keys (see `maguniverse.utils.names`),
+        i.e. regardless of case and separators, and through aliases. Vectors
+        without a matching source have NaN positions; their number is
+        stored in ``df.attrs['unmatched']``.
+    """
+    if vectors is None:
+        vectors = get_dotson2010(table='t2')
+    if sources is None:
+        sources = get_dotson2010(table='t1')
+
+    if 'ra_deg' in sources and 'dec_deg' in sources:
+        ra0, dec0 = sources['ra_deg'].to_numpy(), sources['dec_deg'].to_numpy()
+    else:
+        ra0 = parse_sexagesimal(sources['alpha (2000)'], hours=True)
+        dec0 = parse_sexagesimal(sources['delta (2000)'])
+
+    # hashed index of the source names; the first of duplicate names wins
+    keys = pd.Index(table_keys(sources))
+    first = ~keys.duplicated()
+    index = keys[first]
+    vector_keys = table_keys(vectors)
+    position = index.get_indexer(vector_keys)
+    # vectors without an ID match nothing
+    matched = (position >= 0) & pd.notna(vector_keys)
+
+    names = sources['Source'].to_numpy(dtype=object)[first]
+    ra0, dec0 = np.append(ra0[first], np.nan), np.append(dec0[first], np.nan)
+    # unmatched vectors (-1) pick the trailing NaN position
+    position = np.where(matched, position, len(index))
 
+    df = vectors.copy()
+    df.attrs = dict(vectors.attrs)
+    df.attrs['units'] = dict(vectors.attrs.get('units', {}))
+    df['Source'] = pd.Series(np.append(names, None)[position], index=df.index,
+                             dtype=object).astype(sources['Source'].dtype)
+    ra, dec = deproject_offsets(ra0[position], dec0[position],
+                                df['ΔR.A.'].to_numpy(dtype=np.float64, na_value=np.nan),
+                                df['ΔDecl.'].to_numpy(dtype=np.float64, na_value=np.nan))
+    add_coordinates(df, ra, dec, galactic=True)
+    df.attrs['unmatched'] = int((~matched).sum())
     return df
 
 
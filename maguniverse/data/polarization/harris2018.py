@@ -21,11 +21,15 @@ References
        DOI: 10.3847/1538-4357/aac6ec
 """
 
-from io import StringIO
 import pandas as pd
 
 from maguniverse.data.polarization import polarization_sources
 from maguniverse.utils import get_ascii, get_default_data_paths
+from maguniverse.utils.compact import compact_frame
+from maguniverse.utils.coordinates import add_coordinates, parse_sexagesimal
+from maguniverse.utils.names import add_name_key
+from maguniverse.utils.preslice import preslice
+from maguniverse.utils.table_cache import cached_parse, split_frame, write_chunks, write_table
 
 
 def _get_table_config(table):
@@ -81,8 +85,56 @@ def _get_table_config(table):
         }
 
 
+def _parse_harris2018(src, table):
+    """Parse table `table` of Harris et al. (2018) from the file at `src`."""
+    config = _get_table_config(table)
+
+    # Read data into DataFrame
+    df = pd.read_csv(
+        preslice(src, config['skip_rows'], config['skip_footer']),
+        sep='\t',
+        names=config['column_names'],
+        engine='c'
+    )
+
+    # Post-process table 2 data
+    if table == 't2':
+        # Fix alignment of specific rows
+        rows_to_shift = [1, 2, 3, 5, 6]
+        df.iloc[rows_to_shift, :] = df.iloc[rows_to_shift, :].shift(periods=1, axis=1)
+        # Decimal-degree and Galactic positions
+        add_coordinates(df,
+                        parse_sexagesimal(df['RA'], hours=True),
+                        parse_sexagesimal(df['Dec']),
+                        galactic=True)
+
+    # Matching keys of the source names
+    add_name_key(df, 'Object' if table == 't2' else 'Star')
+
+    return df
+
+
+def _fetch_harris2018(file_path, file_url, save_src_data_path, table):
+    """Validate `table` and return the path of the raw ASCII file."""
+    if table not in ['t2', 't3']:
+        raise ValueError("table must be either 't2' or 't3'")
+
+    # Get table configuration
+    config = _get_table_config(table)
+
+    # Get data path
+    if file_path is None and file_url is None:
+        file_path, file_url = get_default_data_paths(
+            file_path,
+            polarization_sources['Harris2018']['data_link'][config['data_key']]
+        )
+
+    # Fetch raw ASCII data, streamed to disk
+    return get_ascii(file_path, file_url, save_src_data_path, fmt='txt', stream=True)
+
+
 def get_harris2018(file_path=None, file_url=None, save_path=None, 
-                   save_src_data_path=None, table='t3'):
+                   save_src_data_path=None, table='t3', compact=False):
     """Load Harris et al. (2018) data tables into a DataFrame.
 
     Parameters
@@ -92,13 +144,19 @@ def get_harris2018(file_path=None, file_url=None, save_path=None,
     file_url : str, optional
         URL to download the ASCII data. If None, defaults are used.
     save_path : str, optional
-        If provided, the resulting DataFrame is written to this CSV path.
+        If provided, the resulting DataFrame is written to this path (CSV, or
+        Parquet / Feather for a ``.parquet`` / ``.feather`` extension).
     save_src_data_path : str, optional
         If provided, the raw ASCII data is saved to this path.
     table : {'t3', 't2'}, optional
         Which table to load:
         - 't3': polarization data (default)
         - 't2': plane fitting data
+    compact : bool, optional
+        If True, repeated strings become categoricals, other strings
+        Arrow-backed strings, and numerics are downcast where precision
+        allows (see `maguniverse.utils.compact.compact_frame`). The memory
+        usage before and after is stored in ``df.attrs['memory_usage']``.
 
     Returns
     -------
@@ -108,6 +166,7 @@ def get_harris2018(file_path=None, file_url=None, save_path=None,
             theta       : Polarization angle (degrees)
             phi         : Minor-axis position angle (degrees)
             |theta-phi| : Angle between theta and phi (degrees)
+            name_key    : Canonical key of Star (see maguniverse.utils.names)
 
         For table='t2':
             Weighting   : Weighting type (Natural/Briggs/100 klambda)
@@ -120,50 +179,68 @@ def get_harris2018(file_path=None, file_url=None, save_path=None,
             I_int       : Integrated intensity (mJy)
             P_peak      : Peak polarized intensity (mJy/beam)
             P_int       : Integrated polarized intensity (mJy)
+            ra_deg      : Right Ascension (degrees)
+            dec_deg     : Declination (degrees)
+            l_deg       : Galactic longitude (degrees)
+            b_deg       : Galactic latitude (degrees)
+            name_key    : Canonical key of Object (see maguniverse.utils.names)
 
     Raises
     ------
     ValueError
         If table is not 't2' or 't3'.
     """
-    if table not in ['t2', 't3']:
-        raise ValueError("table must be either 't2' or 't3'")
-
-    # Get table configuration
-    config = _get_table_config(table)
-
-    # Get data path
-    if file_path is None and file_url is None:
-        file_path, file_url = get_default_data_paths(
-            file_path,
-            polarization_sources['Harris2018']['data_link'][config['data_key']]
-        )
-
-    # Fetch raw ASCII data
-    raw = get_ascii(file_path, file_url, save_src_data_path, fmt='txt')
+    src = _fetch_harris2018(file_path, file_url, save_src_data_path, table)
 
-    # Read data into DataFrame
-    df = pd.read_csv(
-        StringIO(raw),
-        sep=r'\t',
-        names=config['column_names'],
-        skiprows=config['skip_rows'],
-        skipfooter=config['skip_footer'],
-    )
+    # Parse the table, or load the cached parse of the same file
+    df = cached_parse(src, _parse_harris2018, table)
 
-    # Post-process table 2 data
-    if table == 't2':
-        # Fix alignment of specific rows
-        rows_to_shift = [1, 2, 3, 5, 6]
-        df.iloc[rows_to_shift, :] = df.iloc[rows_to_shift, :].shift(periods=1, axis=1)
+    # Memory-compact dtypes, if requested
+    if compact:
+        df = compact_frame(df)
 
     # Save processed data if requested
     if save_path:
-        df.to_csv(save_path, index=False)
+        write_table(df, save_path)
 
     return df
 
 
+def iter_harris2018(file_path=None, file_url=None, save_path=None,
+                    save_src_data_path=None, table='t3', chunksize=10000):
+    """Iterate over a Harris et al. (2018) data table in chunks.
+
+    Same table as `get_harris2018`, yielded as DataFrames of at most
+    `chunksize` rows. Both tables are a few rows long and table 2 needs its
+    row alignment fixed as a whole, so the table is parsed (or loaded from
+    the cache) once and then split.
+
+    Parameters
+    ----------
+    file_path : str, optional
+        Local filesystem path to the ASCII data. If None, defaults are used.
+    file_url : str, optional
+        URL to download the ASCII data. If None, defaults are used.
+    save_path : str, optional
+        If provided, each chunk is appended to this path as it is yielded
+        (CSV, or Parquet / Feather for a ``.parquet`` / ``.feather`` extension).
+    save_src_data_path : str, optional
+        If provided, the raw ASCII data is saved to this path.
+    table : {'t3', 't2'}, optional
+        Which table to load (default 't3').
+    chunksize : int, optional
+        Maximum number of rows per chunk.
+
+    Returns
+    -------
+    iterator of pandas.DataFrame
+        Chunks with the columns documented in `get_harris2018`.
+    """
+    src = _fetch_harris2018(file_path, file_url, save_src_data_path, table)
+    chunks = split_frame(cached_parse(src, _parse_harris2018, table), chunksize)
+    return write_chunks(chunks, save_path)
+
+
 if __name__ == "__main__":
     import os
     from maguniverse import __parent_dir__
@@ -23,14 +23,55 @@ References
        DOI: 10.1088/0067-0049/182/1/143
 """
 
-from io import StringIO
-import pandas as pd
-
 from maguniverse.data.polarization import polarization_sources
 from maguniverse.utils import get_ascii, get_default_data_paths
+from maguniverse.utils.compact import compact_frame
+from maguniverse.utils.coordinates import add_coordinates, dms_to_deg, hms_to_deg
+from maguniverse.utils.mrt import iter_mrt, read_mrt
+from maguniverse.utils.names import add_name_key
+from maguniverse.utils.table_cache import cached_parse, write_chunks, write_table
+
+
+def _add_positions(df):
+    """Append ra_deg / dec_deg and Galactic l_deg / b_deg from the split components."""
+    return add_coordinates(df,
+                           hms_to_deg(df['RAh'], df['RAm'], df['RAs']),
+                           dms_to_deg(df['DE-'], df['DEd'], df['DEm'], df['DEs']),
+                           galactic=True)
+
+
+def _parse_matthews2009(src):
+    """Decode the MRT table at `src` and append decimal-degree positions and name keys."""
+    return add_name_key(_add_positions(read_mrt(src)), 'ID')
+
+
+def _iter_parse_matthews2009(src, chunksize):
+    """Decode the MRT table at `src` in chunks of `chunksize` rows."""
+    for df in iter_mrt(src, chunksize=chunksize):
+        yield add_name_key(_add_positions(df), 'ID')
 
 
-def get_matthews2009(file_path=None, file_url=None, save_path=None, save_src_data_path=None):
+def _fetch_matthews2009(file_path, file_url, save_path, save_src_data_path):
+    """Validate the getter arguments and return the path of the raw ASCII file."""
+    # Input validation
+    if save_path is not None and not isinstance(save_path, str):
+        raise TypeError("save_path must be a string")
+    if save_src_data_path is not None and not isinstance(save_src_data_path, str):
+        raise TypeError("save_src_data_path must be a string")
+
+    # Get default paths if none provided
+    if file_path is None and file_url is None:
+        file_path, file_url = get_default_data_paths(
+            file_path,
+            polarization_sources['Matthews2009']['data_link']['t6_polarization']
+        )
+
+    # Fetch raw ASCII (prefers local copy to avoid CAPTCHA), streamed to disk
+    return get_ascii(file_path, file_url, save_src_data_path, fmt='txt', stream=True)
+
+
+def get_matthews2009(file_path=None, file_url=None, save_path=None, save_src_data_path=None,
+                     compact=False):
     """Load the Matthews et al. (2009) polarization data table into a DataFrame.
 
     This function reads and processes Table 6 from Matthews et al. (2009), which contains
@@ -43,9 +84,15 @@ def get_matthews2009(file_path=None, file_url=None, save_path=None, save_src_dat
     file_url : str, optional
         URL to download the ASCII data. If None, defaults are used.
     save_path : str, optional
-        If provided, the resulting DataFrame is written to this CSV path.
+        If provided, the resulting DataFrame is written to this path (CSV, or
+        Parquet / Feather for a ``.parquet`` / ``.feather`` extension).
     save_src_data_path : str, optional
         If provided, the raw ASCII data is saved to this path.
+    compact : bool, optional
+        If True, repeated strings become categoricals, other strings
+        Arrow-backed strings, and numerics are downcast where precision
+        allows (see `maguniverse.utils.compact.compact_frame`). The memory
+        usage before and after is stored in ``df.attrs['memory_usage']``.
         
     Returns
     -------
@@ -68,6 +115,12 @@ def get_matthews2009(file_path=None, file_url=None, save_path=None, save_src_dat
         - e_Pol : Uncertainty in polarization (%)
         - theta : Polarization angle (degrees E of N)
         - e_theta : Uncertainty in polarization angle (degrees)
+        - ra_deg, dec_deg : J2000 position in decimal degrees
+        - l_deg, b_deg : Galactic longitude and latitude (degrees)
+        - name_key : Canonical key of ID (see `maguniverse.utils.names`)
+
+        The units of each column, as given in the MRT header, are stored in
+        ``df.attrs['units']``.
 
     Raises
     ------
@@ -76,79 +129,54 @@ def get_matthews2009(file_path=None, file_url=None, save_path=None, save_src_dat
     TypeError
         If save_path or save_src_data_path are not strings when provided.
     """
-    # Input validation
-    if save_path is not None and not isinstance(save_path, str):
-        raise TypeError("save_path must be a string")
-    if save_src_data_path is not None and not isinstance(save_src_data_path, str):
-        raise TypeError("save_src_data_path must be a string")
+    src = _fetch_matthews2009(file_path, file_url, save_path, save_src_data_path)
 
-    # Get default paths if none provided
-    if file_path is None and file_url is None:
-        file_path, file_url = get_default_data_paths(
-            file_path,
-            polarization_sources['Matthews2009']['data_link']['t6_polarization']
-        )
+    # Column names, byte ranges and types come from the MRT byte-by-byte header;
+    # repeat calls load the parsed table from the table cache
+    df = cached_parse(src, _parse_matthews2009)
 
-    # Fetch raw ASCII (prefers local copy to avoid CAPTCHA)
-    raw = get_ascii(file_path, file_url, save_src_data_path, fmt='txt')
-
-    # Define column specifications for fixed-width format
-    column_names = [
-        "ID",      # Object/Region identification
-        "f_ID",    # [bc] Flag on ID
-        "RAOff",   # Offset in Right Ascension
-        "DEOff",   # Offset in Declination
-        "RAh",     # Hour of Right Ascension (J2000)
-        "RAm",     # Minute of Right Ascension (J2000)
-        "RAs",     # Second of Right Ascension (J2000)
-        "DE-",     # Sign of the Declination (J2000)
-        "DEd",     # Degree of Declination (J2000)
-        "DEm",     # Arcminute of Declination (J2000)
-        "DEs",     # Arcsecond of Declination (J2000)
-        "Int",     # Total intensity
-        "e_Int",   # Error in intensity
-        "Pol",     # Polarization percentage
-        "e_Pol",   # Error in polarization
-        "theta",   # Polarization angle
-        "e_theta", # Error in theta
-    ]
-    
-    # Column specifications based on byte positions in ASCII file
-    colspecs = [
-        (0, 12),   # ID: bytes 1-12
-        (13, 14),  # f_ID: byte 14
-        (15, 21),  # RAOff: bytes 16-21
-        (22, 28),  # DEOff: bytes 23-28
-        (29, 31),  # RAh: bytes 30-31
-        (32, 34),  # RAm: bytes 33-34
-        (35, 40),  # RAs: bytes 36-40
-        (41, 42),  # DE-: byte 42
-        (42, 44),  # DEd: bytes 43-44
-        (45, 47),  # DEm: bytes 46-47
-        (48, 52),  # DEs: bytes 49-52
-        (53, 62),  # Int: bytes 54-62
-        (63, 72),  # e_Int: bytes 64-72
-        (73, 77),  # Pol: bytes 74-77
-        (78, 81),  # e_Pol: bytes 79-81
-        (82, 87),  # theta: bytes 83-87
-        (88, 92),  # e_theta: bytes 89-92
-    ]      
-
-    # Read fixed-width formatted data
-    df = pd.read_fwf(
-        StringIO(raw),
-        names=column_names,
-        skiprows=31,  # Skip header rows
-        colspecs=colspecs
-    )
+    # Memory-compact dtypes, if requested
+    if compact:
+        df = compact_frame(df)
 
     # Save processed data if requested
     if save_path:
-        df.to_csv(save_path, index=False)
+        write_table(df, save_path)
 
     return df
 
 
+def iter_matthews2009(file_path=None, file_url=None, save_path=None, save_src_data_path=None,
+                      chunksize=10000):
+    """Iterate over the Matthews et al. (2009) polarization data table in chunks.
+
+    Same table as `get_matthews2009`, decoded from disk with the MRT layout
+    `chunksize` lines at a time, so that memory stays bounded.
+
+    Parameters
+    ----------
+    file_path : str, optional
+        Local filesystem path to the ASCII data. If None, defaults are used.
+    file_url : str, optional
+        URL to download the ASCII data. If None, defaults are used.
+    save_path : str, optional
+        If provided, each chunk is appended to this path as it is yielded
+        (CSV, or Parquet / Feather for a ``.parquet`` / ``.feather`` extension).
+    save_src_data_path : str, optional
+        If provided, the raw ASCII data is saved to this path.
+    chunksize : int, optional
+        Maximum number of rows per chunk.
+
+    Returns
+    -------
+    iterator of pandas.DataFrame
+        Chunks with the columns documented in `get_matthews2009`, with the
+        units in ``df.attrs['units']``.
+    """
+    src = _fetch_matthews2009(file_path, file_url, save_path, save_src_data_path)
+    return write_chunks(_iter_parse_matthews2009(src, chunksize), save_path)
+
+
 if __name__ == "__main__":
     # Example usage
     import os
@@ -1,7 +1,8 @@
 from maguniverse.data.processed.sources import processed_data_tables
-from maguniverse.data.processed.liu2022 import get_liu2022
+from maguniverse.data.processed.liu2022 import get_liu2022, iter_liu2022
 
 __all__ = [
             "processed_data_tables",
-            "get_liu2022"
-]
\ No newline at end of file
+            "get_liu2022",
+            "iter_liu2022"
+]
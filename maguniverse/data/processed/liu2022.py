@@ -6,13 +6,147 @@ This module provides functions to load magnetic field data from Liu et al. (2022
 which contains a complete compilation of all DCF (Davis-Chandrasekhar-Fermi) estimations.
 """
 
+import re
+
 import pandas as pd
-from io import StringIO
+
 from maguniverse.utils import get_default_data_paths, get_ascii
+from maguniverse.utils.compact import compact_frame
+from maguniverse.utils.converters import attach_units
+from maguniverse.utils.fixed_width import FixedWidthSchema
+from maguniverse.utils.mrt import read_mrt_schema
+from maguniverse.utils.names import add_name_key
+from maguniverse.utils.table_cache import cached_parse, write_chunks, write_table
 from maguniverse.data.processed.sources import processed_data_tables
 
+# MRT labels that differ from the column names of this module
+_LABELS = {'Bu,ref': 'Bu_ref', 'Bu,est': 'Bu_est', 'Btot,est': 'Btot_est'}
+
+# First data line of copies without the MRT header
+_DATA_START = re.compile(r'^[ \t]*(?:SMM-NW|CB26)', re.MULTILINE)
+
+# Fixed-width layout from the format description of the table, for copies
+# without the MRT header
+# Bytes    Format Units   Label      Explanations
+#   1- 17  A17    ---     Name       Identifier
+#  19- 24  A6     ---     Inst       Instrument
+#  26- 30  A5     ---     Method     Method
+#  32- 37  F6.3   pc      r          ? Radius
+#  39- 47  F9.2   solMass M          ? Mass
+#  49- 53  E5.1   cm-3    nH2        ? H_2_ density
+#  55- 60  E6.1   cm-2    NH2        ? H2 column density
+#  62- 65  F4.2   km/s    deltavlos  ? Line-of-sight turbulent velocity dispersion
+#  67- 70  F4.1   deg     deltaphi   ? Measured angular dispersion
+#  72- 74  F3.1   ---     Ratio      ? Turbulent-to-ordered magnetic field strength ratio
+#  76- 79  F4.1   ---     Nadf       ? Number of turbulent fluid elements along line of sight
+#  81- 85  F5.1   mpc     deltaadf   ? Turbulent correlation length
+#  87- 91  I5     ugauss  Bu,ref     Referenced plane-of-sky uniform magnetic field strength
+#  93- 97  I5     ugauss  Bu,est     ? Re-estimated plane-of-sky uniform magnetic field strength
+#  99-103  I5     ugauss  Btot,est   Estimated plane-of-sky total magnetic field strength
+# 105-109  F5.2   ---     alphaB     ? Magnetic virial parameter
+# 111-129  A19    ---     BibCode    Reference bibcode
+_LIU2022_SCHEMA = FixedWidthSchema(
+    names=['Name', 'Inst', 'Method', 'r', 'M', 'nH2', 'NH2', 'deltavlos',
+           'deltaphi', 'Ratio', 'Nadf', 'deltaadf', 'Bu_ref', 'Bu_est',
+           'Btot_est', 'alphaB', 'BibCode'],
+    colspecs=[(0, 17), (18, 24), (25, 30), (31, 37), (38, 47), (48, 53), (54, 60),
+              (61, 65), (66, 70), (71, 74), (75, 79), (80, 85), (86, 91), (92, 97),
+              (98, 103), (104, 109), (110, 129)],
+    dtypes=['str', 'str', 'str', 'float', 'float', 'float', 'float', 'float',
+            'float', 'float', 'float', 'float', 'int', 'int', 'int', 'float', 'str'],
+)
+
+_LIU2022_UNITS = {
+    'r': 'pc',
+    'M': 'solMass',
+    'nH2': 'cm-3',
+    'NH2': 'cm-2',
+    'deltavlos': 'km/s',
+    'deltaphi': 'deg',
+    'deltaadf': 'mpc',
+    'Bu_ref': 'ugauss',
+    'Bu_est': 'ugauss',
+    'Btot_est': 'ugauss',
+}
+
+
+def _parse_liu2022(src):
+    """Parse the DCF table at `src`, with or without its MRT header."""
+    try:
+        # Column layout from the MRT byte-by-byte header
+        mrt = read_mrt_schema(src)
+    except ValueError:
+        mrt = None
+
+    if mrt is not None:
+        df = mrt.decode_file(src, rename=_LABELS)
+    else:
+        # Headerless copy: the data section starts at the first known source
+        with open(src, 'r', encoding='utf-8') as f:
+            raw = f.read()
+        match = _DATA_START.search(raw)
+        if match is None:
+            raise ValueError("Could not find data section in the file")
+        df = _LIU2022_SCHEMA.decode(raw[match.start():])
+
+    # Only keep rows that have at least a name
+    df = df[df['Name'].notna()].reset_index(drop=True)
+    add_name_key(df, 'Name')
+    return attach_units(df, _LIU2022_UNITS)
 
-def get_liu2022(file_path=None, file_url=None, save_path=None, save_src_data_path=None):
+
+def _data_start_line(src):
+    """Index of the first data line of a copy without the MRT header."""
+    with open(src, 'r', encoding='utf-8') as f:
+        for i, line in enumerate(f):
+            if _DATA_START.match(line):
+                return i
+    raise ValueError("Could not find data section in the file")
+
+
+def _iter_parse_liu2022(src, chunksize):
+    """Parse the DCF table at `src` in chunks of at most `chunksize` rows."""
+    try:
+        mrt = read_mrt_schema(src)
+    except ValueError:
+        mrt = None
+
+    if mrt is not None:
+        chunks = mrt.iter_decode_file(src, rename=_LABELS, chunksize=chunksize)
+    else:
+        chunks = _LIU2022_SCHEMA.iter_decode_file(src, skiprows=_data_start_line(src),
+                                                  chunksize=chunksize)
+    offset = 0
+    for df in chunks:
+        # Only keep rows that have at least a name; the index stays contiguous
+        df = df[df['Name'].notna()]
+        df.index = pd.RangeIndex(offset, offset + len(df))
+        offset += len(df)
+        if len(df):
+            yield attach_units(add_name_key(df, 'Name'), _LIU2022_UNITS)
+
+
+def _fetch_liu2022(file_path, file_url, save_path, save_src_data_path):
+    """Validate the getter arguments and return the path of the raw ASCII file."""
+    # Input validation
+    if save_path is not None and not isinstance(save_path, str):
+        raise TypeError("save_path must be a string")
+    if save_src_data_path is not None and not isinstance(save_src_data_path, str):
+        raise TypeError("save_src_data_path must be a string")
+
+    # Get default paths if none provided
+    if file_path is None and file_url is None:
+        file_path, file_url = get_default_data_paths(
+            processed_data_tables['Liu2022']['data_link']['t1_data_table_local'],
+            processed_data_tables['Liu2022']['data_link']['t1_data_table_ascii']
+        )
+
+    # Fetch raw ASCII (prefers local copy to avoid CAPTCHA), streamed to disk
+    return get_ascii(file_path, file_url, save_src_data_path, fmt='txt', stream=True)
+
+
+def get_liu2022(file_path=None, file_url=None, save_path=None, save_src_data_path=None,
+                compact=False):
     """Load the Liu et al. (2022) DCF estimations data into a DataFrame.
 
     This function reads and processes the DCF sample data table from Liu et al. (2022),
@@ -25,9 +159,15 @@ def get_liu2022(file_path=None, file_url=None, save_path=None, save_src_data_pat
     file_url : str, optional
         URL to download the ASCII data. If None, defaults are used.
     save_path : str, optional
-        If provided, the resulting DataFrame is written to this CSV path.
+        If provided, the resulting DataFrame is written to this path (CSV, or
+        Parquet / Feather for a ``.parquet`` / ``.feather`` extension).
     save_src_data_path : str, optional
         If provided, the raw ASCII data is saved to this path.
+    compact : bool, optional
+        If True, repeated strings become categoricals, other strings
+        Arrow-backed strings, and numerics are downcast where precision
+        allows (see `maguniverse.utils.compact.compact_frame`). The memory
+        usage before and after is stored in ``df.attrs['memory_usage']``.
 
     Returns
     -------
@@ -50,6 +190,7 @@ def get_liu2022(file_path=None, file_url=None, save_path=None, save_src_data_pat
         - Btot_est : Estimated plane-of-sky total magnetic field strength in μG (int, optional)
         - alphaB : Magnetic virial parameter (float, optional)
         - BibCode : Reference bibcode (string)
+        - name_key : Canonical key of Name (see `maguniverse.utils.names`)
 
     Raises
     ------
@@ -58,136 +199,51 @@ def get_liu2022(file_path=None, file_url=None, save_path=None, save_src_data_pat
     TypeError
         If save_path or save_src_data_path are not strings when provided.
     """
-    # Input validation
-    if save_path is not None and not isinstance(save_path, str):
-        raise TypeError("save_path must be a string")
-    if save_src_data_path is not None and not isinstance(save_src_data_path, str):
-        raise TypeError("save_src_data_path must be a string")
+    src = _fetch_liu2022(file_path, file_url, save_path, save_src_data_path)
 
-    # Get default paths if none provided
-    if file_path is None and file_url is None:
-        file_path, file_url = get_default_data_paths(
-            processed_data_tables['Liu2022']['data_link']['t1_data_table_local'],
-            processed_data_tables['Liu2022']['data_link']['t1_data_table_ascii']
-        )
-    
-    # Fetch raw ASCII (prefers local copy to avoid CAPTCHA)
-    raw = get_ascii(file_path, file_url, save_src_data_path, fmt='txt')
+    # Parse the table, or load the cached parse of the same file
+    df = cached_parse(src, _parse_liu2022)
+
+    # Memory-compact dtypes, if requested
+    if compact:
+        df = compact_frame(df)
 
-    # Parse the data
-    lines = raw.split('\n')
-    
-    # Find the data section (starts after the header lines)
-    data_start = None
-    for i, line in enumerate(lines):
-        if line.strip().startswith('SMM-NW') or line.strip().startswith('CB26'):
-            data_start = i
-            break
-    
-    if data_start is None:
-        raise ValueError("Could not find data section in the file")
-    
-    # Extract data lines
-    data_lines = lines[data_start:]
-    
-    # Define column names based on the file format description
-    column_names = [
-        'Name', 'Inst', 'Method', 'r', 'M', 'nH2', 'NH2', 'deltavlos', 
-        'deltaphi', 'Ratio', 'Nadf', 'deltaadf', 'Bu_ref', 'Bu_est', 
-        'Btot_est', 'alphaB', 'BibCode'
-    ]
-    
-    # Parse each data line using fixed-width format
-    parsed_data = []
-    for line in data_lines:
-        line = line.rstrip('\n')  # Remove newline but keep spaces
-        if not line.strip():  # Skip empty lines
-            continue
-            
-        # Extract data using fixed-width positions based on the format description
-        # Bytes Format Units   Label      Explanations
-        # 1- 17 A17    ---     Name       Identifier
-        # 19- 24 A6     ---     Inst       Instrument 
-        # 26- 30 A5     ---     Method     Method 
-        # 32- 37 F6.3   pc      r          ? Radius
-        # 39- 47 F9.2   solMass M          ? Mass
-        # 49- 53 E5.1   cm-3    nH2        ? H_2_ density
-        # 55- 60 E6.1   cm-2    NH2        ? H2 column density
-        # 62- 65 F4.2   km/s    deltavlos  ? Line-of-sight turbulent velocity dispersion
-        # 67- 70 F4.1   deg     deltaphi   ? Measured angular dispersion
-        # 72- 74 F3.1   ---     Ratio      ? Turbulent-to-ordered magnetic field strength ratio
-        # 76- 79 F4.1   ---     Nadf       ? Number of turbulent fluid elements along line of sight
-        # 81- 85 F5.1   mpc     deltaadf   ? Turbulent correlation length
-        # 87- 91 I5     ugauss  Bu,ref     Referenced plane-of-sky uniform magnetic field strength
-        # 93- 97 I5     ugauss  Bu,est     ? Re-estimated plane-of-sky uniform magnetic field strength
-        # 99-103 I5     ugauss  Btot,est   Estimated plane-of-sky total magnetic field strength
-        # 105-109 F5.2   ---     alphaB     ? Magnetic virial parameter
-        # 111-129 A19    ---     BibCode    Reference bibcode
-        
-        # Create a dictionary for this row
-        row_data = {}
-        
-        # Extract fields using fixed-width positions (1-indexed, so subtract 1 for 0-indexed)
-        def extract_field(line, start, end, field_type=str):
-            if len(line) < end:
-                return None
-            field = line[start-1:end].strip()
-            if not field or field == '---':
-                return None
-            try:
-                if field_type == int:
-                    return int(field)
-                elif field_type == float:
-                    return float(field)
-                else:
-                    return field
-            except (ValueError, TypeError):
-                return None
-        
-        row_data['Name'] = extract_field(line, 1, 17)
-        row_data['Inst'] = extract_field(line, 19, 24)
-        row_data['Method'] = extract_field(line, 26, 30)
-        row_data['r'] = extract_field(line, 32, 37, float)
-        row_data['M'] = extract_field(line, 39, 47, float)
-        row_data['nH2'] = extract_field(line, 49, 53, float)
-        row_data['NH2'] = extract_field(line, 55, 60, float)
-        row_data['deltavlos'] = extract_field(line, 62, 65, float)
-        row_data['deltaphi'] = extract_field(line, 67, 70, float)
-        row_data['Ratio'] = extract_field(line, 72, 74, float)
-        row_data['Nadf'] = extract_field(line, 76, 79, float)
-        row_data['deltaadf'] = extract_field(line, 81, 85, float)
-        row_data['Bu_ref'] = extract_field(line, 87, 91, int)
-        row_data['Bu_est'] = extract_field(line, 93, 97, int)
-        row_data['Btot_est'] = extract_field(line, 99, 103, int)
-        row_data['alphaB'] = extract_field(line, 105, 109, float)
-        row_data['BibCode'] = extract_field(line, 111, 129)
-        
-        # Only add rows that have at least a name
-        if row_data['Name']:
-            parsed_data.append(row_data)
-    
-    # Create DataFrame
-    df = pd.DataFrame(parsed_data)
-    
-    # Convert numeric columns to appropriate types
-    numeric_columns = ['r', 'M', 'nH2', 'NH2', 'deltavlos', 'deltaphi', 'Ratio', 
-                      'Nadf', 'deltaadf', 'alphaB']
-    for col in numeric_columns:
-        if col in df.columns:
-            df[col] = pd.to_numeric(df[col], errors='coerce')
-    
-    # Convert integer columns
-    int_columns = ['Bu_ref', 'Bu_est', 'Btot_est']
-    for col in int_columns:
-        if col in df.columns:
-            df[col] = pd.to_numeric(df[col], errors='coerce').astype('Int64')
-    
     # Save processed data if requested
     if save_path:
-        df.to_csv(save_path, index=False)
+        write_table(df, save_path)
     
     return df
 
+
+def iter_liu2022(file_path=None, file_url=None, save_path=None, save_src_data_path=None,
+                 chunksize=10000):
+    """Iterate over the Liu et al. (2022) DCF estimations in chunks.
+
+    Same table as `get_liu2022`, decoded from disk `chunksize` lines at a
+    time, so that memory stays bounded.
+
+    Parameters
+    ----------
+    file_path : str, optional
+        Local filesystem path to the ASCII data. If None, defaults are used.
+    file_url : str, optional
+        URL to download the ASCII data. If None, defaults are used.
+    save_path : str, optional
+        If provided, each chunk is appended to this path as it is yielded
+        (CSV, or Parquet / Feather for a ``.parquet`` / ``.feather`` extension).
+    save_src_data_path : str, optional
+        If provided, the raw ASCII data is saved to this path.
+    chunksize : int, optional
+        Maximum number of lines decoded per chunk.
+
+    Returns
+    -------
+    iterator of pandas.DataFrame
+        Chunks with the columns documented in `get_liu2022`.
+    """
+    src = _fetch_liu2022(file_path, file_url, save_path, save_src_data_path)
+    return write_chunks(_iter_parse_liu2022(src, chunksize), save_path)
+
 if __name__ == "__main__":
 
     import os
@@ -1,8 +1,9 @@
 # paper sources
 from maguniverse.data.zeeman.sources import zeeman_sources
 # getters
-from maguniverse.data.zeeman.crutcher2010 import get_crutcher2010
+from maguniverse.data.zeeman.crutcher2010 import get_crutcher2010, iter_crutcher2010
 
 __all__ = [ "zeeman_sources",
-            "get_crutcher2010"]
+            "get_crutcher2010",
+            "iter_crutcher2010"]
 
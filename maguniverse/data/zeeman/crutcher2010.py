@@ -22,14 +22,92 @@ References
        DOI: 10.1088/0004-637X/725/1/466
 """
 
-from io import StringIO
 import pandas as pd
 
 from maguniverse.data.zeeman import zeeman_sources
 from maguniverse.utils import get_ascii, get_default_data_paths
+from maguniverse.utils.compact import compact_frame
+from maguniverse.utils.converters import (NA_VALUES, attach_units, coerce_float,
+                                          normalize_sci_notation, read_csv_typed)
+from maguniverse.utils.names import add_name_key
+from maguniverse.utils.preslice import preslice, stream_preslice
+from maguniverse.utils.table_cache import cached_parse, write_chunks, write_table
+
+# Define column names with descriptions
+_COLUMN_NAMES = [
+    'Name',          # Source identification
+    'Species',       # Molecular species used for Zeeman measurement
+    'Ref',          # Reference number
+    'n_H (cm^-3)',  # Number density of hydrogen
+    'B_Z (muG)',    # Line-of-sight magnetic field strength
+    'sigma (muG)'   # Uncertainty in B_Z measurement
+]
+_FLOAT_COLUMNS = {'n_H (cm^-3)': 'float64', 'B_Z (muG)': 'float64'}
+_UNITS = {'n_H (cm^-3)': 'cm-3', 'B_Z (muG)': 'muG', 'sigma (muG)': 'muG'}
+
+
+def _parse_crutcher2010(src):
+    """Parse the tab-separated Zeeman table at `src`."""
+    # Read data into DataFrame using tab-separated format; header and footer
+    # rows are trimmed, tab runs collapsed and "x 10^" notation rewritten as
+    # e-notation beforehand, so the C engine parses the numeric columns directly
+    df = read_csv_typed(
+        preslice(src, skip_header=5, skip_footer=3, collapse_tabs=True,
+                 transform=normalize_sci_notation),
+        dtype=_FLOAT_COLUMNS,
+        sep='\t',
+        header=None,       # No header in file
+        names=_COLUMN_NAMES,
+        engine='c'
+    )
+
+    add_name_key(df, 'Name')
+    return attach_units(df, _UNITS)
+
+
+def _iter_parse_crutcher2010(src, chunksize):
+    """Parse the Zeeman table at `src` in chunks of `chunksize` rows."""
+    # The float columns are read as text and coerced chunk by chunk, since a
+    # chunk cannot be re-read when one of its entries does not parse
+    reader = pd.read_csv(
+        stream_preslice(src, skip_header=5, skip_footer=3, collapse_tabs=True,
+                        transform=normalize_sci_notation),
+        dtype={col: str for col in _FLOAT_COLUMNS},
+        na_values=NA_VALUES,
+        sep='\t',
+        header=None,
+        names=_COLUMN_NAMES,
+        engine='c',
+        chunksize=chunksize
+    )
+    with reader:
+        for df in reader:
+            for col, col_dtype in _FLOAT_COLUMNS.items():
+                df[col] = coerce_float(df[col]).astype(col_dtype).to_numpy()
+            yield attach_units(add_name_key(df, 'Name'), _UNITS)
+
+
+def _fetch_crutcher2010(file_path, file_url, save_path, save_src_data_path):
+    """Validate the getter arguments and return the path of the raw ASCII file."""
+    # Input validation
+    if save_path is not None and not isinstance(save_path, str):
+        raise TypeError("save_path must be a string")
+    if save_src_data_path is not None and not isinstance(save_src_data_path, str):
+        raise TypeError("save_src_data_path must be a string")
+
+    # Get default paths if none provided
+    if file_path is None and file_url is None:
+        file_path, file_url = get_default_data_paths(
+            zeeman_sources['Crutcher2010']['data_link']['table1_local'],
+            zeeman_sources['Crutcher2010']['data_link']['table1_ascii']
+        )
+
+    # Fetch raw ASCII (prefers local copy to avoid CAPTCHA), streamed to disk
+    return get_ascii(file_path, file_url, save_src_data_path, fmt='txt', stream=True)
 
 
-def get_crutcher2010(file_path=None, file_url=None, save_path=None, save_src_data_path=None):
+def get_crutcher2010(file_path=None, file_url=None, save_path=None, save_src_data_path=None,
+                     compact=False):
     """Load the Crutcher et al. (2010) Zeeman measurements into a DataFrame.
 
     This function reads and processes Table 1 from Crutcher et al. (2010), which contains
@@ -42,9 +120,15 @@ def get_crutcher2010(file_path=None, file_url=None, save_path=None, save_src_dat
     file_url : str, optional
         URL to download the ASCII data. If None, defaults are used.
     save_path : str, optional
-        If provided, the resulting DataFrame is written to this CSV path.
+        If provided, the resulting DataFrame is written to this path (CSV, or
+        Parquet / Feather for a ``.parquet`` / ``.feather`` extension).
     save_src_data_path : str, optional
         If provided, the raw ASCII data is saved to this path.
+    compact : bool, optional
+        If True, repeated strings become categoricals, other strings
+        Arrow-backed strings, and numerics are downcast where precision
+        allows (see `maguniverse.utils.compact.compact_frame`). The memory
+        usage before and after is stored in ``df.attrs['memory_usage']``.
 
     Returns
     -------
@@ -56,6 +140,10 @@ def get_crutcher2010(file_path=None, file_url=None, save_path=None, save_src_dat
         - n_H (cm^-3) : Number density of hydrogen
         - B_Z (muG) : Line-of-sight magnetic field strength (microGauss)
         - sigma (muG) : Uncertainty in B_Z measurement (microGauss)
+        - name_key : Canonical key of Name (see `maguniverse.utils.names`)
+
+        The canonical units of the numeric columns are stored in
+        ``df.attrs['units']``.
 
     Raises
     ------
@@ -64,59 +152,52 @@ def get_crutcher2010(file_path=None, file_url=None, save_path=None, save_src_dat
     TypeError
         If save_path or save_src_data_path are not strings when provided.
     """
-    # Input validation
-    if save_path is not None and not isinstance(save_path, str):
-        raise TypeError("save_path must be a string")
-    if save_src_data_path is not None and not isinstance(save_src_data_path, str):
-        raise TypeError("save_src_data_path must be a string")
-
-    # Get default paths if none provided
-    if file_path is None and file_url is None:
-        file_path, file_url = get_default_data_paths(
-            zeeman_sources['Crutcher2010']['data_link']['table1_local'],
-            zeeman_sources['Crutcher2010']['data_link']['table1_ascii']
-        )
+    src = _fetch_crutcher2010(file_path, file_url, save_path, save_src_data_path)
 
-    # Fetch raw ASCII (prefers local copy to avoid CAPTCHA)
-    raw = get_ascii(file_path, file_url, save_src_data_path, fmt='txt')
-
-    # Define column names with descriptions
-    column_names = [
-        'Name',          # Source identification
-        'Species',       # Molecular species used for Zeeman measurement
-        'Ref',          # Reference number
-        'n_H (cm^-3)',  # Number density of hydrogen
-        'B_Z (muG)',    # Line-of-sight magnetic field strength
-        'sigma (muG)'   # Uncertainty in B_Z measurement
-    ]
-
-    # Read data into DataFrame using tab-separated format
-    df = pd.read_csv(
-        StringIO(raw),
-        sep=r'\t+',        # Match one or more tabs
-        header=None,       # No header in file
-        names=column_names,
-        skiprows=5,        # Skip header rows
-        skipfooter=3,      # Skip footer rows
-        engine='python'    # Required for skipfooter
-    )
+    # Parse the table, or load the cached parse of the same file
+    df = cached_parse(src, _parse_crutcher2010)
 
-    # Clean and process numeric columns
-    numeric_cols = ['n_H (cm^-3)', 'B_Z (muG)']
-    for col in numeric_cols:
-        df[col] = (
-            df[col].astype(str)
-                   .str.replace(r'\s*x\s*10\^', 'e', regex=True)  # Convert scientific notation
-        )
-        df[col] = pd.to_numeric(df[col], errors='coerce')  # Convert to numeric, invalid as NaN
+    # Memory-compact dtypes, if requested
+    if compact:
+        df = compact_frame(df)
 
     # Save processed data if requested
     if save_path:
-        df.to_csv(save_path, index=False)
+        write_table(df, save_path)
 
     return df
 
 
+def iter_crutcher2010(file_path=None, file_url=None, save_path=None, save_src_data_path=None,
+                      chunksize=10000):
+    """Iterate over the Crutcher et al. (2010) Zeeman measurements in chunks.
+
+    Same table as `get_crutcher2010`, streamed from disk and yielded as
+    typed DataFrames of at most `chunksize` rows.
+
+    Parameters
+    ----------
+    file_path : str, optional
+        Local filesystem path to the ASCII data. If None, defaults are used.
+    file_url : str, optional
+        URL to download the ASCII data. If None, defaults are used.
+    save_path : str, optional
+        If provided, each chunk is appended to this path as it is yielded
+        (CSV, or Parquet / Feather for a ``.parquet`` / ``.feather`` extension).
+    save_src_data_path : str, optional
+        If provided, the raw ASCII data is saved to this path.
+    chunksize : int, optional
+        Maximum number of rows per chunk.
+
+    Returns
+    -------
+    iterator of pandas.DataFrame
+        Chunks with the columns documented in `get_crutcher2010`.
+    """
+    src = _fetch_crutcher2010(file_path, file_url, save_path, save_src_data_path)
+    return write_chunks(_iter_parse_crutcher2010(src, chunksize), save_path)
+
+
 if __name__ == "__main__":
     """
     Example usage:
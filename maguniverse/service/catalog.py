@@ -0,0 +1,381 @@
+# -*- coding: utf-8 -*-
+"""
+catalog.py
+-----------
+
+Unified store of the measurements of every preset table in one canonical,
+long-format schema.
+
+Each table of `zeeman_sources`, `polarization_sources`, `gas_sources` and
+`processed_data_tables` is mapped by `catalog_fields` onto rows of
+
+    ========== ======= ==================================================
+    column     type    content
+    ========== ======= ==================================================
+    catalog    string  preset table name (partition key)
+    module     string  'polarization', 'zeeman', 'gas' or 'processed'
+    reference  string  key of the paper in the sources dict
+    doi        string  DOI of the paper
+    row        int64   index label of the row in its table
+    source     string  source name as printed in the table
+    name_key   string  canonical name key (`maguniverse.utils.names`)
+    ra_deg     float64 J2000 right ascension
+    dec_deg    float64 J2000 declination
+    located_by string  'table' or 'name' (see `maguniverse.service.sky`)
+    quantity   string  canonical quantity, e.g. 'B_los', 'p', 'theta'
+    value      float64 measured value
+    error      float64 1-sigma uncertainty (NaN if not given)
+    unit       string  canonical unit (`maguniverse.utils.converters`)
+    ========== ======= ==================================================
+
+one row per table row and quantity; missing values are left out.
+
+The store is a Hive-partitioned Arrow IPC dataset,
+``<root>/catalog=<name>/part-0.arrow``, with a ``_manifest.json`` holding
+the content digest of every partition. `CatalogStore.update` rebuilds the
+rows of each table and rewrites only the partitions whose digest changed;
+`CatalogStore.open` memory-maps the uncompressed files and filters by
+catalog and quantity. The store needs ``pyarrow``
+(``pip install maguniverse[arrow]``).
+"""
+
+import datetime
+import hashlib
+import json
+import logging
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    from pyarrow import fs
+    _HAS_ARROW = True
+except ImportError:  # pragma: no cover - optional dependency
+    _HAS_ARROW = False
+
+from maguniverse.service.sky import _SOURCES, SkyQuery, located_by, sky_catalogs
+from maguniverse.utils.converters import canonical_unit
+
+# Bump to rebuild every partition after a change to the schema or mappings
+_SCHEMA_VERSION = 1
+_MANIFEST = '_manifest.json'
+_PART = 'part-0.arrow'
+
+# Source-name column and measured quantities of every preset table:
+# (quantity, value column, error column or None, unit if not in attrs['units'])
+catalog_fields = {
+    'dotson2010_t1': ('Source', [
+        ('I_peak', 'Peak Intensity', None, 'Jy/beam'),
+    ]),
+    'dotson2010_t2': ('ID', [
+        ('p', 'P', 'sigma(P)', None),
+        ('theta', 'theta', 'sigma(theta)', None),
+        ('I', 'Intensity', 'sigma(Intensity)', None),
+    ]),
+    'harris2018_t2': ('Object', [
+        ('I_peak', 'I_peak', None, 'mJy/beam'),
+        ('I_int', 'I_int', None, 'mJy'),
+        ('PI_peak', 'P_peak', None, 'mJy/beam'),
+        ('PI_int', 'P_int', None, 'mJy'),
+    ]),
+    'harris2018_t3': ('Star', [
+        ('theta', 'theta', None, 'deg'),
+        ('phi_minor', 'phi', None, 'deg'),
+    ]),
+    'matthews2009_t6': ('ID', [
+        ('I', 'Int', 'e_Int', None),
+        ('p', 'Pol', 'e_Pol', None),
+        ('theta', 'theta', 'e_theta', None),
+    ]),
+    'crutcher2010_t1': ('Name', [
+        ('B_los', 'B_Z (muG)', 'sigma (muG)', None),
+        ('n_H', 'n_H (cm^-3)', None, None),
+    ]),
+    'jijina1999_t2': ('Name', [
+        ('log_N_NH3', 'logNNH3 ([cm-2])', None, None),
+        ('dv_int', 'DVint (km/s)', None, None),
+        ('T_kin', 'Tkin (K)', None, None),
+        ('log_n', 'logNtot ([cm-3])', None, None),
+        ('R', 'R (pc)', None, None),
+        ('aspect_ratio', 'a/b', None, ''),
+    ]),
+    'liu2022_t1': ('Name', [
+        ('R', 'r', None, None),
+        ('M', 'M', None, None),
+        ('n_H2', 'nH2', None, None),
+        ('N_H2', 'NH2', None, None),
+        ('sigma_v_los', 'deltavlos', None, None),
+        ('delta_phi', 'deltaphi', None, None),
+        ('B_turb_ratio', 'Ratio', None, ''),
+        ('N_adf', 'Nadf', None, ''),
+        ('delta_adf', 'deltaadf', None, None),
+        ('B_pos_ref', 'Bu_ref', None, None),
+        ('B_pos', 'Bu_est', None, None),
+        ('B_tot', 'Btot_est', None, None),
+        ('alpha_B', 'alphaB', None, ''),
+    ]),
+}
+
+_TEXT_COLUMNS = ['module', 'reference', 'doi', 'source', 'name_key', 'located_by',
+                 'quantity', 'unit']
+_FLOAT_COLUMNS = ['ra_deg', 'dec_deg', 'value', 'error']
+_COLUMNS = ['module', 'reference', 'doi', 'row', 'source', 'name_key', 'ra_deg', 'dec_deg',
+            'located_by', 'quantity', 'value', 'error', 'unit']
+
+
+def _schema():
+    """Arrow schema of a partition (the catalog column is the partition key)."""
+    types = {name: pa.string() for name in _TEXT_COLUMNS}
+    types.update({name: pa.float64() for name in _FLOAT_COLUMNS})
+    types['row'] = pa.int64()
+    return pa.schema([(name, types[name]) for name in _COLUMNS])
+
+
+def _float(df, column):
+    """float64 values of a column; unparsable entries give NaN."""
+    if column is None:
+        return np.full(len(df), np.nan)
+    return pd.to_numeric(df[column], errors='coerce').to_numpy(dtype=np.float64,
+                                                               na_value=np.nan)
+
+
+def canonical_rows(name, df):
+    """
+    Map a located table onto the canonical long-format schema.
+
+    Parameters
+    ----------
+    name : str
+        Preset table name, a key of `catalog_fields`.
+    df : pandas.DataFrame
+        The table with ``ra_deg`` / ``dec_deg`` columns, e.g. from
+        ``SkyQuery.located(name)``.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Columns as in the module docstring, without 'catalog'.
+    """
+    catalog = sky_catalogs[name]
+    source_column, fields = catalog_fields[name]
+    units = df.attrs.get('units', {})
+    parts = []
+    for quantity, value_column, error_column, unit in fields:
+        value = _float(df, value_column)
+        keep = np.flatnonzero(~np.isnan(value))
+        if unit is None:
+            unit = units.get(value_column, '')
+        parts.append(pd.DataFrame({
+            'row': keep,
+            'quantity': quantity,
+            'value': value[keep],
+            'error': _float(df, error_column)[keep],
+            'unit': canonical_unit(unit) if unit not in ('', '---') else '',
+        }))
+    rows = pd.concat(parts, ignore_index=True)
+    positions = rows['row'].to_numpy()
+    source = _SOURCES[catalog['module']][catalog['reference']]
+    out = pd.DataFrame({
+        'module': catalog['module'],
+        'reference': catalog['reference'],
+        'doi': source.get('doi', ''),
+        'row': np.asarray(df.index.take(positions), dtype=np.int64),
+        'source': df[source_column].to_numpy(dtype=object)[positions],
+        'name_key': df['name_key'].to_numpy(dtype=object)[positions],
+        'ra_deg': _float(df, 'ra_deg')[positions],
+        'dec_deg': _float(df, 'dec_deg')[positions],
+        'located_by': located_by(name),
+        'quantity': rows['quantity'].to_numpy(dtype=object),
+        'value': rows['value'].to_numpy(),
+        'error': rows['error'].to_numpy(),
+        'unit': rows['unit'].to_numpy(dtype=object),
+    }, columns=_COLUMNS)
+    return out
+
+
+def _digest(rows):
+    """Content digest of the canonical rows of one table."""
+    digest = hashlib.sha256(f"{_SCHEMA_VERSION}:{len(rows)}".encode('utf-8'))
+    digest.update(pd.util.hash_pandas_object(rows, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+class CatalogStore():
+    """
+    Partitioned, memory-mappable store of the canonical catalog.
+
+    Parameters
+    ----------
+    root : str
+        Directory of the dataset.
+    fetcher : getters, optional
+        Service used to fetch tables that are not passed to `update`.
+    """
+
+    def __init__(self, root, fetcher=None) -> None:
+        if not _HAS_ARROW:
+            raise ImportError("The catalog store needs pyarrow")
+        self.root = root
+        self.fetcher = fetcher
+        self._lock = threading.Lock()
+        self.logger = logging.getLogger(__name__)
+        return
+
+    def _partition(self, name):
+        return os.path.join(self.root, f"catalog={name}", _PART)
+
+    @property
+    def manifest(self) -> dict:
+        """Digest, row count and update time of every partition."""
+        try:
+            with open(os.path.join(self.root, _MANIFEST), 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if manifest.get('schema_version') != _SCHEMA_VERSION:
+            return {}
+        return manifest.get('catalogs', {})
+
+    def _save_manifest(self, catalogs):
+        path = os.path.join(self.root, _MANIFEST)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'schema_version': _SCHEMA_VERSION, 'catalogs': catalogs}, f, indent=1)
+        os.replace(tmp_path, path)
+
+    def _write(self, name, rows):
+        """Write the partition of one table atomically."""
+        path = self._partition(name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        table = pa.Table.from_pandas(rows, schema=_schema(), preserve_index=False)
+        try:
+            # uncompressed, so that readers can memory-map the file
+            with pa.OSFile(tmp_path, 'wb') as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def update(self, tables=None, catalogs=None, force=False) -> dict:
+        """
+        Bring the store up to date with the preset tables.
+
+        The canonical rows of every table are rebuilt in memory (parsed
+        tables come from the parsed-table cache) and only partitions whose
+        content digest differs from the manifest are rewritten.
+
+        Parameters
+        ----------
+        tables : dict, optional
+            Preset name to already fetched DataFrame, e.g. the tables
+            returned by ``getters.fetch_all()``. Other tables are fetched.
+        catalogs : list of str, optional
+            Tables to update (all of `catalog_fields` if None).
+        force : bool, optional
+            If True, every partition is rewritten.
+
+        Returns
+        -------
+        dict
+            Preset name to 'written', 'unchanged' or the exception that
+            kept the table out of this update (its partition is kept).
+            Tables located by name are kept out when any positional
+            catalog failed to load.
+        """
+        catalogs = list(catalog_fields) if catalogs is None else list(catalogs)
+        unknown = [name for name in catalogs if name not in catalog_fields]
+        if unknown:
+            raise ValueError(f"Unknown catalogs: {unknown}. Available: {list(catalog_fields)}")
+
+        query = SkyQuery(tables=tables, fetcher=self.fetcher, catalogs=catalogs)
+        status = {}
+        with self._lock:
+            manifest = self.manifest
+            for name in catalogs:
+                try:
+                    df = query.located(name)
+                    if located_by(name) == 'name':
+                        # positions come from every positional catalog; without
+                        # one of them the rows would lose positions
+                        failed = [other for other in query.errors
+                                  if located_by(other) != 'name']
+                        if failed:
+                            raise RuntimeError(f"positional catalogs unavailable: {failed}")
+                    rows = canonical_rows(name, df)
+                except Exception as e:
+                    status[name] = e
+                    self.logger.warning(f"✗ {name} not updated: {str(e)[:100]}")
+                    continue
+                digest = _digest(rows)
+                entry = manifest.get(name, {})
+                if not force and entry.get('digest') == digest \
+                        and os.path.exists(self._partition(name)):
+                    status[name] = 'unchanged'
+                    continue
+                self._write(name, rows)
+                manifest[name] = {
+                    'digest': digest,
+                    'rows': len(rows),
+                    'updated': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                }
+                # the manifest follows every partition, so an interrupted
+                # update leaves a consistent store
+                self._save_manifest(manifest)
+                status[name] = 'written'
+        return status
+
+    def dataset(self):
+        """
+        The store as a memory-mapped `pyarrow.dataset.Dataset`.
+
+        Returns
+        -------
+        pyarrow.dataset.Dataset
+            With the partition column 'catalog'.
+        """
+        names = [name for name in self.manifest if os.path.exists(self._partition(name))]
+        schema = _schema().append(pa.field('catalog', pa.string()))
+        return ds.dataset([self._partition(name) for name in names], schema=schema,
+                          format='ipc', filesystem=fs.LocalFileSystem(use_mmap=True),
+                          partitioning=ds.partitioning(pa.schema([('catalog', pa.string())]),
+                                                       flavor='hive'),
+                          partition_base_dir=self.root)
+
+    def open(self, catalogs=None, quantities=None, columns=None) -> pd.DataFrame:
+        """
+        Read (a selection of) the store.
+
+        Parameters
+        ----------
+        catalogs : list of str, optional
+            Preset tables to read (all if None).
+        quantities : list of str, optional
+            Quantities to read, e.g. ['B_los', 'B_pos'] (all if None).
+        columns : list of str, optional
+            Columns to read (all if None).
+
+        Returns
+        -------
+        DataFrame
+            Canonical rows, 'catalog' first.
+
+        Examples
+        --------
+        >>> CatalogStore('datafiles/catalog').open(quantities=['B_los', 'B_pos', 'B_tot'])
+        """
+        condition = None
+        if catalogs is not None:
+            condition = ds.field('catalog').isin(list(catalogs))
+        if quantities is not None:
+            selected = ds.field('quantity').isin(list(quantities))
+            condition = selected if condition is None else condition & selected
+        if columns is None:
+            columns = ['catalog'] + _COLUMNS
+        return self.dataset().to_table(columns=columns, filter=condition).to_pandas()
@@ -1,13 +1,43 @@
 # -*- coding: utf-8 -*-
 import inspect
 import logging
+import os
+import time
 import pandas as pd
 from maguniverse.data import (zeeman_sources, polarization_sources, gas_sources)
 from maguniverse.data.processed import processed_data_tables
+from maguniverse.service.scoreboard import ProxyScoreboard
+from maguniverse.utils.fetch_ascii import CaptchaRequired, cache_as, headless_mode
+from maguniverse.utils.transport import transport_options
+from maguniverse.utils.table_cache import write_table
 # Note: lazy import data getters
 
 class getters():
-    def __init__(self, env='others', datafile_path=None) -> None:
+    # names of the preset table getters, in manifest order
+    preset_tables = [
+        'dotson2010_t1',
+        'dotson2010_t2',
+        'harris2018_t2',
+        'harris2018_t3',
+        'matthews2009_t6',
+        'crutcher2010_t1',
+        'jijina1999_t2',
+        'liu2022_t1',
+    ]
+
+    def __init__(self, env='others', datafile_path=None, headless=True,
+                 captcha_cooldown=900.0, compact=False) -> None:
+
+        self.env = env
+
+        # Preset tables are returned with memory-compact dtypes if True
+        self.compact = compact
+
+        # CAPTCHA pages met by this service's fetches raise CaptchaRequired
+        # instead of exiting the process (other get_ascii callers are unaffected)
+        self.headless = headless
+        # Seconds a proxy/host pair is skipped after answering with a CAPTCHA
+        self.captcha_cooldown = captcha_cooldown
 
         if env == 'pyodide':
             self.session_dir = 'user_data/'
@@ -20,7 +50,6 @@ class getters():
         ]
         else:
             self.session_dir = datafile_path if datafile_path is not None else 'datafiles/'
-            import os
             os.makedirs(self.session_dir, exist_ok=True)
             self.proxy_options = [
             "",  # Direct access (no proxy)
@@ -28,6 +57,18 @@ class getters():
             "https://api.allorigins.win/raw?url=", 
         ]
 
+        # Hedged proxy racing is off by default (strictly sequential fallback)
+        self.hedge_delay = None
+
+        # Each proxy attempt is tried once with a short connect timeout: a dead
+        # option fails within seconds and retrying is left to the proxy loop
+        self.attempt_retries = 0
+        self.connect_timeout = 3.0
+
+        # Per-proxy, per-host statistics used to order proxy attempts
+        store_path = os.path.join(self.session_dir, 'proxy_scores.json') \
+            if os.path.isdir(self.session_dir) else None
+        self.scoreboard = ProxyScoreboard(store_path)
 
         # Set up logging for debugging proxy attempts
         self.logger = logging.getLogger(__name__)
@@ -54,6 +95,220 @@ class getters():
         self.proxy_options = proxy_list
         self.logger.info(f"Updated proxy configuration with {len(proxy_list)} options")
 
+    def proxy_stats(self, url) -> dict:
+        """
+        Report recorded statistics of every proxy option for a table URL.
+
+        Parameters
+        ----------
+        url : str
+            Original (unproxied) table URL.
+
+        Returns
+        -------
+        dict
+            Maps each proxy prefix to its 'attempts', 'success_rate',
+            'captcha_rate', 'latency' and 'expected_time'.
+        """
+        return {proxy: self.scoreboard.stats(proxy, url) for proxy in self.proxy_options}
+
+    def configure_hedging(self, hedge_delay=1.0) -> None:
+        """
+        Configure hedged proxy racing.
+
+        With hedging enabled, the next proxy option is started whenever the
+        running attempts have not succeeded within `hedge_delay` seconds (or
+        as soon as one of them fails), and the first valid response wins.
+
+        Parameters
+        ----------
+        hedge_delay : float or None
+            Seconds to wait before starting the next proxy option. 0 races all
+            options at once; None restores the sequential fallback.
+        """
+        self.hedge_delay = hedge_delay
+        if hedge_delay is None:
+            self.logger.info("Hedged proxy racing disabled")
+        else:
+            self.logger.info(f"Hedged proxy racing enabled with {hedge_delay} s delay")
+
+    def cache_stats(self) -> dict:
+        """
+        Report raw ASCII cache usage for this process.
+
+        Returns
+        -------
+        dict
+            'hits' (tables served without a full download), 'misses' (full
+            downloads) and 'revalidated' (hits confirmed by a 304 response),
+            plus 'parsed_hits' / 'parsed_misses' of the parsed-table cache.
+        """
+        from maguniverse.utils import get_cache_stats, get_table_cache_stats
+        stats = get_cache_stats()
+        table_stats = get_table_cache_stats()
+        stats['parsed_hits'] = table_stats['hits']
+        stats['parsed_misses'] = table_stats['misses']
+        return stats
+
+    def configure_compact(self, compact=True) -> None:
+        """
+        Return preset tables with memory-compact dtypes.
+
+        Parameters
+        ----------
+        compact : bool, optional
+            If True, repeated strings become categoricals, other strings
+            Arrow-backed strings, and numerics are downcast where precision
+            allows. False restores the parsed dtypes.
+        """
+        self.compact = compact
+        self.logger.info(f"Compact tables {'enabled' if compact else 'disabled'}")
+
+    @staticmethod
+    def memory_report(tables) -> pd.DataFrame:
+        """
+        Report the memory footprint of fetched tables.
+
+        Parameters
+        ----------
+        tables : dict
+            Name to DataFrame, e.g. the first element returned by `get_many`.
+
+        Returns
+        -------
+        DataFrame
+            One row per table with 'rows', 'bytes_before' and 'bytes' (deep
+            memory usage; 'bytes_before' is the usage before compaction and
+            equals 'bytes' for tables that were not compacted), plus a
+            'total' row.
+        """
+        from maguniverse.utils.compact import memory_footprint
+        rows = {}
+        for name, df in tables.items():
+            usage = df.attrs.get('memory_usage')
+            after = memory_footprint(df)
+            rows[name] = {'rows': len(df),
+                          'bytes_before': usage['before'] if usage else after,
+                          'bytes': after}
+        report = pd.DataFrame.from_dict(rows, orient='index',
+                                        columns=['rows', 'bytes_before', 'bytes'])
+        report.loc['total'] = report.sum()
+        return report
+
+    def sky_query(self, tables=None, catalogs=None):
+        """
+        Cone and box searches over the preset tables.
+
+        Parameters
+        ----------
+        tables : dict, optional
+            Already fetched tables, e.g. the first element returned by
+            `fetch_all`. Missing tables are fetched through this service on
+            first use.
+        catalogs : list of str, optional
+            Tables searched by default (all positional and named tables if
+            None).
+
+        Returns
+        -------
+        SkyQuery
+            See `maguniverse.service.sky`, e.g. ``.cone(68.0, 26.0, 2.0)``.
+        """
+        from maguniverse.service.sky import SkyQuery
+        return SkyQuery(tables=tables, fetcher=self, catalogs=catalogs)
+
+    def catalog_store(self, root=None):
+        """
+        Unified store of every preset table in one canonical schema.
+
+        Parameters
+        ----------
+        root : str, optional
+            Directory of the store; ``<session_dir>/catalog`` if None.
+
+        Returns
+        -------
+        CatalogStore
+            See `maguniverse.service.catalog`. Call ``.update()`` to build
+            or refresh it (missing tables are fetched through this
+            service) and ``.open()`` to read it.
+        """
+        from maguniverse.service.catalog import CatalogStore
+        root = root if root is not None else os.path.join(self.session_dir, 'catalog')
+        return CatalogStore(root, fetcher=self)
+
+    def get_many(self, names, max_workers=4) -> tuple:
+        """
+        Fetch several preset tables concurrently on a bounded thread pool.
+
+        A failure in one table (e.g. a CAPTCHA page on every proxy) is recorded
+        and does not abort the remaining downloads, also when CAPTCHA pages
+        make `get_ascii` exit (interactive mode).
+
+        Parameters
+        ----------
+        names : list of str
+            Preset getter names, e.g. ['dotson2010_t2', 'liu2022_t1'].
+        max_workers : int, optional
+            Maximum number of concurrent downloads. In the pyodide environment
+            tables are always fetched one after another.
+
+        Returns
+        -------
+        tuple
+            (tables, errors) where `tables` maps each successful name to its
+            DataFrame and `errors` maps each failed name to its exception.
+
+        Raises
+        ------
+        ValueError
+            If a name is not one of `preset_tables`.
+        """
+        unknown = [name for name in names if name not in self.preset_tables]
+        if unknown:
+            raise ValueError(f"Unknown preset tables: {unknown}. "
+                             f"Available: {self.preset_tables}")
+
+        tables, errors = {}, {}
+        if self.env == 'pyodide' or max_workers <= 1:
+            # no threads in the browser
+            for name in names:
+                try:
+                    tables[name] = getattr(self, name)()
+                except (Exception, SystemExit) as e:
+                    # interactive CAPTCHA handling exits; keep the batch going
+                    errors[name] = e
+        else:
+            from concurrent.futures import ThreadPoolExecutor
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                futures = {name: pool.submit(getattr(self, name)) for name in names}
+                for name, future in futures.items():
+                    try:
+                        tables[name] = future.result()
+                    except (Exception, SystemExit) as e:
+                        errors[name] = e
+
+        for name, e in errors.items():
+            self.logger.error(f"✗ {name} failed: {str(e)[:100]}")
+        self.logger.info(f"Fetched {len(tables)}/{len(names)} tables")
+        return tables, errors
+
+    def fetch_all(self, max_workers=4) -> tuple:
+        """
+        Fetch every preset table concurrently.
+
+        Parameters
+        ----------
+        max_workers : int, optional
+            Maximum number of concurrent downloads.
+
+        Returns
+        -------
+        tuple
+            (tables, errors) as returned by `get_many`.
+        """
+        return self.get_many(self.preset_tables, max_workers=max_workers)
+
     def _try_with_proxy_fallback(self, data_fetcher, data_source, table_key, **kwargs) -> pd.DataFrame:
         """
         Try to fetch data using multiple proxy options until successful or all options exhausted.
@@ -72,28 +327,59 @@ class getters():
         Returns
         -------
         DataFrame
-            The fetched data
+            The fetched data. If every option answered with a CAPTCHA (or is
+            cooling down after one), the last good cached or bundled copy is
+            parsed instead and flagged with ``attrs['stale'] = True``.
             
         Raises
         ------
         Exception
-            If all proxy options fail
+            If all proxy options fail and no stale copy is available
+        """
+        captchas = []
+        try:
+            if self.hedge_delay is not None and self.env != 'pyodide':
+                return self._try_with_proxy_hedged(data_fetcher, data_source, table_key,
+                                                   captchas, **kwargs)
+            return self._try_with_proxy_sequential(data_fetcher, data_source, table_key,
+                                                   captchas, **kwargs)
+        except Exception:
+            blocked = not self.scoreboard.rank(self.proxy_options,
+                                               data_source['data_link'][table_key])
+            if not (captchas or blocked):
+                raise
+            result = self._stale_fallback(data_fetcher, data_source, table_key,
+                                          captchas, **kwargs)
+            if result is None:
+                raise
+            return result
+
+    def _try_with_proxy_sequential(self, data_fetcher, data_source, table_key, captchas,
+                                   **kwargs) -> pd.DataFrame:
+        """
+        Try proxy options one after another, fastest expected first.
+
+        Parameters are those of `_try_with_proxy_fallback`; CAPTCHA errors are
+        appended to `captchas`.
         """
         original_url = data_source['data_link'][table_key]
         last_exception = None
         
         self.logger.info(f"Starting proxy fallback for: {original_url}")
         
-        for i, proxy in enumerate(self.proxy_options):
-            proxy_name = "direct access" if not proxy else f"proxy {i}: {proxy.split('//')[1].split('/')[0]}"
+        # Try the options with the shortest expected time-to-success first
+        ranked = self.scoreboard.rank(self.proxy_options, original_url)
+        if not ranked:
+            raise Exception(f"All {len(self.proxy_options)} proxy options for {original_url} "
+                            "are cooling down after CAPTCHA responses.")
+        for attempt, (i, proxy) in enumerate(ranked):
+            proxy_name = self._proxy_name(i, proxy)
             try:
-                # Construct the URL with the current proxy
-                file_url = proxy + original_url if proxy else original_url
-                
-                self.logger.info(f"Attempt {i+1}/{len(self.proxy_options)}: Trying {proxy_name}")
+                self.logger.info(f"Attempt {attempt+1}/{len(ranked)}: Trying {proxy_name}")
                 
                 # Attempt to fetch the data
-                result = data_fetcher(file_url=file_url, **kwargs)
+                result = self._timed_attempt(data_fetcher, proxy, original_url, captchas,
+                                             **kwargs)
                 
                 self.logger.info(f"✓ SUCCESS with {proxy_name}!")
                 return result
@@ -102,24 +388,193 @@ class getters():
                 last_exception = e
                 error_msg = str(e)[:100] + "..." if len(str(e)) > 100 else str(e)
                 self.logger.warning(f"✗ Failed with {proxy_name}: {error_msg}")
-                
-                # If this is not the last option, continue to next proxy
-                if i < len(self.proxy_options) - 1:
-                    continue
         
         # If we get here, all proxy options failed
-        error_msg = (f"All {len(self.proxy_options)} proxy options failed for {original_url}. "
+        error_msg = (f"All {len(ranked)} proxy options failed for {original_url}. "
                     f"Last error: {str(last_exception)}")
         self.logger.error(error_msg)
         raise Exception(error_msg)
 
+    def _try_with_proxy_hedged(self, data_fetcher, data_source, table_key, captchas,
+                               **kwargs) -> pd.DataFrame:
+        """
+        Race proxy options with hedging and return the first successful result.
+
+        Proxy options are started in order, each `hedge_delay` seconds after
+        the previous one (or immediately after a failure). Once an attempt
+        succeeds, attempts that have not started are cancelled and those still
+        in flight are abandoned; their results are discarded.
+
+        Parameters
+        ----------
+        data_fetcher : function
+            The data fetching function (e.g., get_dotson2010)
+        data_source : dict
+            The data source dictionary containing URLs
+        table_key : str
+            The key for the specific table URL in the data source
+        captchas : list
+            CAPTCHA errors raised by the attempts are appended here
+        **kwargs : dict
+            Additional keyword arguments to pass to the data fetcher
+
+        Returns
+        -------
+        DataFrame
+            The fetched data
+
+        Raises
+        ------
+        Exception
+            If all proxy options fail
+        """
+        from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+        original_url = data_source['data_link'][table_key]
+        # only the winner writes the processed table
+        save_path = kwargs.pop('save_path', None)
+        last_exception = None
+
+        self.logger.info(f"Starting hedged proxy race for: {original_url}")
+
+        ranked = self.scoreboard.rank(self.proxy_options, original_url)
+        n_options = len(ranked)
+        if not ranked:
+            raise Exception(f"All {len(self.proxy_options)} proxy options for {original_url} "
+                            "are cooling down after CAPTCHA responses.")
+        pool = ThreadPoolExecutor(max_workers=n_options)
+        running = {}
+
+        def launch(attempt):
+            i, proxy = ranked[attempt]
+            self.logger.info(f"Attempt {attempt+1}/{n_options}: Starting {self._proxy_name(i, proxy)}")
+            future = pool.submit(self._timed_attempt, data_fetcher, proxy, original_url,
+                                 captchas, **kwargs)
+            running[future] = self._proxy_name(i, proxy)
+
+        try:
+            launch(0)
+            next_option = 1
+            while running:
+                if next_option < n_options and self.hedge_delay == 0:
+                    launch(next_option)
+                    next_option += 1
+                    continue
+                timeout = self.hedge_delay if next_option < n_options else None
+                done, _ = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+                for future in done:
+                    proxy_name = running.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        last_exception = e
+                        error_msg = str(e)[:100] + "..." if len(str(e)) > 100 else str(e)
+                        self.logger.warning(f"✗ Failed with {proxy_name}: {error_msg}")
+                        continue
+                    self.logger.info(f"✓ SUCCESS with {proxy_name}!")
+                    for loser in running:
+                        loser.cancel()
+                    if save_path:
+                        write_table(result, save_path)
+                    return result
+                # no success yet: hedge with the next option
+                if next_option < n_options:
+                    launch(next_option)
+                    next_option += 1
+        finally:
+            pool.shutdown(wait=False)
+
+        error_msg = (f"All {n_options} proxy options failed for {original_url}. "
+                     f"Last error: {str(last_exception)}")
+        self.logger.error(error_msg)
+        raise Exception(error_msg)
+
+    def _timed_attempt(self, data_fetcher, proxy, original_url, captchas, **kwargs) -> pd.DataFrame:
+        """
+        Run one fetch through `proxy` and record its latency and outcome.
+
+        The fetch is made with `attempt_retries` retries and a
+        `connect_timeout` second connect timeout, so an unreachable option
+        fails fast and the next one is tried. The raw cache is keyed on
+        `original_url`, so a table cached through one proxy is revalidated
+        through any other.
+
+        A CAPTCHA response is appended to `captchas` and opens the circuit
+        breaker of the proxy/host pair for `captcha_cooldown` seconds.
+        """
+        file_url = proxy + original_url if proxy else original_url
+        start = time.time()
+        try:
+            # scoped to this attempt, which may run on a hedging thread
+            with headless_mode(self.headless), cache_as(original_url), \
+                    transport_options(retries=self.attempt_retries,
+                                      connect_timeout=self.connect_timeout):
+                result = data_fetcher(file_url=file_url, **kwargs)
+        except CaptchaRequired as e:
+            self.scoreboard.record(proxy, original_url, time.time() - start, 'captcha')
+            self.scoreboard.trip(proxy, original_url, self.captcha_cooldown)
+            captchas.append(e)
+            raise
+        except Exception:
+            self.scoreboard.record(proxy, original_url, time.time() - start, 'failure')
+            raise
+        self.scoreboard.record(proxy, original_url, time.time() - start, 'success')
+        return result
+
+    def _stale_fallback(self, data_fetcher, data_source, table_key, captchas, **kwargs):
+        """
+        Parse the last good cached or bundled copy of a table.
+
+        Candidates are, in order: the cached copies carried by the CAPTCHA
+        errors, the cached copy of the original URL, and the bundled local
+        file of the table (the matching ``*_local`` data link).
+
+        Returns
+        -------
+        DataFrame or None
+            The table with ``attrs['stale'] = True`` and ``attrs['stale_source']``
+            set to the file it was parsed from, or None if no copy exists.
+        """
+        from maguniverse.utils import get_default_data_paths
+        from maguniverse.utils.cache import get_default_cache
+
+        original_url = data_source['data_link'][table_key]
+        candidates = [e.cached_path for e in captchas if e.cached_path]
+        entry = get_default_cache().lookup(original_url)
+        if entry is not None:
+            candidates.append(get_default_cache().object_path(entry['sha256']))
+        if table_key.endswith('_ascii'):
+            local_key = table_key[:-len('_ascii')] + '_local'
+            local_path, _ = get_default_data_paths(
+                data_source['data_link'].get(local_key), original_url)
+            if local_path is not None:
+                candidates.append(local_path)
+
+        for path in candidates:
+            try:
+                result = data_fetcher(file_path=path, **kwargs)
+            except Exception as e:
+                self.logger.warning(f"✗ Stale copy {path} unusable: {str(e)[:100]}")
+                continue
+            result.attrs['stale'] = True
+            result.attrs['stale_source'] = path
+            self.logger.warning(f"Serving stale copy of {original_url} from {path}")
+            return result
+        return None
+
+    @staticmethod
+    def _proxy_name(i, proxy) -> str:
+        """Readable label of a proxy option for logging."""
+        return "direct access" if not proxy else f"proxy {i}: {proxy.split('//')[1].split('/')[0]}"
+
     def dotson2010_t1(self) -> pd.DataFrame: 
         from maguniverse.data.polarization  import get_dotson2010
         return self._try_with_proxy_fallback(
             data_fetcher=get_dotson2010,
             data_source=polarization_sources['Dotson2010'],
             table_key='t1_object_list_ascii',
-            save_path=self.session_dir+inspect.stack()[0][3]+'.txt'
+            save_path=self.session_dir+inspect.stack()[0][3]+'.txt',
+            compact=self.compact
         )
     
     def dotson2010_t2(self) -> pd.DataFrame: 
@@ -128,7 +583,8 @@ class getters():
             data_fetcher=get_dotson2010,
             data_source=polarization_sources['Dotson2010'],
             table_key='t2_data_table_ascii',
-            save_path=self.session_dir+inspect.stack()[0][3]+'.txt'
+            save_path=self.session_dir+inspect.stack()[0][3]+'.txt',
+            compact=self.compact
         )
     
     def harris2018_t2(self) -> pd.DataFrame: 
@@ -138,7 +594,8 @@ class getters():
             data_source=polarization_sources['Harris2018'],
             table_key='t2_plane_fitting',
             save_path=self.session_dir+inspect.stack()[0][3]+'.txt',
-            table='t2'
+            table='t2',
+            compact=self.compact
         )
     
     def harris2018_t3(self) -> pd.DataFrame: 
@@ -148,7 +605,8 @@ class getters():
             data_source=polarization_sources['Harris2018'],
             table_key='t3_polarization',
             save_path=self.session_dir+inspect.stack()[0][3]+'.txt',
-            table='t3'
+            table='t3',
+            compact=self.compact
         )
     
     def matthews2009_t6(self) -> pd.DataFrame: 
@@ -157,7 +615,8 @@ class getters():
             data_fetcher=get_matthews2009,
             data_source=polarization_sources['Matthews2009'],
             table_key='t6_polarization',
-            save_path=self.session_dir+inspect.stack()[0][3]+'.txt'
+            save_path=self.session_dir+inspect.stack()[0][3]+'.txt',
+            compact=self.compact
         )
     
     def crutcher2010_t1(self) -> pd.DataFrame: 
@@ -166,7 +625,8 @@ class getters():
             data_fetcher=get_crutcher2010,
             data_source=zeeman_sources['Crutcher2010'],
             table_key='table1_ascii',
-            save_path=self.session_dir+inspect.stack()[0][3]+'.txt'
+            save_path=self.session_dir+inspect.stack()[0][3]+'.txt',
+            compact=self.compact
         )
     
     def jijina1999_t2(self) -> pd.DataFrame: 
@@ -175,7 +635,8 @@ class getters():
             data_fetcher=get_jijina1999,
             data_source=gas_sources['Jijina1999'],
             table_key='t2_gas_properties',
-            save_path=self.session_dir+inspect.stack()[0][3]+'.txt'
+            save_path=self.session_dir+inspect.stack()[0][3]+'.txt',
+            compact=self.compact
         )
 
     def liu2022_t1(self) -> pd.DataFrame: 
@@ -184,7 +645,8 @@ class getters():
             data_fetcher=get_liu2022,
             data_source=processed_data_tables['Liu2022'],
             table_key='t1_data_table_ascii',
-            save_path=self.session_dir+inspect.stack()[0][3]+'.txt'
+            save_path=self.session_dir+inspect.stack()[0][3]+'.txt',
+            compact=self.compact
         )
 
 
@@ -0,0 +1,199 @@
+# -*- coding: utf-8 -*-
+"""
+scoreboard.py
+-----------
+
+Persistent per-proxy, per-host fetch statistics used by the `getters` service
+to order proxy options by expected time-to-success.
+
+Every attempt records its latency and outcome (success, failure or CAPTCHA)
+under the key ``"<proxy>|<host>"``. Counts decay exponentially with a
+configurable half-life, so a proxy that failed yesterday drifts back towards
+the neutral prior and is tried again once it has recovered.
+
+A CAPTCHA can also trip a per-key circuit breaker, which keeps the proxy/host
+pair out of the rotation until its cool-down has elapsed.
+"""
+
+import json
+import os
+import threading
+import time
+from urllib.parse import urlparse
+
+
+class ProxyScoreboard():
+    """
+    Decaying latency / success / CAPTCHA statistics persisted as JSON.
+
+    Parameters
+    ----------
+    store_path : str or None
+        JSON file holding the statistics. None keeps them in memory only.
+    half_life : float, optional
+        Seconds after which the weight of past observations is halved.
+    prior_latency : float, optional
+        Latency (s) assumed for proxy/host pairs without observations.
+    """
+
+    def __init__(self, store_path=None, half_life=86400.0, prior_latency=2.0) -> None:
+        self.store_path = store_path
+        self.half_life = half_life
+        self.prior_latency = prior_latency
+        self._lock = threading.Lock()
+        self._records = self._load()
+        return
+
+    def _load(self):
+        if self.store_path is None:
+            return {}
+        try:
+            with open(self.store_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self):
+        if self.store_path is None:
+            return
+        tmp_path = f"{self.store_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._records, f, indent=1)
+            os.replace(tmp_path, self.store_path)
+        except OSError:
+            pass
+
+    @staticmethod
+    def key(proxy, url) -> str:
+        """Scoreboard key of a proxy option and the host of the original URL."""
+        return f"{proxy}|{urlparse(url).netloc}"
+
+    def _decayed(self, record, now):
+        """Return a copy of `record` with its counts decayed to time `now`."""
+        factor = 0.5 ** (max(now - record['updated'], 0.0) / self.half_life)
+        decayed = dict(record)
+        for field in ('attempts', 'successes', 'captchas'):
+            decayed[field] = record[field] * factor
+        return decayed
+
+    def record(self, proxy, url, latency, outcome) -> None:
+        """
+        Record one fetch attempt.
+
+        Parameters
+        ----------
+        proxy : str
+            Proxy prefix ("" for direct access).
+        url : str
+            Original (unproxied) table URL.
+        latency : float
+            Wall time of the attempt in seconds.
+        outcome : {'success', 'failure', 'captcha'}
+            Result of the attempt.
+        """
+        now = time.time()
+        key = self.key(proxy, url)
+        with self._lock:
+            record = self._records.get(key)
+            if record is None:
+                record = {'attempts': 0.0, 'successes': 0.0, 'captchas': 0.0,
+                          'latency': latency, 'updated': now}
+            else:
+                record = self._decayed(record, now)
+                # exponentially weighted latency of all attempts
+                record['latency'] = 0.7 * record['latency'] + 0.3 * latency
+            record['attempts'] += 1.0
+            if outcome == 'success':
+                record['successes'] += 1.0
+            elif outcome == 'captcha':
+                record['captchas'] += 1.0
+            record['updated'] = now
+            self._records[key] = record
+            self._save()
+
+    def trip(self, proxy, url, cooldown) -> None:
+        """
+        Open the circuit breaker of a proxy/host pair for `cooldown` seconds.
+
+        Parameters
+        ----------
+        proxy : str
+            Proxy prefix ("" for direct access).
+        url : str
+            Original (unproxied) table URL.
+        cooldown : float
+            Seconds during which the pair is skipped.
+        """
+        now = time.time()
+        key = self.key(proxy, url)
+        with self._lock:
+            record = self._records.setdefault(
+                key, {'attempts': 0.0, 'successes': 0.0, 'captchas': 0.0,
+                      'latency': self.prior_latency, 'updated': now})
+            record['open_until'] = now + cooldown
+            self._save()
+
+    def is_tripped(self, proxy, url) -> bool:
+        """True while the circuit breaker of a proxy/host pair is open."""
+        with self._lock:
+            record = self._records.get(self.key(proxy, url))
+        return record is not None and record.get('open_until', 0.0) > time.time()
+
+    def stats(self, proxy, url) -> dict:
+        """
+        Return decayed statistics of a proxy/host pair.
+
+        Returns
+        -------
+        dict
+            'attempts', 'success_rate', 'captcha_rate', 'latency' and
+            'expected_time' (expected seconds until a successful fetch).
+        """
+        with self._lock:
+            record = self._records.get(self.key(proxy, url))
+        if record is None:
+            attempts, successes, captchas = 0.0, 0.0, 0.0
+            latency = self.prior_latency
+        else:
+            record = self._decayed(record, time.time())
+            attempts, successes, captchas = (record['attempts'], record['successes'],
+                                             record['captchas'])
+            latency = record['latency']
+        # Laplace prior: an unseen pair succeeds half of the time
+        success_rate = (successes + 1.0) / (attempts + 2.0)
+        return {
+            'attempts': attempts,
+            'success_rate': success_rate,
+            'captcha_rate': captchas / attempts if attempts else 0.0,
+            'latency': latency,
+            'expected_time': latency / success_rate,
+        }
+
+    def rank(self, proxies, url) -> list:
+        """
+        Order proxy options by expected time-to-success for `url`.
+
+        Parameters
+        ----------
+        proxies : list of str
+            Proxy prefixes in their configured order.
+        url : str
+            Original (unproxied) table URL.
+
+        Returns
+        -------
+        list of tuple
+            (configured_index, proxy) pairs, fastest expected first. Ties keep
+            the configured order. Pairs with an open circuit breaker are left out.
+        """
+        available = [(i, proxy) for i, proxy in enumerate(proxies)
+                     if not self.is_tripped(proxy, url)]
+        return sorted(available,
+                      key=lambda item: self.stats(item[1], url)['expected_time'])
+
+    def reset(self) -> None:
+        """Forget all recorded statistics."""
+        with self._lock:
+            self._records = {}
+            self._save()
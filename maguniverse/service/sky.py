@@ -0,0 +1,293 @@
+# -*- coding: utf-8 -*-
+"""
+sky.py
+-----------
+
+Sky-region queries across the polarization, zeeman, gas and processed
+tables.
+
+Every catalog registered in `sky_catalogs` is placed on the sky once per
+parsed table and partitioned into tiles (`maguniverse.utils.sky_tiles`);
+cone and box queries then read only the tiles the region overlaps and take
+the matching rows. Catalogs are placed
+
+- by their own ``ra_deg`` / ``dec_deg`` columns ('table'),
+- by a catalog-specific function, e.g. Dotson et al. (2010) table 2 joined
+  to the table 1 map centres, or
+- by source name ('name'), for the tables that carry no positions: each
+  name is looked up, by its canonical key (`maguniverse.utils.names`),
+  among the sources of the positional catalogs. Rows with unknown names
+  are never returned.
+
+Results are the matching rows of every catalog stacked into one DataFrame,
+led by provenance columns.
+"""
+
+import logging
+
+import numpy as np
+import pandas as pd
+
+from maguniverse.data import gas_sources, polarization_sources, zeeman_sources
+from maguniverse.data.processed import processed_data_tables
+from maguniverse.utils.crossmatch import unit_vectors
+from maguniverse.utils.names import table_keys
+from maguniverse.utils.sky_tiles import sky_tiles
+
+_SOURCES = {
+    'polarization': polarization_sources,
+    'zeeman': zeeman_sources,
+    'gas': gas_sources,
+    'processed': processed_data_tables,
+}
+
+_PROVENANCE = ['catalog', 'module', 'reference', 'doi', 'row', 'located_by']
+
+
+def _locate_dotson2010_t2(df, query):
+    """Absolute positions of the Dotson et al. (2010) vectors."""
+    from maguniverse.data.polarization import join_dotson2010
+    return join_dotson2010(df, query.table('dotson2010_t1'))
+
+
+# Catalogs searched by `SkyQuery`, keyed by preset getter name.
+#   module      : data module of the catalog
+#   reference   : key of the catalog in the module's sources dict
+#   locate      : 'table', 'name' or a function (df, query) -> df with positions
+#   requires    : catalogs `locate` reads
+sky_catalogs = {
+    'dotson2010_t1': {'module': 'polarization', 'reference': 'Dotson2010',
+                      'locate': 'table'},
+    'dotson2010_t2': {'module': 'polarization', 'reference': 'Dotson2010',
+                      'locate': _locate_dotson2010_t2, 'requires': ['dotson2010_t1']},
+    'harris2018_t2': {'module': 'polarization', 'reference': 'Harris2018',
+                      'locate': 'table'},
+    'harris2018_t3': {'module': 'polarization', 'reference': 'Harris2018',
+                      'locate': 'name'},
+    'matthews2009_t6': {'module': 'polarization', 'reference': 'Matthews2009',
+                        'locate': 'table'},
+    'crutcher2010_t1': {'module': 'zeeman', 'reference': 'Crutcher2010',
+                        'locate': 'name'},
+    'jijina1999_t2': {'module': 'gas', 'reference': 'Jijina1999',
+                      'locate': 'name'},
+    'liu2022_t1': {'module': 'processed', 'reference': 'Liu2022',
+                   'locate': 'name'},
+}
+
+
+def located_by(name):
+    """How a catalog is placed on the sky: 'table' or 'name'."""
+    locate = sky_catalogs[name]['locate']
+    return locate if isinstance(locate, str) else 'table'
+
+
+class SkyQuery():
+    """
+    Cone and box searches over the registered catalogs.
+
+    Catalogs are loaded, placed and tiled on first use and kept for the
+    lifetime of the object; tilings are also cached on disk, so they are
+    built once per parsed table.
+
+    Parameters
+    ----------
+    tables : dict, optional
+        Preset name to already fetched DataFrame, e.g. the tables returned
+        by ``getters.fetch_all()``. Other catalogs are fetched on demand.
+    fetcher : getters, optional
+        Service used to fetch missing catalogs. A default ``getters()`` is
+        created when one is needed.
+    catalogs : list of str, optional
+        Catalogs searched by default (all of `sky_catalogs` if None).
+    zone_deg : float, optional
+        Height of the declination zones of the tilings, in degrees.
+    """
+
+    def __init__(self, tables=None, fetcher=None, catalogs=None, zone_deg=1.0) -> None:
+        self.catalogs = list(catalogs) if catalogs is not None else list(sky_catalogs)
+        unknown = [name for name in self.catalogs if name not in sky_catalogs]
+        if unknown:
+            raise ValueError(f"Unknown sky catalogs: {unknown}. "
+                             f"Available: {list(sky_catalogs)}")
+        self.fetcher = fetcher
+        self.zone_deg = zone_deg
+        # Raw tables, placed tables and tilings by catalog name
+        self._tables = dict(tables) if tables is not None else {}
+        self._placed = {}
+        self._tiles = {}
+        self._names = None
+        # Catalogs that could not be loaded or placed, with their exception
+        self.errors = {}
+        self.logger = logging.getLogger(__name__)
+        return
+
+    def table(self, name) -> pd.DataFrame:
+        """Raw table of a catalog, fetched on first use."""
+        if name not in self._tables:
+            if self.fetcher is None:
+                from maguniverse.service.get import getters
+                self.fetcher = getters()
+            self._tables[name] = getattr(self.fetcher, name)()
+        return self._tables[name]
+
+    def _name_positions(self):
+        """Unit vector of each source name of the catalogs with own positions."""
+        if self._names is None:
+            keys, vectors = [], []
+            for name, df in self._placed.items():
+                catalog = sky_catalogs[name]
+                if df is None or catalog['locate'] == 'name' or 'name_key' not in df:
+                    continue
+                keys.append(table_keys(df))
+                vectors.append(unit_vectors(df['ra_deg'], df['dec_deg']))
+            names = pd.DataFrame(np.concatenate(vectors) if vectors else np.empty((0, 3)),
+                                 columns=['x', 'y', 'z'])
+            names['key'] = np.concatenate(keys) if keys else np.empty(0, dtype=object)
+            # mean direction over every row naming the source
+            self._names = names.dropna().groupby('key', sort=False).mean()
+        return self._names
+
+    def _place(self, name):
+        """Load a catalog, add positions and build its tiling."""
+        catalog = sky_catalogs[name]
+        try:
+            for required in catalog.get('requires', []):
+                self.table(required)
+            df = self.table(name)
+            locate = catalog['locate']
+            if callable(locate):
+                df = locate(df, self)
+            elif locate == 'name':
+                names = self._name_positions()
+                found = names.reindex(table_keys(df))
+                norm = np.linalg.norm(found.to_numpy(dtype=np.float64), axis=1)
+                df = df.copy()
+                df['ra_deg'] = np.degrees(np.arctan2(found['y'], found['x'])).to_numpy() % 360.0
+                df['dec_deg'] = np.degrees(np.arcsin(found['z'].to_numpy() / norm))
+            self._placed[name] = df
+            self._tiles[name] = sky_tiles(df, zone_deg=self.zone_deg)
+        except Exception as e:
+            self.errors[name] = e
+            self._placed[name] = None
+            self.logger.warning(f"✗ {name} left out of sky queries: {str(e)[:100]}")
+
+    def _load(self, catalogs):
+        """Place the requested catalogs, those located by name last."""
+        catalogs = self.catalogs if catalogs is None else catalogs
+        for name in catalogs:
+            if name not in sky_catalogs:
+                raise ValueError(f"Unknown sky catalog: {name}")
+        by_name = [name for name in catalogs if sky_catalogs[name]['locate'] == 'name']
+        if by_name:
+            # names are looked up among every catalog with its own positions
+            for name, catalog in sky_catalogs.items():
+                if catalog['locate'] != 'name' and name not in self._placed:
+                    self._place(name)
+        for name in catalogs:
+            if name not in self._placed:
+                self._place(name)
+        return [name for name in catalogs if self._placed[name] is not None]
+
+    def located(self, name) -> pd.DataFrame:
+        """
+        Table of a catalog with its ``ra_deg`` / ``dec_deg`` columns.
+
+        Raises
+        ------
+        Exception
+            The error that kept the catalog from being loaded or placed.
+        """
+        self._load([name])
+        if self._placed[name] is None:
+            raise self.errors[name]
+        return self._placed[name]
+
+    def _rows(self, name, rows, separation=None):
+        """Rows of a placed catalog, led by provenance columns."""
+        catalog = sky_catalogs[name]
+        df = self._placed[name]
+        source = _SOURCES[catalog['module']][catalog['reference']]
+        hits = df.take(rows)
+        provenance = pd.DataFrame({
+            'catalog': name,
+            'module': catalog['module'],
+            'reference': catalog['reference'],
+            'doi': source.get('doi', ''),
+            'row': hits.index,
+            'located_by': located_by(name),
+        }, index=range(len(hits)))
+        if separation is not None:
+            provenance['sep_deg'] = separation
+        positions = hits[['ra_deg', 'dec_deg']].reset_index(drop=True)
+        rest = hits.drop(columns=['ra_deg', 'dec_deg']).reset_index(drop=True)
+        return pd.concat([provenance, positions, rest], axis=1)
+
+    def _collect(self, parts):
+        """Stack the per-catalog results."""
+        columns = _PROVENANCE + ['ra_deg', 'dec_deg']
+        parts = [part for part in parts if len(part)]
+        if not parts:
+            return pd.DataFrame(columns=columns)
+        return pd.concat(parts, ignore_index=True)
+
+    def cone(self, ra_deg, dec_deg, radius_deg, catalogs=None) -> pd.DataFrame:
+        """
+        All rows within `radius_deg` of a position.
+
+        Parameters
+        ----------
+        ra_deg, dec_deg : float
+            Centre of the cone (J2000), in degrees.
+        radius_deg : float
+            Radius of the cone, in degrees.
+        catalogs : list of str, optional
+            Catalogs to search; those given at construction if None.
+
+        Returns
+        -------
+        DataFrame
+            Matching rows of every catalog, sorted by catalog and separation,
+            with the provenance columns
+            - catalog : Preset table name, e.g. 'matthews2009_t6'
+            - module : 'polarization', 'zeeman', 'gas' or 'processed'
+            - reference, doi : Paper the table comes from
+            - row : Index label of the row in its table
+            - located_by : 'table' (own positions) or 'name' (source name)
+            - sep_deg : Separation from the centre (degrees)
+            followed by ra_deg, dec_deg and the columns of the tables.
+
+        Examples
+        --------
+        >>> SkyQuery().cone(68.0, 26.0, 2.0)  # within 2° of Taurus
+        """
+        parts = []
+        for name in self._load(catalogs):
+            rows, separation = self._tiles[name].query_cone(ra_deg, dec_deg, radius_deg)
+            parts.append(self._rows(name, rows, separation))
+        return self._collect(parts)
+
+    def box(self, ra_min, ra_max, dec_min, dec_max, catalogs=None) -> pd.DataFrame:
+        """
+        All rows inside an RA/Dec box.
+
+        Parameters
+        ----------
+        ra_min, ra_max : float
+            RA range (J2000) in degrees; ``ra_min > ra_max`` wraps through
+            RA = 0.
+        dec_min, dec_max : float
+            Declination range in degrees.
+        catalogs : list of str, optional
+            Catalogs to search; those given at construction if None.
+
+        Returns
+        -------
+        DataFrame
+            Matching rows of every catalog in table order, with the
+            provenance columns of `cone` (without 'sep_deg').
+        """
+        parts = []
+        for name in self._load(catalogs):
+            rows = self._tiles[name].query_box(ra_min, ra_max, dec_min, dec_max)
+            parts.append(self._rows(name, rows))
+        return self._collect(parts)
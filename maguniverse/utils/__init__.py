@@ -1,6 +1,49 @@
-from maguniverse.utils.fetch_ascii import get_default_data_paths, get_ascii
+from maguniverse.utils.fetch_ascii import (get_default_data_paths, get_ascii,
+                                           CaptchaRequired, set_headless,
+                                           headless_mode, cache_as)
+from maguniverse.utils.cache import configure_cache, get_cache_stats, reset_cache_stats
+from maguniverse.utils.transport import configure_transport, get_session, transport_options
+from maguniverse.utils.mrt import iter_mrt, read_mrt, read_mrt_schema
+from maguniverse.utils.table_cache import (configure_table_cache, get_table_cache_stats,
+                                           TableWriter, write_table)
+from maguniverse.utils.compact import compact_frame
+from maguniverse.utils.coordinates import parse_sexagesimal, equatorial_to_galactic
+from maguniverse.utils.crossmatch import crossmatch, sky_index
+from maguniverse.utils.sky_tiles import SkyTiles, sky_tiles
+from maguniverse.utils.names import (add_aliases, AliasTable, get_alias_table, join_names,
+                                     name_key, normalize_names)
 
 __all__ = [
     'get_default_data_paths', 
-    'get_ascii'
+    'get_ascii',
+    'CaptchaRequired',
+    'set_headless',
+    'headless_mode',
+    'cache_as',
+    'configure_cache',
+    'get_cache_stats',
+    'reset_cache_stats',
+    'configure_transport',
+    'get_session',
+    'transport_options',
+    'read_mrt',
+    'read_mrt_schema',
+    'iter_mrt',
+    'configure_table_cache',
+    'get_table_cache_stats',
+    'write_table',
+    'TableWriter',
+    'compact_frame',
+    'parse_sexagesimal',
+    'equatorial_to_galactic',
+    'crossmatch',
+    'sky_index',
+    'SkyTiles',
+    'sky_tiles',
+    'normalize_names',
+    'name_key',
+    'AliasTable',
+    'get_alias_table',
+    'add_aliases',
+    'join_names'
 ]
\ No newline at end of file
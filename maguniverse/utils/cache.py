@@ -0,0 +1,241 @@
+# -*- coding: utf-8 -*-
+"""
+cache.py
+-----------
+
+Persistent, content-addressed cache for raw ASCII tables fetched by
+`get_ascii`.
+
+Each remote URL maps to an index entry holding the SHA-256 of the last good
+copy together with the ETag / Last-Modified validators returned by the server.
+The text itself is stored once per digest under ``objects/<sha256>.txt``, so
+identical files served from different URLs (e.g. through different proxies)
+share a single copy on disk.
+
+The cache location defaults to ``~/.cache/maguniverse`` and can be overridden
+with the ``MAGUNIVERSE_CACHE_DIR`` environment variable or `configure_cache`.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+
+
+def _default_cache_dir():
+    """Return the cache directory from the environment or the user home."""
+    env_dir = os.environ.get('MAGUNIVERSE_CACHE_DIR')
+    if env_dir:
+        return env_dir
+    return os.path.join(os.path.expanduser('~'), '.cache', 'maguniverse')
+
+
+class RawCache():
+    """
+    On-disk cache of raw ASCII tables keyed by URL and content SHA-256.
+
+    Parameters
+    ----------
+    cache_dir : str or None
+        Root directory of the cache. Defaults to `_default_cache_dir()`.
+    max_age : float, optional
+        Seconds during which a cached entry is served without contacting the
+        server. With the default of 0 every lookup is revalidated with a
+        conditional GET.
+    """
+
+    def __init__(self, cache_dir=None, max_age=0) -> None:
+        self.cache_dir = cache_dir if cache_dir is not None else _default_cache_dir()
+        self.max_age = max_age
+        self.objects_dir = os.path.join(self.cache_dir, 'objects')
+        self.index_path = os.path.join(self.cache_dir, 'index.json')
+        self._lock = threading.Lock()
+        self._index = None
+        self.stats = {'hits': 0, 'misses': 0, 'revalidated': 0}
+        return
+
+    def _load_index(self):
+        if self._index is None:
+            try:
+                with open(self.index_path, 'r', encoding='utf-8') as f:
+                    self._index = json.load(f)
+            except (OSError, ValueError):
+                self._index = {}
+        return self._index
+
+    def _write_index(self):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = f"{self.index_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._index, f, indent=1)
+        os.replace(tmp_path, self.index_path)
+
+    def object_path(self, digest):
+        """Return the on-disk path of the object with the given SHA-256."""
+        return os.path.join(self.objects_dir, digest + '.txt')
+
+    def lookup(self, url):
+        """
+        Return the index entry for `url`, or None if absent or its object is missing.
+
+        Returns
+        -------
+        dict or None
+            Keys: 'sha256', 'etag', 'last_modified', 'fetched'.
+        """
+        with self._lock:
+            entry = self._load_index().get(url)
+        if entry is None or not os.path.exists(self.object_path(entry['sha256'])):
+            return None
+        return dict(entry)
+
+    def is_fresh(self, entry):
+        """True if `entry` is younger than `max_age` and needs no revalidation."""
+        return bool(self.max_age) and (time.time() - entry['fetched']) < self.max_age
+
+    def conditional_headers(self, entry):
+        """Build If-None-Match / If-Modified-Since headers for a cached entry."""
+        headers = {}
+        if entry is None:
+            return headers
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def read(self, entry):
+        """Read the cached text of an index entry."""
+        with open(self.object_path(entry['sha256']), 'r', encoding='utf-8') as f:
+            return f.read()
+
+    def store(self, url, text, etag=None, last_modified=None):
+        """
+        Store `text` fetched from `url` and update its validators.
+
+        Returns
+        -------
+        dict
+            The new index entry.
+        """
+        digest = hashlib.sha256(text.encode('utf-8')).hexdigest()
+        path = self.object_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(self.objects_dir, exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8', newline='') as f:
+                f.write(text)
+            os.replace(tmp_path, path)
+        return self._register(url, digest, etag, last_modified)
+
+    def store_file(self, url, tmp_path, digest, etag=None, last_modified=None):
+        """
+        Move a fully downloaded file into the cache and update its validators.
+
+        Parameters
+        ----------
+        url : str
+            URL the file was fetched from.
+        tmp_path : str
+            Completed download, ideally inside `objects_dir` so that the move
+            is an atomic rename.
+        digest : str
+            SHA-256 of the file content, computed while streaming.
+
+        Returns
+        -------
+        dict
+            The new index entry.
+        """
+        os.makedirs(self.objects_dir, exist_ok=True)
+        os.replace(tmp_path, self.object_path(digest))
+        return self._register(url, digest, etag, last_modified)
+
+    def _register(self, url, digest, etag, last_modified):
+        entry = {
+            'sha256': digest,
+            'etag': etag,
+            'last_modified': last_modified,
+            'fetched': time.time(),
+        }
+        with self._lock:
+            self._load_index()[url] = entry
+            self._write_index()
+        return dict(entry)
+
+    def touch(self, url):
+        """Mark the entry for `url` as revalidated now."""
+        with self._lock:
+            entry = self._load_index().get(url)
+            if entry is not None:
+                entry['fetched'] = time.time()
+                self._write_index()
+
+    def record(self, event):
+        """Increment one of the 'hits', 'misses' or 'revalidated' counters."""
+        with self._lock:
+            self.stats[event] += 1
+
+    def clear(self):
+        """Forget all index entries (objects on disk are left in place)."""
+        with self._lock:
+            self._index = {}
+            self._write_index()
+
+
+_default_cache = None
+_cache_enabled = True
+
+
+def get_default_cache():
+    """Return the process-wide `RawCache`, creating it on first use."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = RawCache()
+    return _default_cache
+
+
+def configure_cache(cache_dir=None, max_age=0, enabled=True):
+    """
+    Configure the process-wide raw ASCII cache used by `get_ascii`.
+
+    Parameters
+    ----------
+    cache_dir : str or None
+        Cache root directory. None keeps the default location.
+    max_age : float, optional
+        Seconds during which entries are served without revalidation.
+    enabled : bool, optional
+        Set to False to always download the full table.
+    """
+    global _default_cache, _cache_enabled
+    _default_cache = RawCache(cache_dir=cache_dir, max_age=max_age)
+    _cache_enabled = enabled
+
+
+def cache_enabled():
+    """True if `get_ascii` should consult the raw cache."""
+    return _cache_enabled
+
+
+def get_cache_stats():
+    """
+    Return the hit/miss counters of the process-wide raw cache.
+
+    Returns
+    -------
+    dict
+        'hits'        : tables served without a full download
+        'misses'      : full downloads
+        'revalidated' : hits confirmed by a 304 Not Modified response
+    """
+    return dict(get_default_cache().stats)
+
+
+def reset_cache_stats():
+    """Reset the hit/miss counters of the process-wide raw cache."""
+    cache = get_default_cache()
+    with cache._lock:
+        for key in cache.stats:
+            cache.stats[key] = 0
@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+"""
+compact.py
+-----------
+
+Memory-compact dtypes for parsed tables.
+
+`compact_frame` converts
+
+- text columns with repeated values (names, instruments, methods,
+  bibcodes, flags) to categoricals, and other text columns to
+  Arrow-backed strings,
+- integer columns to the smallest integer type holding their range, and
+- float64 columns to float32 where no value carries more significant
+  digits than float32 reproduces,
+
+and records ``memory_usage(deep=True)`` of the table before and after in
+``df.attrs['memory_usage']``.
+"""
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import (infer_dtype, is_bool_dtype, is_float_dtype,
+                              is_integer_dtype, is_string_dtype)
+
+try:
+    import pyarrow  # noqa: F401
+    _HAS_ARROW = True
+except ImportError:  # pragma: no cover - optional dependency
+    _HAS_ARROW = False
+
+# float32 reproduces every decimal of up to 6 significant digits
+_FLOAT32_DIGITS = 6
+_FLOAT32_MAX = float(np.finfo(np.float32).max)
+
+
+def _fits_float32(values, digits):
+    """True if every finite value has at most `digits` significant digits."""
+    finite = values[np.isfinite(values)]
+    finite = finite[finite != 0]
+    if not finite.size:
+        return True
+    if np.abs(finite).max() > _FLOAT32_MAX or np.abs(finite).min() < 1e-30:
+        return False
+    scale = 10.0 ** (digits - 1 - np.floor(np.log10(np.abs(finite))))
+    rounded = np.round(finite * scale) / scale
+    return bool(np.allclose(rounded, finite, rtol=1e-12, atol=0))
+
+
+def _compact_text(column, max_unique_ratio):
+    """Categorical for repeated values, Arrow-backed string otherwise."""
+    if infer_dtype(column, skipna=True) not in ('string', 'empty'):
+        return column
+    n_values = column.notna().sum()
+    if n_values and column.nunique(dropna=True) <= max_unique_ratio * n_values:
+        return column.astype('category')
+    if column.dtype == object and _HAS_ARROW:
+        return column.astype('string[pyarrow]')
+    return column
+
+
+def _compact_numeric(column, float_digits):
+    """Smallest integer type, or float32 where the precision allows."""
+    if is_integer_dtype(column.dtype):
+        return pd.to_numeric(column, downcast='integer')
+    if column.dtype == np.float64 and _fits_float32(column.to_numpy(), float_digits):
+        return column.astype(np.float32)
+    return column
+
+
+def memory_footprint(df):
+    """Deep memory usage of `df` in bytes, index included."""
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+def compact_frame(df, max_unique_ratio=0.5, downcast=True, float_digits=_FLOAT32_DIGITS):
+    """
+    Return a copy of `df` with memory-compact column dtypes.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Parsed table.
+    max_unique_ratio : float, optional
+        Text columns with at most this many distinct values per non-missing
+        entry become categoricals; other text columns become Arrow-backed
+        strings (if ``pyarrow`` is installed).
+    downcast : bool, optional
+        If True, integers are downcast to the smallest type holding their
+        range and float64 columns to float32 when no value has more than
+        `float_digits` significant digits.
+    float_digits : int, optional
+        Significant digits that must survive the float32 downcast (at most 6).
+
+    Returns
+    -------
+    pandas.DataFrame
+        The compacted table. Its attrs are those of `df`, plus
+        ``attrs['memory_usage'] = {'before': bytes, 'after': bytes}``.
+    """
+    before = memory_footprint(df)
+    columns = {}
+    for name, column in df.items():
+        if isinstance(column.dtype, pd.CategoricalDtype) or is_bool_dtype(column.dtype):
+            columns[name] = column
+        elif is_string_dtype(column.dtype):
+            columns[name] = _compact_text(column, max_unique_ratio)
+        elif downcast and (is_integer_dtype(column.dtype) or is_float_dtype(column.dtype)):
+            columns[name] = _compact_numeric(column, min(float_digits, _FLOAT32_DIGITS))
+        else:
+            columns[name] = column
+    out = pd.DataFrame(columns, index=df.index)
+    out.attrs = dict(df.attrs)
+    out.attrs['memory_usage'] = {'before': before, 'after': memory_footprint(out)}
+    return out
@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+"""
+converters.py
+-----------
+
+Typed converters for publisher notations in ASCII tables.
+
+- Scientific notation written as ``3 x 10^4`` (or ``3 × 10^4``) is rewritten
+  to ``3e4`` on the raw bytes, before tokenization, so that numeric columns
+  are parsed straight into float64 by the CSV tokenizer.
+- ``---``, ``...`` and blank fields are missing values.
+- Unit strings are mapped to a canonical spelling (``μG``, ``cm^-3``, ``pc``)
+  and attached to parsed tables in ``df.attrs['units']``.
+"""
+
+import re
+
+import pandas as pd
+
+# Missing-value markers used by the publishers, in addition to blank fields
+NA_VALUES = ['---', '...', '']
+
+# "<mantissa> x 10^<exponent>", with "x" or the multiplication sign
+_SCI_NOTATION = re.compile(rb'(?<=[0-9.])[ ]*(?:x|X|\xc3\x97)[ ]*10\^[ ]*([+-]?[0-9]+)')
+# a bare power of ten, e.g. "10^4"
+_POWER_OF_TEN = re.compile(rb'(?<![0-9.eE])10\^[ ]*([+-]?[0-9]+)')
+_SCI_NOTATION_TEXT = re.compile(r'(?<=[0-9.])[ ]*[xX×][ ]*10\^[ ]*([+-]?[0-9]+)')
+
+_UNIT_ALIASES = {
+    'μG': ('uG', 'ugauss', 'uGauss', 'muG', 'microG', 'microgauss', 'µG', 'μG'),
+    'mG': ('mG', 'mgauss', 'mGauss'),
+    'cm^-3': ('cm-3', 'cm^-3', 'cm^(-3)', 'cm**-3', '/cm3', '1/cm3'),
+    'cm^-2': ('cm-2', 'cm^-2', 'cm^(-2)', 'cm**-2', '/cm2', '1/cm2'),
+    '[cm^-3]': ('[cm-3]', '[cm^-3]'),
+    '[cm^-2]': ('[cm-2]', '[cm^-2]'),
+    'pc': ('pc', 'parsec'),
+    'km/s': ('km/s', 'km s-1', 'km.s-1', 'km s^-1'),
+    'deg': ('deg', 'degree', 'degrees'),
+}
+_CANONICAL_UNITS = {alias: unit for unit, aliases in _UNIT_ALIASES.items()
+                    for alias in aliases}
+
+
+def normalize_sci_notation(data):
+    """
+    Rewrite ``x 10^`` scientific notation in raw table bytes as e-notation.
+
+    Parameters
+    ----------
+    data : bytes
+        Raw table body.
+
+    Returns
+    -------
+    bytes
+        ``b'3 x 10^4'`` becomes ``b'3e4'`` and ``b'10^-2'`` becomes ``b'1e-2'``.
+    """
+    data = _SCI_NOTATION.sub(rb'e\1', data)
+    return _POWER_OF_TEN.sub(rb'1e\1', data)
+
+
+def coerce_float(values):
+    """
+    Convert text values to float64, accepting ``x 10^`` notation.
+
+    Entries that cannot be parsed become NaN, as with ``errors='coerce'``.
+
+    Parameters
+    ----------
+    values : pandas.Series or array-like of str
+
+    Returns
+    -------
+    pandas.Series
+        float64 values.
+    """
+    text = pd.Series(values, dtype=object).astype(str)
+    text = text.str.replace(_SCI_NOTATION_TEXT, r'e\1', regex=True)
+    return pd.to_numeric(text, errors='coerce').astype('float64')
+
+
+def read_csv_typed(buf, dtype, **kwargs):
+    """
+    `pandas.read_csv` with typed numeric columns and publisher missing values.
+
+    The columns in `dtype` are converted by the tokenizer itself. If a column
+    holds an entry that does not parse, the table is read again untyped and
+    those columns are coerced with `coerce_float` (bad entries become NaN).
+
+    Parameters
+    ----------
+    buf : file-like
+        Seekable table body, e.g. from `preslice`.
+    dtype : dict
+        Column name to dtype, e.g. ``{'B_Z (muG)': 'float64'}``.
+    **kwargs : dict
+        Further `pandas.read_csv` arguments.
+
+    Returns
+    -------
+    pandas.DataFrame
+    """
+    kwargs.setdefault('na_values', NA_VALUES)
+    try:
+        return pd.read_csv(buf, dtype=dtype, **kwargs)
+    except ValueError:
+        buf.seek(0)
+        df = pd.read_csv(buf, **kwargs)
+        for col, col_dtype in dtype.items():
+            df[col] = coerce_float(df[col]).astype(col_dtype)
+        return df
+
+
+def canonical_unit(unit):
+    """Return the canonical spelling of `unit` (unknown units are unchanged)."""
+    if unit is None:
+        return None
+    return _CANONICAL_UNITS.get(unit.strip(), unit.strip())
+
+
+def attach_units(df, units):
+    """
+    Store the canonical units of the columns of `df` in ``df.attrs['units']``.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Parsed table; modified in place.
+    units : dict
+        Column name to unit string. Columns missing from `df` are ignored.
+
+    Returns
+    -------
+    pandas.DataFrame
+        `df`, for chaining.
+    """
+    df.attrs['units'] = {col: canonical_unit(unit) for col, unit in units.items()
+                         if col in df.columns}
+    return df
@@ -0,0 +1,304 @@
+# -*- coding: utf-8 -*-
+"""
+crossmatch.py
+-----------
+
+Positional cross-matching of catalogs on the celestial sphere.
+
+Positions are turned into 3-D unit vectors, so that angular separations
+become chord lengths (``2 sin(θ/2)``) and a Euclidean spatial index answers
+sky queries without special cases at RA = 0/360 or the poles. `SkyIndex`
+holds one catalog:
+
+- with ``scipy`` installed it wraps a `scipy.spatial.cKDTree`;
+- otherwise the vectors are sorted by z (i.e. declination) and each query
+  only compares the zone ``|z - z_q| <= chord``, vectorized in blocks.
+
+Indexes are cached per content: in memory, and as pickles in the
+``tables`` directory of the cache, next to the parsed tables, so a catalog
+is indexed once. `crossmatch` matches whole catalogs in batch.
+"""
+
+import os
+import pickle
+import threading
+
+import numpy as np
+import pandas as pd
+
+try:
+    from scipy.spatial import cKDTree
+    _HAS_SCIPY = True
+except ImportError:  # pragma: no cover - optional dependency
+    _HAS_SCIPY = False
+
+from maguniverse.utils.coordinates import position_digest
+from maguniverse.utils.table_cache import get_default_table_cache
+
+_ARCSEC_PER_RADIAN = 180.0 * 3600.0 / np.pi
+# Bump to invalidate cached indexes after a change to their layout
+_INDEX_VERSION = 1
+# Candidate pairs compared at once by the zone search
+_BLOCK_PAIRS = 1 << 18
+
+_index_cache = {}
+_index_cache_lock = threading.Lock()
+
+
+def unit_vectors(ra_deg, dec_deg):
+    """
+    Unit vectors of equatorial positions.
+
+    Parameters
+    ----------
+    ra_deg, dec_deg : array-like
+        Positions in degrees.
+
+    Returns
+    -------
+    numpy.ndarray
+        Array of shape (n, 3).
+    """
+    ra = np.radians(np.asarray(ra_deg, dtype=np.float64))
+    dec = np.radians(np.asarray(dec_deg, dtype=np.float64))
+    cos_dec = np.cos(dec)
+    return np.column_stack([cos_dec * np.cos(ra), cos_dec * np.sin(ra), np.sin(dec)])
+
+
+def _chord(radius_arcsec):
+    """Chord length of an angular radius."""
+    return 2.0 * np.sin(min(radius_arcsec / _ARCSEC_PER_RADIAN, np.pi) / 2.0)
+
+
+def _separation_arcsec(chord):
+    """Angular separation of chord lengths, in arcsec."""
+    return 2.0 * np.arcsin(np.clip(chord / 2.0, 0.0, 1.0)) * _ARCSEC_PER_RADIAN
+
+
+class SkyIndex():
+    """
+    Spatial index over the positions of one catalog.
+
+    Rows with a missing position are left out of the index and never
+    match; returned row numbers refer to the original rows.
+
+    Parameters
+    ----------
+    ra_deg, dec_deg : array-like
+        Positions of the catalog rows, in degrees.
+    """
+
+    def __init__(self, ra_deg, dec_deg) -> None:
+        xyz = unit_vectors(ra_deg, dec_deg)
+        valid = np.isfinite(xyz).all(axis=1)
+        self.size = len(xyz)
+        self.rows = np.flatnonzero(valid)
+        xyz = xyz[valid]
+        if _HAS_SCIPY:
+            self.tree = cKDTree(xyz)
+            self.xyz = None
+        else:
+            self.tree = None
+            order = np.argsort(xyz[:, 2], kind='stable')
+            self.rows = self.rows[order]
+            self.xyz = xyz[order]
+        return
+
+    def query_radius(self, ra_deg, dec_deg, radius_arcsec):
+        """
+        All pairs of query positions and index rows within a radius.
+
+        Parameters
+        ----------
+        ra_deg, dec_deg : array-like
+            Query positions in degrees.
+        radius_arcsec : float
+            Matching radius.
+
+        Returns
+        -------
+        tuple of numpy.ndarray
+            (query_rows, index_rows, separation_arcsec), sorted by query row
+            and separation.
+        """
+        query = unit_vectors(ra_deg, dec_deg)
+        query_rows = np.flatnonzero(np.isfinite(query).all(axis=1))
+        chord = _chord(radius_arcsec)
+        if self.tree is not None:
+            pairs = cKDTree(query[query_rows]).sparse_distance_matrix(
+                self.tree, chord, output_type='ndarray')
+            left = query_rows[pairs['i']]
+            right = self.rows[pairs['j']]
+            distance = pairs['v']
+        else:
+            left, right, distance = self._zone_pairs(query, query_rows, chord)
+        order = np.lexsort((distance, left))
+        return left[order], right[order], _separation_arcsec(distance[order])
+
+    def _zone_pairs(self, query, query_rows, chord):
+        """Pairs within `chord` found by scanning the z zone of each query."""
+        z = self.xyz[:, 2]
+        lo = np.searchsorted(z, query[query_rows, 2] - chord, side='left')
+        hi = np.searchsorted(z, query[query_rows, 2] + chord, side='right')
+        counts = hi - lo
+        lefts, rights, distances = [], [], []
+        # split the queries so that a block compares about _BLOCK_PAIRS pairs
+        bounds = np.searchsorted(np.cumsum(counts), np.arange(_BLOCK_PAIRS, counts.sum(),
+                                                              _BLOCK_PAIRS))
+        for block in np.split(np.arange(len(query_rows)), np.unique(bounds)):
+            n = counts[block]
+            left = np.repeat(block, n)
+            # candidate k of query i is index row lo[i] + k
+            offset = np.arange(n.sum()) - np.repeat(np.cumsum(n) - n, n)
+            right = lo[left] + offset
+            distance = np.linalg.norm(query[query_rows[left]] - self.xyz[right], axis=1)
+            keep = distance <= chord
+            lefts.append(query_rows[left[keep]])
+            rights.append(right[keep])
+            distances.append(distance[keep])
+        left = np.concatenate(lefts) if lefts else np.empty(0, dtype=np.int64)
+        right = np.concatenate(rights) if rights else np.empty(0, dtype=np.int64)
+        distance = np.concatenate(distances) if distances else np.empty(0)
+        return left, self.rows[right], distance
+
+    def query_nearest(self, ra_deg, dec_deg, max_radius_arcsec=None):
+        """
+        Nearest index row of every query position.
+
+        Parameters
+        ----------
+        ra_deg, dec_deg : array-like
+            Query positions in degrees.
+        max_radius_arcsec : float, optional
+            Only rows within this radius match. Without scipy, None searches
+            the whole sky, which compares every pair.
+
+        Returns
+        -------
+        tuple of numpy.ndarray
+            (index_rows, separation_arcsec), one per query position; -1 and
+            NaN where nothing matches.
+        """
+        query = unit_vectors(ra_deg, dec_deg)
+        rows = np.full(len(query), -1, dtype=np.int64)
+        separation = np.full(len(query), np.nan)
+        if not len(self.rows):
+            return rows, separation
+        if self.tree is not None:
+            valid = np.flatnonzero(np.isfinite(query).all(axis=1))
+            bound = _chord(max_radius_arcsec) if max_radius_arcsec is not None else np.inf
+            distance, nearest = self.tree.query(query[valid], k=1, distance_upper_bound=bound)
+            found = np.isfinite(distance)
+            rows[valid[found]] = self.rows[nearest[found]]
+            separation[valid[found]] = _separation_arcsec(distance[found])
+            return rows, separation
+        radius = max_radius_arcsec if max_radius_arcsec is not None else 180.0 * 3600.0
+        left, right, sep = self.query_radius(ra_deg, dec_deg, radius)
+        # pairs are sorted by query and separation: the first of each query wins
+        first = np.ones(len(left), dtype=bool)
+        first[1:] = left[1:] != left[:-1]
+        rows[left[first]] = right[first]
+        separation[left[first]] = sep[first]
+        return rows, separation
+
+
+def _positions(df, ra, dec):
+    """float64 position columns of `df`."""
+    return (df[ra].to_numpy(dtype=np.float64, na_value=np.nan),
+            df[dec].to_numpy(dtype=np.float64, na_value=np.nan))
+
+
+def sky_index(df, ra='ra_deg', dec='dec_deg'):
+    """
+    Return the `SkyIndex` of a catalog, reusing cached indexes.
+
+    Indexes are keyed by the SHA-256 of the position columns, kept in
+    memory and pickled next to the parsed-table cache.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Catalog with positions in degrees.
+    ra, dec : str, optional
+        Names of the position columns.
+
+    Returns
+    -------
+    SkyIndex
+    """
+    ra_deg, dec_deg = _positions(df, ra, dec)
+    key = position_digest(ra_deg, dec_deg, salt=f"{_INDEX_VERSION}:{_HAS_SCIPY}")
+
+    with _index_cache_lock:
+        index = _index_cache.get(key)
+    if index is not None:
+        return index
+
+    cache_dir = get_default_table_cache().cache_dir
+    path = os.path.join(cache_dir, key + '.skyindex')
+    try:
+        with open(path, 'rb') as f:
+            index = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+        index = SkyIndex(ra_deg, dec_deg)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(index, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+    with _index_cache_lock:
+        _index_cache[key] = index
+    return index
+
+
+def crossmatch(left, right, radius_arcsec=None, nearest=True, left_on=('ra_deg', 'dec_deg'),
+               right_on=('ra_deg', 'dec_deg')):
+    """
+    Cross-match two catalogs by position.
+
+    Parameters
+    ----------
+    left, right : pandas.DataFrame
+        Catalogs with positions in degrees, e.g. from ``get_matthews2009()``
+        and ``join_dotson2010()``. The index of `right` is built (or loaded
+        from the cache) with `sky_index`.
+    radius_arcsec : float, optional
+        Matching radius. Required if `nearest` is False.
+    nearest : bool, optional
+        If True, each row of `left` is matched to its nearest row of
+        `right` (within `radius_arcsec` if given). If False, every pair
+        within `radius_arcsec` is returned.
+    left_on, right_on : tuple of str, optional
+        Names of the (RA, Dec) columns.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Columns 'left' and 'right' (index labels of the matched rows) and
+        'sep_arcsec'. Rows of `left` without a match are left out.
+
+    Examples
+    --------
+    >>> pairs = crossmatch(get_matthews2009(), join_dotson2010(), radius_arcsec=30)
+    >>> merged = matthews.loc[pairs['left']].join(dotson.loc[pairs['right']], ...)
+    """
+    if not nearest and radius_arcsec is None:
+        raise ValueError("radius_arcsec is required when nearest is False")
+    index = sky_index(right, *right_on)
+    ra_deg, dec_deg = _positions(left, *left_on)
+    if nearest:
+        rows, separation = index.query_nearest(ra_deg, dec_deg, radius_arcsec)
+        left_rows = np.flatnonzero(rows >= 0)
+        right_rows = rows[left_rows]
+        separation = separation[left_rows]
+    else:
+        left_rows, right_rows, separation = index.query_radius(ra_deg, dec_deg, radius_arcsec)
+    return pd.DataFrame({
+        'left': left.index[left_rows],
+        'right': right.index[right_rows],
+        'sep_arcsec': separation,
+    })
@@ -4,16 +4,153 @@ fetch_ascii.py
 -----------
 
 Utilities for resolving data paths and fetching ASCII tables, with
-CAPTCHA handling for remote downloads.
+CAPTCHA handling for remote downloads. Remote tables are kept in the
+persistent raw cache (see `maguniverse.utils.cache`) and revalidated with
+conditional GETs.
+
+When a publisher answers with a CAPTCHA page, interactive sessions open the
+URL in a browser and exit; headless sessions (see `set_headless`, or
+`headless_mode` for the calls of one block) raise `CaptchaRequired`
+instead, carrying the path of the last good cached copy.
+
+The cache is keyed on the table URL itself; callers that reach a table
+through a proxy prefix pass the original URL as `cache_key` (or wrap the
+calls in `cache_as`), so every proxy shares the same cached copy.
+
+Downloads are decoded with the charset declared in the Content-Type header
+(UTF-8 if none, rather than the ISO-8859-1 that requests assumes for text
+responses) and stored as UTF-8, whether they are streamed to disk or not.
 """
 
+import atexit
+import codecs
+import contextlib
+import contextvars
+import hashlib
 import os
+import shutil
 import sys
+import tempfile
+import threading
 import webbrowser
 
-import requests
-
 from maguniverse import __parent_dir__ as sys_parent
+from maguniverse.utils.cache import get_default_cache, cache_enabled
+from maguniverse.utils.transport import http_get
+
+# Streaming download settings
+_STREAM_CHUNK_SIZE = 1 << 16
+_CAPTCHA_PROBE_SIZE = 1 << 16
+
+# Process-private directory of streamed downloads that have no cache or
+# save_path to live in; removed when the interpreter exits
+_stream_dir = None
+_stream_dir_lock = threading.Lock()
+
+# Headless sessions raise CaptchaRequired instead of opening a browser and exiting
+_headless = os.environ.get('MAGUNIVERSE_HEADLESS', '') not in ('', '0')
+# Setting of the current `headless_mode` block (None outside any block)
+_headless_scope = contextvars.ContextVar('maguniverse_headless', default=None)
+# Raw-cache key of the current `cache_as` block (None outside any block)
+_cache_key_scope = contextvars.ContextVar('maguniverse_cache_key', default=None)
+
+
+class CaptchaRequired(RuntimeError):
+    """
+    Raised in headless mode when a remote table is behind a CAPTCHA page.
+
+    Attributes
+    ----------
+    url : str
+        The URL that answered with a human-verification page.
+    cached_path : str or None
+        Path of the last good cached copy of that URL, if any.
+    """
+
+    def __init__(self, url, cached_path=None) -> None:
+        self.url = url
+        self.cached_path = cached_path
+        super().__init__(
+            f"A CAPTCHA is required to access {url}. Please download the ASCII "
+            "file manually, save it locally, and then re-run get_ascii() on "
+            "your local copy."
+        )
+
+
+def set_headless(headless=True):
+    """
+    Choose how `get_ascii` reacts to CAPTCHA pages.
+
+    Parameters
+    ----------
+    headless : bool, optional
+        If True, raise `CaptchaRequired`. If False, open the URL in a browser
+        and exit (the interactive default, unless the ``MAGUNIVERSE_HEADLESS``
+        environment variable is set).
+    """
+    global _headless
+    _headless = bool(headless)
+
+
+def is_headless():
+    """True if CAPTCHA pages raise `CaptchaRequired` in the current context."""
+    scoped = _headless_scope.get()
+    return _headless if scoped is None else scoped
+
+
+@contextlib.contextmanager
+def headless_mode(headless=True):
+    """
+    Choose how `get_ascii` reacts to CAPTCHA pages inside a ``with`` block.
+
+    Unlike `set_headless`, the setting only applies to calls made in the
+    block, in the current thread (or asyncio task), so other callers in the
+    process keep their behaviour.
+
+    Parameters
+    ----------
+    headless : bool, optional
+        If True, raise `CaptchaRequired`; if False, open the URL in a
+        browser and exit.
+
+    Examples
+    --------
+    >>> with headless_mode():
+    ...     text = get_ascii(file_url=url)
+    """
+    token = _headless_scope.set(bool(headless))
+    try:
+        yield
+    finally:
+        _headless_scope.reset(token)
+
+
+@contextlib.contextmanager
+def cache_as(cache_key):
+    """
+    Key the raw cache on `cache_key` for the `get_ascii` calls of a ``with`` block.
+
+    Used when a table is fetched through a proxy prefix, so the cached copy
+    is found again whichever proxy serves the next request. Like
+    `headless_mode`, the setting only applies to the current thread (or
+    asyncio task).
+
+    Parameters
+    ----------
+    cache_key : str or None
+        Key of the cached copy, normally the original table URL. None keys
+        the cache on the fetched URL.
+
+    Examples
+    --------
+    >>> with cache_as(url):
+    ...     text = get_ascii(file_url=proxy + url)
+    """
+    token = _cache_key_scope.set(cache_key)
+    try:
+        yield
+    finally:
+        _cache_key_scope.reset(token)
 
 
 def get_default_data_paths(file_path, file_url):
@@ -41,7 +178,8 @@ def get_default_data_paths(file_path, file_url):
     return complete_path, file_url
 
 
-def get_ascii(file_path=None, file_url=None, save_path=None, fmt='txt'):
+def get_ascii(file_path=None, file_url=None, save_path=None, fmt='txt', use_cache=True,
+              stream=False, cache_key=None):
     """
     Fetch an ASCII table from a local file or remote URL, with CAPTCHA support.
 
@@ -55,45 +193,94 @@ def get_ascii(file_path=None, file_url=None, save_path=None, fmt='txt'):
         If provided (and fmt == 'txt'), the fetched text is written here.
     fmt : {'txt'}, optional
         Output format. Only 'txt' (raw text) is supported.
+    use_cache : bool, optional
+        If True (default), remote tables are served from the raw cache when
+        the server answers a conditional GET with 304 Not Modified.
+    stream : bool, optional
+        If True, the download is written to disk in chunks as it arrives
+        (atomically renamed when complete) and the path of the local copy is
+        returned instead of its text, so parsers can read the file directly.
+        With neither the cache nor `save_path`, the copy is a per-URL file
+        in a process-private temporary directory, overwritten by the next
+        download of the same URL and removed when the interpreter exits.
+    cache_key : str or None, optional
+        Key of the table in the raw cache, e.g. the original URL when
+        `file_url` carries a proxy prefix. Defaults to the key set by
+        `cache_as`, else `file_url`.
 
     Returns
     -------
     str
-        The raw ASCII text.
+        The raw ASCII text, or the path of the local copy if `stream` is True.
 
     Raises
     ------
     ValueError
         If neither `file_path` nor `file_url` is provided.
+    CaptchaRequired
+        When a CAPTCHA is detected in headless mode.
     SystemExit
-        After prompting and opening a browser when CAPTCHA is detected.
+        After prompting and opening a browser when CAPTCHA is detected
+        in interactive mode.
     """
     if file_path is None and file_url is None:
         raise ValueError("Either file_path or file_url must be provided.")
     if file_path is not None:
+        if stream:
+            _save_file(file_path, save_path, fmt)
+            return file_path
         with open(file_path, 'r', encoding='utf-8') as f:
             return f.read()
 
-    # Remote fetch
-    session = requests.Session()
-    headers = {'User-Agent': 'python-requests/2.x'}
+    if not isinstance(file_url, str) or not file_url:
+        raise ValueError("file_url must be a non-empty string when fetching remotely.")
+
+    # Cached copy and its validators
+    cache = get_default_cache() if (use_cache and cache_enabled()) else None
+    key = cache_key or _cache_key_scope.get() or file_url
+    entry = cache.lookup(key) if cache is not None else None
+    if entry is not None and cache.is_fresh(entry):
+        cache.record('hits')
+        return _serve_cached(cache, entry, save_path, fmt, stream)
+
+    # Remote fetch through the shared pooled transport
+    headers = cache.conditional_headers(entry) if cache is not None else {}
 
     def fetch():
-        if not isinstance(file_url, str) or not file_url:
-            raise ValueError("file_url must be a non-empty string when fetching remotely.")
-        resp = session.get(file_url, headers=headers,
-                           allow_redirects=True, timeout=10)
+        resp = http_get(file_url, headers=headers, stream=stream)
         resp.raise_for_status()
         return resp
 
-    if not isinstance(file_url, str) or not file_url:
-        raise ValueError("file_url must be a non-empty string when fetching remotely.")
     response = fetch()
-    text = response.text
+    if response.status_code == 304 and entry is not None:
+        cache.record('hits')
+        cache.record('revalidated')
+        cache.touch(key)
+        return _serve_cached(cache, entry, save_path, fmt, stream)
+    if stream:
+        return _stream_to_disk(response, file_url, key, cache, save_path, fmt)
+    text = response.content.decode(_response_encoding(response), errors='replace')
 
-    # CAPTCHA detection
+    _check_captcha(text, file_url, key, cache)
+
+    if cache is not None:
+        cache.record('misses')
+        cache.store(key, text,
+                    etag=response.headers.get('ETag'),
+                    last_modified=response.headers.get('Last-Modified'))
+
+    _save_text(text, save_path, fmt)
+    return text
+
+
+def _check_captcha(text, file_url, key, cache):
+    """Raise or abort with instructions if `text` is a CAPTCHA page instead of data."""
     if '<div class="h-captcha"' in text \
        or 'We apologize for the inconvenience' in text:
+        if is_headless():
+            entry = cache.lookup(key) if cache is not None else None
+            cached_path = cache.object_path(entry['sha256']) if entry is not None else None
+            raise CaptchaRequired(file_url, cached_path)
         print("\nA CAPTCHA is required to access the content.")
         print("Opening the URL in your default browser; please complete"
               " the CAPTCHA there.")
@@ -104,9 +291,118 @@ def get_ascii(file_path=None, file_url=None, save_path=None, fmt='txt'):
             "then re-run get_ascii() on your local copy."
         )
 
-    # Save if requested
+
+def _serve_cached(cache, entry, save_path, fmt, stream):
+    """Return the cached text (or its path if `stream`), saving a copy if requested."""
+    if stream:
+        path = cache.object_path(entry['sha256'])
+        _save_file(path, save_path, fmt)
+        return path
+    text = cache.read(entry)
+    _save_text(text, save_path, fmt)
+    return text
+
+
+def _response_encoding(response):
+    """Charset declared in the Content-Type of `response`, UTF-8 if none or unknown."""
+    # requests falls back to ISO-8859-1 for text/* without a charset
+    if 'charset' not in response.headers.get('Content-Type', '').lower():
+        return 'utf-8'
+    try:
+        return codecs.lookup(response.encoding or 'utf-8').name
+    except LookupError:
+        return 'utf-8'
+
+
+def _get_stream_dir():
+    """Return the process-private directory of uncached streamed downloads."""
+    global _stream_dir
+    with _stream_dir_lock:
+        if _stream_dir is None:
+            _stream_dir = tempfile.mkdtemp(prefix='maguniverse-')
+            atexit.register(shutil.rmtree, _stream_dir, True)
+        return _stream_dir
+
+
+def _stream_to_disk(response, file_url, key, cache, save_path, fmt):
+    """
+    Write a streamed response to disk chunk by chunk.
+
+    The chunks are decoded with the response charset and re-encoded as
+    UTF-8, so the local copy (and its digest) matches what the non-streamed
+    path stores. They go to a temporary file next to their final location,
+    which is renamed into place only once the download is complete: the raw
+    cache if enabled, else `save_path`, else a per-URL file in the
+    process-private directory of `_get_stream_dir`.
+
+    Returns
+    -------
+    str
+        Path of the completed local copy.
+    """
+    if cache is not None:
+        target_dir = cache.objects_dir
+    elif save_path and fmt == 'txt':
+        target_dir = os.path.dirname(os.path.abspath(save_path))
+    else:
+        target_dir = _get_stream_dir()
+    os.makedirs(target_dir, exist_ok=True)
+
+    decoder = codecs.getincrementaldecoder(_response_encoding(response))(errors='replace')
+    fd, tmp_path = tempfile.mkstemp(suffix='.tmp', dir=target_dir)
+    digest = hashlib.sha256()
+    head = b''
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            for raw in response.iter_content(chunk_size=_STREAM_CHUNK_SIZE):
+                chunk = decoder.decode(raw).encode('utf-8')
+                if len(head) < _CAPTCHA_PROBE_SIZE:
+                    head += chunk[:_CAPTCHA_PROBE_SIZE - len(head)]
+                digest.update(chunk)
+                f.write(chunk)
+            chunk = decoder.decode(b'', final=True).encode('utf-8')
+            digest.update(chunk)
+            f.write(chunk)
+        # CAPTCHA pages are small; inspecting the head is sufficient
+        _check_captcha(head.decode('utf-8', errors='replace'), file_url, key, cache)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+    if cache is not None:
+        cache.record('misses')
+        entry = cache.store_file(key, tmp_path, digest.hexdigest(),
+                                 etag=response.headers.get('ETag'),
+                                 last_modified=response.headers.get('Last-Modified'))
+        path = cache.object_path(entry['sha256'])
+    elif save_path and fmt == 'txt':
+        os.replace(tmp_path, save_path)
+        return save_path
+    else:
+        name = hashlib.sha256(key.encode('utf-8')).hexdigest()[:16]
+        path = os.path.join(target_dir, f"{name}.txt")
+        os.replace(tmp_path, path)
+
+    _save_file(path, save_path, fmt)
+    return path
+
+
+def _save_text(text, save_path, fmt):
+    """Write fetched text to `save_path` if requested."""
     if save_path and fmt == 'txt':
         with open(save_path, 'w', encoding='utf-8') as f:
             f.write(text)
 
-    return text
+
+def _save_file(path, save_path, fmt):
+    """Atomically copy the file at `path` to `save_path` if requested."""
+    if save_path and fmt == 'txt' and os.path.abspath(path) != os.path.abspath(save_path):
+        fd, tmp_path = tempfile.mkstemp(suffix='.tmp',
+                                        dir=os.path.dirname(os.path.abspath(save_path)))
+        os.close(fd)
+        try:
+            shutil.copyfile(path, tmp_path)
+            os.replace(tmp_path, save_path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
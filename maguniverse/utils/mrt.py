@@ -0,0 +1,350 @@
+# -*- coding: utf-8 -*-
+"""
+mrt.py
+-----------
+
+Reader for AAS machine-readable tables (MRT) and CDS ReadMe-style headers.
+
+An MRT file starts with a "Byte-by-byte Description" of its columns::
+
+    --------------------------------------------------------------------------------
+       Bytes Format Units   Label   Explanations
+    --------------------------------------------------------------------------------
+       1- 12 A12    ---     ID      Object/Region identification
+          14 A1     ---   f_ID      [bc] Flag on ID
+      16- 21 F6.1   arcsec  RAOff   ? Offset in Right Ascension
+    --------------------------------------------------------------------------------
+
+`read_mrt_schema` derives column names, byte ranges, dtypes, units and null
+flags from that description together with the line on which the data start,
+and compiles them into a `FixedWidthSchema`. Compiled schemas are cached per
+SHA-256 of the header, so the description is parsed once per distinct table
+layout and process.
+"""
+
+import hashlib
+import re
+import threading
+
+from maguniverse.utils.converters import attach_units
+from maguniverse.utils.fixed_width import FixedWidthSchema
+
+# One column of the byte-by-byte description, e.g. " 32- 37 F6.3 pc r ? Radius"
+_COLUMN_LINE = re.compile(
+    r'^\s*(?:(?P<start>\d+)\s*-\s*)?(?P<end>\d+)\s+'
+    r'(?P<format>[AIFED])(?P<width>\d+(?:\.\d+)?)\s+'
+    r'(?P<units>\S+)\s+(?P<label>\S+)\s*(?P<explanation>.*)$'
+)
+# Null flag of an explanation: "?" alone or "?=<null value>"
+_NULL_FLAG = re.compile(r'^\?(?:=(?P<value>\S+))?')
+_SEPARATOR = re.compile(r'^\s*(?:-{10,}|={10,})\s*$')
+_DESCRIPTION = 'Byte-by-byte Description'
+# Lines searched for the byte-by-byte description before a file is rejected
+_MAX_HEADER_LINES = 500
+
+_FORMAT_DTYPES = {'A': 'str', 'I': 'int', 'F': 'float', 'E': 'float', 'D': 'float'}
+
+_schema_cache = {}
+_schema_cache_lock = threading.Lock()
+
+
+class MRTSchema():
+    """
+    Column layout of a machine-readable table, derived from its header.
+
+    Attributes
+    ----------
+    labels : list of str
+        Column labels as given in the header.
+    colspecs : list of tuple
+        Zero-based, half-open ``(start, end)`` byte ranges.
+    formats : list of str
+        Fortran-style formats (e.g. 'F6.3', 'A12').
+    units : dict
+        Units of each label ('---' for dimensionless).
+    nullable : dict
+        True for labels flagged with '?' (may be blank).
+    null_values : dict
+        Explicit null values of labels flagged with '?=<value>'.
+    explanations : dict
+        Free-text explanation of each label.
+    data_start : int
+        Number of header lines before the first data line.
+    schema : FixedWidthSchema
+        Compiled decoder for the data lines.
+    """
+
+    def __init__(self, columns, data_start) -> None:
+        self.labels = [column['label'] for column in columns]
+        self.colspecs = [(column['start'], column['end']) for column in columns]
+        self.formats = [column['format'] for column in columns]
+        self.units = {column['label']: column['units'] for column in columns}
+        self.nullable = {column['label']: column['nullable'] for column in columns}
+        self.null_values = {column['label']: column['null_value'] for column in columns
+                            if column['null_value'] is not None}
+        self.explanations = {column['label']: column['explanation'] for column in columns}
+        self.data_start = data_start
+        self.schema = FixedWidthSchema(
+            self.labels, self.colspecs,
+            [_FORMAT_DTYPES[fmt[0]] for fmt in self.formats],
+            column_na={label: (value,) for label, value in self.null_values.items()},
+        )
+        return
+
+    def decode_file(self, path, rename=None):
+        """
+        Decode the data lines of an MRT file with this layout.
+
+        Parameters
+        ----------
+        path : str
+            Path of the MRT file.
+        rename : dict, optional
+            Mapping from header labels to output column names.
+
+        Returns
+        -------
+        pandas.DataFrame
+            One typed column per label. The canonical units (after renaming)
+            are stored in ``df.attrs['units']``.
+        """
+        df = self.schema.decode_file(path, skiprows=self.data_start)
+        units = dict(self.units)
+        if rename:
+            df = df.rename(columns=rename)
+            units = {rename.get(label, label): unit for label, unit in units.items()}
+        return attach_units(df, units)
+
+    def iter_decode_file(self, path, rename=None, chunksize=10000):
+        """
+        Decode the data lines of an MRT file in chunks of at most `chunksize` rows.
+
+        Parameters
+        ----------
+        path : str
+            Path of the MRT file.
+        rename : dict, optional
+            Mapping from header labels to output column names.
+        chunksize : int, optional
+            Maximum number of rows per chunk.
+
+        Yields
+        ------
+        pandas.DataFrame
+            Typed chunks with the canonical units in ``df.attrs['units']``.
+        """
+        units = dict(self.units)
+        if rename:
+            units = {rename.get(label, label): unit for label, unit in units.items()}
+        for df in self.schema.iter_decode_file(path, skiprows=self.data_start,
+                                               chunksize=chunksize):
+            if rename:
+                df = df.rename(columns=rename)
+            yield attach_units(df, units)
+
+
+class _HeaderScanner():
+    """
+    Locate the byte-by-byte description and the first data line, one line at a time.
+
+    The column table is a header row framed by separators and closed by a
+    third one, optionally followed by notes, each block closed by another
+    separator. Each line is inspected once, so the header is found in a
+    single pass however long the file is.
+    """
+
+    def __init__(self) -> None:
+        self.n_lines = 0
+        self.description = None
+        self.separators = 0
+        # line after the last separator seen past the column table
+        self.data_start = None
+        self.in_note = False
+        return
+
+    def feed(self, line):
+        """Consume the next line; True once it is the first data line."""
+        index = self.n_lines
+        self.n_lines += 1
+        if self.description is None:
+            if line.startswith(_DESCRIPTION):
+                self.description = index
+            return False
+        if self.data_start is None:
+            if _SEPARATOR.match(line):
+                self.separators += 1
+                if self.separators == 3:
+                    self.data_start = index + 1
+            return False
+        if self.in_note:
+            if _SEPARATOR.match(line):
+                self.in_note = False
+                self.data_start = index + 1
+            return False
+        if line.lstrip().startswith('Note'):
+            self.in_note = True
+            return False
+        return True
+
+    def located(self):
+        """(description_index, data_start) of the lines fed so far, or None."""
+        if self.data_start is None or self.in_note:
+            return None
+        return self.description, self.data_start
+
+
+def _find_data_start(lines):
+    """
+    Locate the byte-by-byte description and the first data line.
+
+    Returns
+    -------
+    tuple
+        (description_index, data_start), or None if `lines` hold no
+        byte-by-byte description.
+    """
+    scanner = _HeaderScanner()
+    for line in lines:
+        if scanner.feed(line):
+            break
+    return scanner.located()
+
+
+def parse_mrt_header(lines):
+    """
+    Parse the header lines of an MRT file.
+
+    Parameters
+    ----------
+    lines : list of str
+        Lines of the file, at least up to the first data line.
+
+    Returns
+    -------
+    MRTSchema
+        The derived column layout.
+
+    Raises
+    ------
+    ValueError
+        If no byte-by-byte description is found.
+    """
+    located = _find_data_start(lines)
+    if located is None:
+        raise ValueError("No MRT byte-by-byte description found in the header")
+    description, data_start = located
+    separators = [i for i in range(description, data_start) if _SEPARATOR.match(lines[i])]
+
+    columns = []
+    for line in lines[separators[1] + 1:separators[2]]:
+        match = _COLUMN_LINE.match(line)
+        if match is None:
+            # continuation of the previous explanation
+            if columns and line.strip():
+                columns[-1]['explanation'] += ' ' + line.strip()
+            continue
+        end = int(match['end'])
+        start = int(match['start']) if match['start'] else end
+        explanation = match['explanation'].strip()
+        null_flag = _NULL_FLAG.match(explanation)
+        columns.append({
+            'label': match['label'],
+            'start': start - 1,
+            'end': end,
+            'format': match['format'] + match['width'],
+            'units': match['units'],
+            'nullable': null_flag is not None,
+            'null_value': null_flag['value'] if null_flag is not None else None,
+            'explanation': explanation,
+        })
+    if not columns:
+        raise ValueError("The MRT byte-by-byte description lists no columns")
+    return MRTSchema(columns, data_start)
+
+
+def read_mrt_schema(path):
+    """
+    Return the compiled `MRTSchema` of an MRT file, reusing cached schemas.
+
+    Only the header is read. It is hashed, and a schema compiled earlier for
+    an identical header is returned without parsing it again. Files whose
+    first 500 lines hold no byte-by-byte description are rejected without
+    reading further.
+
+    Parameters
+    ----------
+    path : str
+        Path of the MRT file.
+
+    Returns
+    -------
+    MRTSchema
+
+    Raises
+    ------
+    ValueError
+        If the file holds no byte-by-byte description, or none within its
+        first 500 lines.
+    """
+    scanner = _HeaderScanner()
+    lines = []
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        for line in f:
+            lines.append(line.rstrip('\r\n'))
+            if scanner.feed(lines[-1]):
+                break
+            if scanner.description is None and len(lines) >= _MAX_HEADER_LINES:
+                break
+    located = scanner.located()
+    if located is None:
+        raise ValueError(f"No MRT byte-by-byte description found in {path}")
+    header = '\n'.join(lines[:located[1]])
+    digest = hashlib.sha256(header.encode('utf-8')).hexdigest()
+    with _schema_cache_lock:
+        schema = _schema_cache.get(digest)
+    if schema is None:
+        schema = parse_mrt_header(lines[:located[1]])
+        with _schema_cache_lock:
+            _schema_cache[digest] = schema
+    return schema
+
+
+def read_mrt(path, rename=None):
+    """
+    Read an MRT file into a DataFrame using the layout given in its header.
+
+    Parameters
+    ----------
+    path : str
+        Path of the MRT file.
+    rename : dict, optional
+        Mapping from header labels to output column names.
+
+    Returns
+    -------
+    pandas.DataFrame
+        One typed column per label, with the units in ``df.attrs['units']``.
+    """
+    return read_mrt_schema(path).decode_file(path, rename=rename)
+
+
+def iter_mrt(path, rename=None, chunksize=10000):
+    """
+    Read an MRT file in chunks, using the layout given in its header.
+
+    Parameters
+    ----------
+    path : str
+        Path of the MRT file.
+    rename : dict, optional
+        Mapping from header labels to output column names.
+    chunksize : int, optional
+        Maximum number of rows per chunk.
+
+    Yields
+    ------
+    pandas.DataFrame
+        Typed chunks, with the units in ``df.attrs['units']``.
+    """
+    yield from read_mrt_schema(path).iter_decode_file(path, rename=rename,
+                                                      chunksize=chunksize)
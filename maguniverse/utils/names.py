@@ -0,0 +1,336 @@
+# -*- coding: utf-8 -*-
+"""
+names.py
+-----------
+
+Canonical keys of source names for joins across surveys.
+
+The tables spell the same source in different ways ('L1527', 'L 1527',
+'Lynds 1527', 'IRAS_16293-2422', 'B059'). `normalize_names` maps a column of
+names to matching keys once per distinct name:
+
+- Unicode compatibility normalization and case folding,
+- removal of blanks, '_' and dashes,
+- 'Lynds' / 'Barnard' abbreviated to 'l' / 'b', and
+- leading zeros of the number following a catalog prefix dropped,
+
+so the variants above become 'l1527', 'iras162932422' and 'b59'. The
+parsers store these keys in a ``name_key`` column at parse time.
+
+Names that no rule can relate (e.g. 'OMC-1' and 'Orion KL') are linked by
+an `AliasTable`, which maps alias keys to canonical keys. The default table
+is kept as JSON in the ``tables`` directory of the cache and can be
+extended at any time; aliases are applied at join time, so cached tables
+stay valid. `join_names` links two tables through their hashed keys in
+O(N + M) plus the number of linked pairs.
+"""
+
+import json
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from maguniverse.utils.table_cache import get_default_table_cache
+
+# Separators ignored in names: blanks, '_', hyphen, en dash and minus sign
+_NAME_NOISE = r'[\s_\-–−]+'
+# Spelled-out catalog prefixes and their abbreviations
+_PREFIXES = {r'^lynds(?=\d)': 'l', r'^barnard(?=\d)': 'b'}
+# Leading zeros of a number that follows letters, e.g. 'b059'
+_LEADING_ZEROS = r'(?<=[a-z])0+(?=\d)'
+_ALIAS_FILE = 'aliases.json'
+_TEXT_DTYPE = pd.Series(['']).dtype
+
+_default_aliases = None
+_default_aliases_lock = threading.Lock()
+
+
+def normalize_names(names):
+    """
+    Matching keys of source names.
+
+    Each distinct name is normalized once. Missing and blank names give
+    None, which never matches.
+
+    Parameters
+    ----------
+    names : array-like of str
+        Source names.
+
+    Returns
+    -------
+    numpy.ndarray
+        Object array of keys, one per name.
+    """
+    codes, uniques = pd.factorize(pd.Series(names, dtype=object))
+    keys = pd.Series(uniques, dtype=object).astype('str').str.normalize('NFKC') \
+        .str.casefold().str.replace(_NAME_NOISE, '', regex=True)
+    for prefix, abbreviation in _PREFIXES.items():
+        keys = keys.str.replace(prefix, abbreviation, regex=True)
+    keys = keys.str.replace(_LEADING_ZEROS, '', regex=True).to_numpy(dtype=object)
+    keys[keys == ''] = None
+    # missing names (code -1) pick the trailing None
+    return np.append(keys, None)[codes]
+
+
+def add_name_key(df, column):
+    """
+    Append the ``name_key`` column of a name column to a parsed table.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Parsed table; modified in place.
+    column : str
+        Column holding the source names.
+
+    Returns
+    -------
+    pandas.DataFrame
+        `df`, for chaining.
+    """
+    df['name_key'] = pd.Series(normalize_names(df[column]), index=df.index,
+                               dtype=object).astype(_TEXT_DTYPE)
+    return df
+
+
+class AliasTable():
+    """
+    Persistent mapping from alias keys to canonical keys.
+
+    Names are normalized with `normalize_names` before they are stored, and
+    chains are collapsed on insertion (adding b -> c after a -> b stores
+    a -> c), so resolving a key is a single lookup.
+
+    Parameters
+    ----------
+    path : str, optional
+        JSON file the table is loaded from and saved to. In memory only if
+        None.
+    """
+
+    def __init__(self, path=None) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._aliases = self._load()
+        return
+
+    def _load(self):
+        if self.path is None:
+            return {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return dict(json.load(f))
+        except (OSError, ValueError, TypeError):
+            return {}
+
+    def save(self):
+        """Write the table to its JSON file."""
+        if self.path is None:
+            return
+        with self._lock:
+            aliases = dict(self._aliases)
+        tmp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(aliases, f, indent=1, sort_keys=True, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def __len__(self):
+        return len(self._aliases)
+
+    def add(self, aliases, save=True):
+        """
+        Add aliases.
+
+        Parameters
+        ----------
+        aliases : dict
+            Alias name to canonical name, e.g. ``{'Orion KL': 'OMC-1'}``.
+        save : bool, optional
+            If True, the table is written to its file afterwards.
+        """
+        names = list(aliases.keys()) + list(aliases.values())
+        keys = normalize_names(names)
+        with self._lock:
+            for alias, canonical in zip(keys[:len(aliases)], keys[len(aliases):]):
+                if alias is None or canonical is None:
+                    continue
+                canonical = self._aliases.get(canonical, canonical)
+                if canonical == alias:
+                    # the alias is the root of the canonical name already
+                    continue
+                self._aliases[alias] = canonical
+                for key, target in self._aliases.items():
+                    if target == alias:
+                        self._aliases[key] = canonical
+        if save:
+            self.save()
+
+    def resolve(self, keys):
+        """
+        Canonical keys of normalized keys.
+
+        Parameters
+        ----------
+        keys : array-like
+            Keys from `normalize_names` (e.g. a ``name_key`` column).
+
+        Returns
+        -------
+        numpy.ndarray
+            Object array of canonical keys; keys without alias are returned
+            unchanged.
+        """
+        codes, uniques = pd.factorize(pd.Series(keys, dtype=object))
+        with self._lock:
+            resolved = [self._aliases.get(key, key) for key in uniques]
+        return np.append(np.array(resolved, dtype=object), None)[codes]
+
+
+def get_alias_table():
+    """
+    The default `AliasTable`, stored as ``aliases.json`` in the cache.
+
+    Returns
+    -------
+    AliasTable
+    """
+    global _default_aliases
+    with _default_aliases_lock:
+        if _default_aliases is None:
+            path = os.path.join(get_default_table_cache().cache_dir, _ALIAS_FILE)
+            _default_aliases = AliasTable(path)
+        return _default_aliases
+
+
+def add_aliases(aliases):
+    """
+    Add aliases to the default `AliasTable` and save it.
+
+    Parameters
+    ----------
+    aliases : dict
+        Alias name to canonical name, e.g. ``{'Orion KL': 'OMC-1'}``.
+    """
+    get_alias_table().add(aliases)
+
+
+def name_key(names, aliases=None):
+    """
+    Canonical keys of source names: normalized, then resolved by aliases.
+
+    Parameters
+    ----------
+    names : array-like of str
+        Source names.
+    aliases : AliasTable, optional
+        Alias table; the default table if None.
+
+    Returns
+    -------
+    numpy.ndarray
+        Object array of keys, one per name.
+    """
+    aliases = aliases if aliases is not None else get_alias_table()
+    return aliases.resolve(normalize_names(names))
+
+
+def table_keys(df, column='name_key', aliases=None):
+    """
+    Canonical keys of the names of a table.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Parsed table.
+    column : str, optional
+        'name_key' uses the keys computed at parse time; any other column
+        is normalized first.
+    aliases : AliasTable, optional
+        Alias table; the default table if None.
+
+    Returns
+    -------
+    numpy.ndarray
+        Object array of keys, one per row.
+    """
+    aliases = aliases if aliases is not None else get_alias_table()
+    keys = df[column] if column == 'name_key' else normalize_names(df[column])
+    return aliases.resolve(keys)
+
+
+def join_names(left, right, left_on='name_key', right_on='name_key', how='inner',
+               aliases=None):
+    """
+    Link the rows of two tables that name the same source.
+
+    Both key columns are resolved through the alias table (once per distinct
+    key) and hashed together into integer codes; the rows of `right` are
+    grouped by code and every row of `left` is expanded over its group, so
+    the cost grows with N + M and the number of pairs, without comparing
+    names. Rows without a name never match.
+
+    Parameters
+    ----------
+    left, right : pandas.DataFrame
+        Tables to link, e.g. ``get_crutcher2010()`` and ``get_liu2022()``.
+    left_on, right_on : str, optional
+        Columns to match on. 'name_key' uses the keys computed at parse
+        time; any other column is normalized first.
+    how : {'inner', 'left'}, optional
+        'left' also keeps the rows of `left` without a match (with NaN in
+        'right').
+    aliases : AliasTable, optional
+        Alias table; the default table if None.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Columns 'left' and 'right' (index labels of the linked rows) and
+        'name_key' (the canonical key they share), one row per pair.
+
+    Examples
+    --------
+    >>> pairs = join_names(get_crutcher2010(), get_jijina1999())
+    """
+    if how not in ('inner', 'left'):
+        raise ValueError("how must be either 'inner' or 'left'")
+    aliases = aliases if aliases is not None else get_alias_table()
+    left_keys = table_keys(left, left_on, aliases)
+    right_keys = table_keys(right, right_on, aliases)
+    # one hash pass maps the keys of both tables to shared integer codes
+    # (-1 for missing names)
+    codes, uniques = pd.factorize(np.concatenate([left_keys, right_keys]))
+    left_codes, right_codes = codes[:len(left_keys)], codes[len(left_keys):]
+
+    # rows of `right` grouped by code: code c owns order[start[c]:start[c] + counts[c]];
+    # the trailing zero count serves code -1
+    valid = np.flatnonzero(right_codes >= 0)
+    order = valid[np.argsort(right_codes[valid], kind='stable')]
+    counts = np.append(np.bincount(right_codes[valid], minlength=len(uniques)), 0)
+    start = np.cumsum(counts) - counts
+
+    # every row of `left` is expanded over the rows of `right` sharing its code
+    n = counts[left_codes]
+    repeats = np.maximum(n, 1) if how == 'left' else n
+    left_rows = np.repeat(np.arange(len(left_codes)), repeats)
+    # position k of the group of a row: start[c] + k
+    first = np.cumsum(repeats) - repeats
+    positions = np.repeat(start[left_codes] - first, repeats) + np.arange(len(left_rows))
+    right_labels = right.index.take(order.take(positions, mode='clip')) if len(order) \
+        else np.full(len(left_rows), np.nan)
+    if how == 'left':
+        # unmatched rows of a left join take NaN labels
+        right_labels = pd.Series(right_labels).where(np.repeat(n > 0, repeats)).to_numpy()
+    return pd.DataFrame({
+        'left': left.index.take(left_rows),
+        'right': right_labels,
+        'name_key': pd.Categorical.from_codes(left_codes[left_rows], categories=uniques),
+    })
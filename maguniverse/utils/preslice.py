@@ -0,0 +1,208 @@
+# -*- coding: utf-8 -*-
+"""
+preslice.py
+-----------
+
+Byte-level pre-slicing of ASCII tables for pandas' C tokenizer.
+
+`pandas.read_csv` only supports ``skipfooter`` and multi-character regex
+separators (e.g. ``r'\\t+'``) in its pure-Python engine. `preslice` trims the
+header and footer lines by byte offset and collapses runs of tabs into a
+single separator beforehand, so the table body can be handed to the much
+faster C engine unchanged otherwise.
+
+`stream_preslice` does the same line by line, holding only the footer lines
+in memory, for ``pd.read_csv(..., chunksize=...)`` over large files.
+"""
+
+import collections
+import io
+import itertools
+import re
+
+_TAB_RUNS = re.compile(rb'\t{2,}')
+_STREAM_BUFFER_SIZE = 1 << 16
+
+
+def _header_end(buf, n_lines):
+    """Byte offset just past the first `n_lines` lines of `buf`."""
+    offset = 0
+    for _ in range(n_lines):
+        newline = buf.find(b'\n', offset)
+        if newline < 0:
+            return len(buf)
+        offset = newline + 1
+    return offset
+
+
+def _footer_start(buf, start, n_lines):
+    """Byte offset at which the last `n_lines` lines of `buf[start:]` begin."""
+    end = len(buf)
+    # a final newline terminates the last line rather than opening a new one
+    if end > start and buf[end - 1:end] == b'\n':
+        end -= 1
+    for _ in range(n_lines):
+        newline = buf.rfind(b'\n', start, end)
+        if newline < 0:
+            return start
+        end = newline
+    return end
+
+
+def preslice(src, skip_header=0, skip_footer=0, collapse_tabs=False, transform=None):
+    """
+    Return the body of an ASCII table as an in-memory binary stream.
+
+    Parameters
+    ----------
+    src : str
+        Path of the ASCII file.
+    skip_header : int, optional
+        Number of leading lines to drop (as ``skiprows``).
+    skip_footer : int, optional
+        Number of trailing lines to drop (as ``skipfooter``).
+    collapse_tabs : bool, optional
+        If True, runs of tabs become a single tab, so that ``sep='\\t'``
+        matches what ``sep=r'\\t+'`` does in the Python engine.
+    transform : callable, optional
+        Function applied to the body bytes before tokenization, e.g.
+        `maguniverse.utils.converters.normalize_sci_notation`.
+
+    Returns
+    -------
+    io.BytesIO
+        The remaining lines, ready for ``pd.read_csv(..., engine='c')``.
+    """
+    with open(src, 'rb') as f:
+        buf = f.read()
+    start = _header_end(buf, skip_header)
+    end = _footer_start(buf, start, skip_footer) if skip_footer else len(buf)
+    body = buf[start:end]
+    if collapse_tabs:
+        body = _TAB_RUNS.sub(b'\t', body)
+    if transform is not None:
+        body = transform(body)
+    return io.BytesIO(body)
+
+
+class _LineStream(io.RawIOBase):
+    """Read-only binary stream over an iterator of byte lines."""
+
+    def __init__(self, lines) -> None:
+        super().__init__()
+        self._lines = lines
+        self._pending = b''
+        return
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        if len(self._pending) < len(buffer):
+            # batch lines up to the requested size
+            parts = [self._pending]
+            size = len(self._pending)
+            for line in self._lines:
+                parts.append(line)
+                size += len(line)
+                if size >= len(buffer):
+                    break
+            self._pending = b''.join(parts)
+        n = min(len(buffer), len(self._pending))
+        buffer[:n] = self._pending[:n]
+        self._pending = self._pending[n:]
+        return n
+
+
+def _body_lines(src, skip_header, skip_footer, collapse_tabs, transform):
+    """Yield the lines of `src` between header and footer, transformed."""
+    with open(src, 'rb') as f:
+        lines = itertools.islice(f, skip_header, None)
+        held = collections.deque()
+        for line in lines:
+            held.append(line)
+            if len(held) <= skip_footer:
+                continue
+            line = held.popleft()
+            if collapse_tabs:
+                line = _TAB_RUNS.sub(b'\t', line)
+            if transform is not None:
+                line = transform(line)
+            yield line
+
+
+def stream_preslice(src, skip_header=0, skip_footer=0, collapse_tabs=False, transform=None):
+    """
+    Return the body of an ASCII table as a buffered stream read line by line.
+
+    Same as `preslice`, but the file is never read as a whole: only the last
+    `skip_footer` lines are held back. Meant for chunked reading with
+    ``pd.read_csv(..., engine='c', chunksize=...)``. `transform` is applied
+    to one line at a time, so it must not depend on neighbouring lines.
+
+    Parameters
+    ----------
+    src : str
+        Path of the ASCII file.
+    skip_header : int, optional
+        Number of leading lines to drop.
+    skip_footer : int, optional
+        Number of trailing lines to drop.
+    collapse_tabs : bool, optional
+        If True, runs of tabs become a single tab.
+    transform : callable, optional
+        Function applied to the bytes of each body line.
+
+    Returns
+    -------
+    io.BufferedReader
+    """
+    lines = _body_lines(src, skip_header, skip_footer, collapse_tabs, transform)
+    return io.BufferedReader(_LineStream(lines), buffer_size=_STREAM_BUFFER_SIZE)
+
+
+if __name__ == "__main__":
+    # Benchmark: Dotson et al. (2010) table 2 layout scaled to a million rows,
+    # Python-engine skipfooter parsing vs. pre-sliced C-engine parsing.
+    import os
+    import sys
+    import tempfile
+    import time
+
+    import numpy as np
+    import pandas as pd
+
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    names = ['ID', 'ΔR.A.', 'ΔDecl.', 'Δx', 'Δy', 'P', 'sigma(P)', 'theta',
+             'sigma(theta)', 'Intensity', 'sigma(Intensity)', 'Number of Observations']
+
+    rng = np.random.default_rng(0)
+    values = rng.normal(0, 50, (n_rows, 10))
+    ids = np.array(['W3_Main', 'OMC-1', 'NGC_1333', 'Mon_R2'])[rng.integers(0, 4, n_rows)]
+    n_obs = rng.integers(1, 9, n_rows)
+    body = pd.DataFrame(values).round(2)
+    body.insert(0, 'ID', ids)
+    body['n'] = n_obs
+
+    fd, path = tempfile.mkstemp(suffix='.txt')
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        f.write(''.join(f'header line {i}\n' for i in range(31)))
+        body.to_csv(f, sep=' ', header=False, index=False)
+        f.write('footer line 0\nfooter line 1\n')
+
+    try:
+        t0 = time.perf_counter()
+        df_python = pd.read_csv(path, sep=r'\s+', names=names, skiprows=31, skipfooter=2,
+                                engine='python')
+        t_python = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        df_c = pd.read_csv(preslice(path, 31, 2), sep=r'\s+', names=names, engine='c')
+        t_c = time.perf_counter() - t0
+    finally:
+        os.remove(path)
+
+    pd.testing.assert_frame_equal(df_python, df_c)
+    print(f"rows              : {n_rows}")
+    print(f"python + skipfooter: {t_python:.2f} s")
+    print(f"preslice + C engine: {t_c:.2f} s  ({t_python / t_c:.1f}x faster)")
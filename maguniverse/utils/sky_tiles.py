@@ -0,0 +1,236 @@
+# -*- coding: utf-8 -*-
+"""
+sky_tiles.py
+-----------
+
+Tiled sky partition of a table for region queries.
+
+The sky is cut into declination zones of `zone_deg` degrees; each zone is
+cut into RA cells about `zone_deg` wide at the zone centre, so tiles have
+nearly equal area. The rows of a table are sorted by tile and stored in
+compressed sparse row form (row order plus tile offsets), together with
+their positions. Since the tiles of one zone are numbered consecutively, a
+box or cone query reads one contiguous slice per zone (two where the RA
+range wraps), then filters those candidates exactly.
+
+Tilings are cached per content like the cross-match indexes: in memory and
+as ``.tiles.npz`` files in the ``tables`` directory of the cache.
+"""
+
+import os
+import threading
+
+import numpy as np
+
+from maguniverse.utils.coordinates import position_digest
+from maguniverse.utils.table_cache import get_default_table_cache
+
+# Bump to invalidate cached tilings after a change to their layout
+_TILES_VERSION = 1
+_DEFAULT_ZONE_DEG = 1.0
+
+_tiles_cache = {}
+_tiles_cache_lock = threading.Lock()
+
+
+def _angular_separation(ra1, dec1, ra2, dec2):
+    """Angular separation in degrees (haversine formula)."""
+    ra1, dec1, ra2, dec2 = (np.radians(x) for x in (ra1, dec1, ra2, dec2))
+    a = (np.sin((dec2 - dec1) / 2.0) ** 2
+         + np.cos(dec1) * np.cos(dec2) * np.sin((ra2 - ra1) / 2.0) ** 2)
+    return np.degrees(2.0 * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0))))
+
+
+class SkyTiles():
+    """
+    Rows of one table grouped by sky tile.
+
+    Rows with a missing position are not tiled and never match.
+
+    Parameters
+    ----------
+    ra_deg, dec_deg : array-like
+        Positions of the table rows, in degrees.
+    zone_deg : float, optional
+        Height of the declination zones (and approximate tile width).
+    """
+
+    def __init__(self, ra_deg, dec_deg, zone_deg=_DEFAULT_ZONE_DEG) -> None:
+        self._layout(zone_deg)
+        ra = np.asarray(ra_deg, dtype=np.float64) % 360.0
+        dec = np.asarray(dec_deg, dtype=np.float64)
+        rows = np.flatnonzero(np.isfinite(ra) & np.isfinite(dec))
+        tiles = self.tile_of(ra[rows], dec[rows])
+        order = np.argsort(tiles, kind='stable')
+        self.rows = rows[order]
+        self.ra = ra[self.rows]
+        self.dec = dec[self.rows]
+        self.offsets = np.searchsorted(tiles[order], np.arange(self.n_tiles + 1))
+        return
+
+    def _layout(self, zone_deg):
+        """Number of RA cells per zone and the first tile of each zone."""
+        self.zone_deg = float(zone_deg)
+        self.n_zones = int(np.ceil(180.0 / self.zone_deg))
+        centres = np.radians(-90.0 + (np.arange(self.n_zones) + 0.5) * self.zone_deg)
+        self.n_cells = np.maximum(1, np.floor(360.0 * np.cos(centres) / self.zone_deg)
+                                  ).astype(np.int64)
+        self.zone_start = np.concatenate([[0], np.cumsum(self.n_cells)])
+        self.n_tiles = int(self.zone_start[-1])
+
+    def _zone(self, dec):
+        return np.clip(np.floor((np.asarray(dec) + 90.0) / self.zone_deg).astype(np.int64),
+                       0, self.n_zones - 1)
+
+    def tile_of(self, ra_deg, dec_deg):
+        """Tile number of positions (RA in [0, 360))."""
+        zone = self._zone(dec_deg)
+        cell = np.minimum((np.asarray(ra_deg) / 360.0 * self.n_cells[zone]).astype(np.int64),
+                          self.n_cells[zone] - 1)
+        return self.zone_start[zone] + cell
+
+    @property
+    def occupied(self):
+        """Numbers of the tiles holding at least one row."""
+        return np.flatnonzero(np.diff(self.offsets))
+
+    def _candidates(self, ra_min, ra_max, dec_min, dec_max):
+        """Positions (in tile order) of the rows in the tiles covering a box."""
+        if ra_max - ra_min >= 360.0:
+            ranges = [(0.0, 360.0)]
+        else:
+            ra_min, ra_max = ra_min % 360.0, ra_max % 360.0
+            ranges = [(ra_min, ra_max)] if ra_min <= ra_max else [(ra_min, 360.0),
+                                                                  (0.0, ra_max)]
+        slices = []
+        for zone in range(int(self._zone(dec_min)), int(self._zone(dec_max)) + 1):
+            n = self.n_cells[zone]
+            for lo, hi in ranges:
+                first = self.zone_start[zone] + min(int(lo / 360.0 * n), n - 1)
+                last = self.zone_start[zone] + min(int(hi / 360.0 * n), n - 1)
+                start, stop = self.offsets[first], self.offsets[last + 1]
+                if stop > start:
+                    slices.append(np.arange(start, stop))
+        return np.concatenate(slices) if slices else np.empty(0, dtype=np.int64)
+
+    def query_box(self, ra_min, ra_max, dec_min, dec_max):
+        """
+        Rows inside an RA/Dec box.
+
+        Parameters
+        ----------
+        ra_min, ra_max : float
+            RA range in degrees; ``ra_min > ra_max`` wraps through RA = 0.
+        dec_min, dec_max : float
+            Declination range in degrees.
+
+        Returns
+        -------
+        numpy.ndarray
+            Row numbers, in ascending order.
+        """
+        dec_min, dec_max = max(dec_min, -90.0), min(dec_max, 90.0)
+        if dec_min > dec_max:
+            return np.empty(0, dtype=np.int64)
+        candidates = self._candidates(ra_min, ra_max, dec_min, dec_max)
+        ra, dec = self.ra[candidates], self.dec[candidates]
+        inside = (dec >= dec_min) & (dec <= dec_max)
+        if ra_max - ra_min < 360.0:
+            lo, hi = ra_min % 360.0, ra_max % 360.0
+            inside &= ((ra >= lo) & (ra <= hi)) if lo <= hi else ((ra >= lo) | (ra <= hi))
+        return np.sort(self.rows[candidates[inside]])
+
+    def query_cone(self, ra_deg, dec_deg, radius_deg):
+        """
+        Rows within `radius_deg` of a position.
+
+        Returns
+        -------
+        tuple of numpy.ndarray
+            (rows, separation_deg), sorted by separation.
+        """
+        dec_min, dec_max = dec_deg - radius_deg, dec_deg + radius_deg
+        cos_dec = np.cos(np.radians(dec_deg))
+        sin_radius = np.sin(np.radians(min(radius_deg, 90.0)))
+        if dec_min <= -90.0 or dec_max >= 90.0 or sin_radius >= cos_dec:
+            # the cone holds a pole: every RA
+            ra_min, ra_max = 0.0, 360.0
+        else:
+            half_width = np.degrees(np.arcsin(sin_radius / cos_dec))
+            ra_min, ra_max = ra_deg - half_width, ra_deg + half_width
+        candidates = self._candidates(ra_min, ra_max, max(dec_min, -90.0), min(dec_max, 90.0))
+        separation = _angular_separation(ra_deg, dec_deg, self.ra[candidates],
+                                         self.dec[candidates])
+        inside = separation <= radius_deg
+        order = np.argsort(separation[inside], kind='stable')
+        return self.rows[candidates[inside]][order], separation[inside][order]
+
+    def save(self, path):
+        """Write the tiling to an ``.npz`` file."""
+        np.savez(path, version=_TILES_VERSION, zone_deg=self.zone_deg, rows=self.rows,
+                 ra=self.ra, dec=self.dec, offsets=self.offsets)
+
+    @classmethod
+    def load(cls, path):
+        """Read a tiling written by `save`; None if it is unusable."""
+        try:
+            with np.load(path) as data:
+                if int(data['version']) != _TILES_VERSION:
+                    return None
+                tiles = cls.__new__(cls)
+                tiles._layout(float(data['zone_deg']))
+                tiles.rows, tiles.ra, tiles.dec = data['rows'], data['ra'], data['dec']
+                tiles.offsets = data['offsets']
+        except (OSError, KeyError, ValueError):
+            return None
+        if len(tiles.offsets) != tiles.n_tiles + 1:
+            return None
+        return tiles
+
+
+def sky_tiles(df, ra='ra_deg', dec='dec_deg', zone_deg=_DEFAULT_ZONE_DEG):
+    """
+    Return the `SkyTiles` of a table, reusing cached tilings.
+
+    Tilings are keyed by the positions of the table, kept in memory and
+    stored in the ``tables`` directory of the cache, so they are built once
+    per parsed table.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Table with positions in degrees.
+    ra, dec : str, optional
+        Names of the position columns.
+    zone_deg : float, optional
+        Height of the declination zones.
+
+    Returns
+    -------
+    SkyTiles
+    """
+    ra_deg = df[ra].to_numpy(dtype=np.float64, na_value=np.nan)
+    dec_deg = df[dec].to_numpy(dtype=np.float64, na_value=np.nan)
+    key = position_digest(ra_deg, dec_deg, salt=f"tiles:{_TILES_VERSION}:{zone_deg}")
+
+    with _tiles_cache_lock:
+        tiles = _tiles_cache.get(key)
+    if tiles is not None:
+        return tiles
+
+    cache_dir = get_default_table_cache().cache_dir
+    path = os.path.join(cache_dir, key + '.tiles.npz')
+    tiles = SkyTiles.load(path) if os.path.exists(path) else None
+    if tiles is None:
+        tiles = SkyTiles(ra_deg, dec_deg, zone_deg)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp.npz"
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            tiles.save(tmp_path)
+            os.replace(tmp_path, path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+    with _tiles_cache_lock:
+        _tiles_cache[key] = tiles
+    return tiles
@@ -0,0 +1,410 @@
+# -*- coding: utf-8 -*-
+"""
+table_cache.py
+-----------
+
+Second cache tier holding parsed tables in the Feather (Arrow IPC) format.
+
+A parsed DataFrame is stored under ``tables/<key>.feather`` next to the raw
+cache (see `maguniverse.utils.cache`). The key combines
+
+- the SHA-256 of the raw ASCII file,
+- the SHA-256 of the source of the module defining the parser and of every
+  ``maguniverse.utils`` module it uses, directly or through other such
+  modules (the shared decoders and converters), and
+- the parser name and arguments (e.g. which table of a paper),
+
+so an entry is invalidated automatically when either the raw content or the
+parser code changes. Repeat calls memory-map the uncompressed Feather file
+instead of parsing the ASCII table again.
+
+The parsed-table cache needs ``pyarrow``; without it tables are simply parsed
+on every call.
+"""
+
+import hashlib
+import importlib
+import inspect
+import json
+import os
+import re
+import threading
+
+try:
+    import pyarrow as pa
+    from pyarrow import feather
+    from pyarrow import parquet
+    _HAS_ARROW = True
+except ImportError:  # pragma: no cover - optional dependency
+    _HAS_ARROW = False
+
+from maguniverse.utils.cache import get_default_cache
+
+# Bump to invalidate every cached table after a change to the storage layout
+_FORMAT_VERSION = 1
+_ATTRS_KEY = b'maguniverse.attrs'
+_DIGEST_NAME = re.compile(r'^[0-9a-f]{64}\.txt$')
+_HASH_CHUNK_SIZE = 1 << 20
+# Shared decoders used by the parsers; their source is part of every key.
+# Further maguniverse.utils modules a parser uses are found from its imports.
+_SHARED_MODULES = ('maguniverse.utils.fixed_width', 'maguniverse.utils.mrt',
+                   'maguniverse.utils.converters', 'maguniverse.utils.coordinates',
+                   'maguniverse.utils.names', 'maguniverse.utils.preslice')
+_UTILS_PREFIX = 'maguniverse.utils.'
+# Fetching, caching and post-processing modules, which do not change a parse
+_IO_MODULES = frozenset({'maguniverse.utils.cache', 'maguniverse.utils.table_cache',
+                         'maguniverse.utils.fetch_ascii', 'maguniverse.utils.transport',
+                         'maguniverse.utils.compact'})
+
+
+def _utils_dependencies(module_name):
+    """maguniverse.utils modules used by a module, directly or transitively."""
+    found, pending = set(), [module_name]
+    while pending:
+        module = importlib.import_module(pending.pop())
+        for value in vars(module).values():
+            name = value.__name__ if inspect.ismodule(value) \
+                else getattr(value, '__module__', None)
+            if isinstance(name, str) and name.startswith(_UTILS_PREFIX) \
+                    and name not in found and name not in _IO_MODULES:
+                found.add(name)
+                pending.append(name)
+    found.discard(module_name)
+    return sorted(found)
+
+
+class TableCache():
+    """
+    On-disk cache of parsed tables keyed by raw content and parser version.
+
+    Parameters
+    ----------
+    cache_dir : str
+        Directory holding the Feather files.
+    """
+
+    def __init__(self, cache_dir) -> None:
+        self.cache_dir = cache_dir
+        self._lock = threading.Lock()
+        self._module_digests = {}
+        self._module_dependencies = {}
+        self.stats = {'hits': 0, 'misses': 0}
+        return
+
+    def path(self, key):
+        """Return the on-disk path of the table with the given key."""
+        return os.path.join(self.cache_dir, key + '.feather')
+
+    def key(self, src, parse, args=()):
+        """
+        Cache key of parsing the file `src` with `parse(src, *args)`.
+
+        Parameters
+        ----------
+        src : str
+            Path of the raw ASCII file.
+        parse : callable
+            Parser function; the source of its module is part of the key.
+        args : tuple, optional
+            Extra positional arguments of the parser.
+
+        Returns
+        -------
+        str
+            Hex SHA-256 digest.
+        """
+        modules = (parse.__module__,) + _SHARED_MODULES
+        modules += tuple(name for name in self._dependencies(parse.__module__)
+                         if name not in modules)
+        parts = [str(_FORMAT_VERSION), raw_digest(src)]
+        parts += [self._module_digest(module_name) for module_name in modules]
+        parts += [f"{parse.__module__}.{parse.__qualname__}", repr(tuple(args))]
+        return hashlib.sha256('\n'.join(parts).encode('utf-8')).hexdigest()
+
+    def _dependencies(self, module_name):
+        with self._lock:
+            names = self._module_dependencies.get(module_name)
+        if names is None:
+            names = _utils_dependencies(module_name)
+            with self._lock:
+                self._module_dependencies[module_name] = names
+        return names
+
+    def _module_digest(self, module_name):
+        with self._lock:
+            digest = self._module_digests.get(module_name)
+        if digest is None:
+            module_file = getattr(importlib.import_module(module_name), '__file__', None)
+            if module_file is None:
+                # interactive parsers have no source: never reuse their tables
+                digest = os.urandom(16).hex()
+            else:
+                with open(module_file, 'rb') as f:
+                    digest = hashlib.sha256(f.read()).hexdigest()
+            with self._lock:
+                self._module_digests[module_name] = digest
+        return digest
+
+    def load(self, key):
+        """Memory-map and return the table stored under `key`, or None."""
+        path = self.path(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            table = feather.read_table(path, memory_map=True)
+        except (OSError, pa.ArrowInvalid):
+            return None
+        df = table.to_pandas()
+        metadata = table.schema.metadata or {}
+        if _ATTRS_KEY in metadata:
+            df.attrs.update(json.loads(metadata[_ATTRS_KEY]))
+        return df
+
+    def store(self, key, df):
+        """Write `df` (and its attrs) under `key`. Failures are ignored."""
+        path = self.path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            metadata = dict(table.schema.metadata or {})
+            metadata[_ATTRS_KEY] = json.dumps(df.attrs, default=str).encode('utf-8')
+            table = table.replace_schema_metadata(metadata)
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # uncompressed, so that the file can be memory-mapped
+            feather.write_feather(table, tmp_path, compression='uncompressed')
+            os.replace(tmp_path, path)
+        except (OSError, pa.ArrowException, TypeError, ValueError):
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def record(self, event):
+        """Increment the 'hits' or 'misses' counter."""
+        with self._lock:
+            self.stats[event] += 1
+
+
+def raw_digest(src):
+    """
+    SHA-256 of the raw ASCII file `src`.
+
+    Files in the raw cache are named after their digest, which is used
+    directly; other files are hashed.
+    """
+    name = os.path.basename(src)
+    if _DIGEST_NAME.match(name):
+        return name[:-len('.txt')]
+    digest = hashlib.sha256()
+    with open(src, 'rb') as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+_default_table_cache = None
+_table_cache_enabled = True
+
+
+def get_default_table_cache():
+    """Return the process-wide `TableCache`, stored under the raw cache root."""
+    global _default_table_cache
+    tables_dir = os.path.join(get_default_cache().cache_dir, 'tables')
+    if _default_table_cache is None or _default_table_cache.cache_dir != tables_dir:
+        _default_table_cache = TableCache(tables_dir)
+    return _default_table_cache
+
+
+def configure_table_cache(enabled=True):
+    """
+    Enable or disable the parsed-table cache.
+
+    The tables are stored in the ``tables`` directory of the raw cache root,
+    see `configure_cache`.
+
+    Parameters
+    ----------
+    enabled : bool, optional
+        Set to False to parse the ASCII table on every call.
+    """
+    global _table_cache_enabled
+    _table_cache_enabled = enabled
+
+
+def get_table_cache_stats():
+    """
+    Return the hit/miss counters of the parsed-table cache.
+
+    Returns
+    -------
+    dict
+        'hits'   : tables loaded from a Feather file
+        'misses' : tables parsed from ASCII
+    """
+    return dict(get_default_table_cache().stats)
+
+
+def cached_parse(src, parse, *args):
+    """
+    Return ``parse(src, *args)``, reusing a cached parse of the same content.
+
+    Parameters
+    ----------
+    src : str
+        Path of the raw ASCII file.
+    parse : callable
+        Parser returning a DataFrame.
+    *args
+        Extra positional arguments of the parser (part of the cache key).
+
+    Returns
+    -------
+    pandas.DataFrame
+        The parsed table, with its cache key in ``df.attrs['cache_key']``
+        when the cache is in use.
+    """
+    if not (_HAS_ARROW and _table_cache_enabled):
+        return parse(src, *args)
+    cache = get_default_table_cache()
+    key = cache.key(src, parse, args)
+    df = cache.load(key)
+    if df is None:
+        cache.record('misses')
+        df = parse(src, *args)
+        cache.store(key, df)
+    else:
+        cache.record('hits')
+    df.attrs['cache_key'] = key
+    return df
+
+
+def write_table(df, save_path):
+    """
+    Write a parsed table, choosing the format from the file extension.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Table to write.
+    save_path : str
+        Target path. ``.parquet`` and ``.feather`` keep the column dtypes
+        (and need ``pyarrow``); any other extension writes CSV.
+    """
+    extension = os.path.splitext(save_path)[1].lower()
+    if extension == '.parquet':
+        df.to_parquet(save_path, index=False)
+    elif extension == '.feather':
+        df.reset_index(drop=True).to_feather(save_path)
+    else:
+        df.to_csv(save_path, index=False)
+
+
+def split_frame(df, chunksize):
+    """
+    Yield consecutive row slices of `df` with at most `chunksize` rows.
+
+    Used by the chunked getters for tables that are parsed as a whole.
+    """
+    if chunksize < 1:
+        raise ValueError("chunksize must be a positive integer")
+    for start in range(0, len(df), chunksize):
+        chunk = df.iloc[start:start + chunksize]
+        chunk.attrs = dict(df.attrs)
+        yield chunk
+
+
+class TableWriter():
+    """
+    Incremental writer of a table delivered in DataFrame chunks.
+
+    The format is chosen from the file extension as in `write_table`.
+    Parquet and Feather chunks are cast to the schema of the first chunk
+    and appended as row groups / record batches; CSV chunks are appended
+    with the header written once. Only the current chunk is held in memory.
+
+    Parameters
+    ----------
+    save_path : str
+        Target path.
+
+    Examples
+    --------
+    >>> with TableWriter('t2.parquet') as writer:
+    ...     for chunk in iter_dotson2010(table='t2'):
+    ...         writer.write(chunk)
+    """
+
+    def __init__(self, save_path) -> None:
+        self.save_path = save_path
+        self.extension = os.path.splitext(save_path)[1].lower()
+        self.rows = 0
+        self._schema = None
+        self._writer = None
+        self._sink = None
+        return
+
+    def write(self, df):
+        """Append the chunk `df`."""
+        if self.extension in ('.parquet', '.feather'):
+            self._write_arrow(df)
+        else:
+            df.to_csv(self.save_path, index=False, mode='w' if self.rows == 0 else 'a',
+                      header=self.rows == 0)
+        self.rows += len(df)
+
+    def _write_arrow(self, df):
+        if self._schema is None:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            # an all-missing column of the first chunk is taken as text
+            fields = [field.with_type(pa.string()) if pa.types.is_null(field.type) else field
+                      for field in table.schema]
+            self._schema = pa.schema(fields, metadata=table.schema.metadata)
+            table = table.cast(self._schema)
+            if self.extension == '.parquet':
+                self._writer = parquet.ParquetWriter(self.save_path, self._schema)
+            else:
+                self._sink = pa.OSFile(self.save_path, 'wb')
+                self._writer = pa.ipc.new_file(self._sink, self._schema)
+        else:
+            table = pa.Table.from_pandas(df, schema=self._schema, preserve_index=False)
+        self._writer.write_table(table)
+
+    def close(self):
+        """Finish the file. An empty CSV is written if no chunk was given."""
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        if self._sink is not None:
+            self._sink.close()
+            self._sink = None
+        if self.rows == 0 and self.extension not in ('.parquet', '.feather'):
+            open(self.save_path, 'w').close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+        return False
+
+
+def write_chunks(chunks, save_path=None):
+    """
+    Yield the DataFrames of `chunks`, writing each one to `save_path` on the way.
+
+    Parameters
+    ----------
+    chunks : iterable of pandas.DataFrame
+        Chunks of one table.
+    save_path : str, optional
+        Target path (see `TableWriter`). If None, the chunks are passed through.
+
+    Yields
+    ------
+    pandas.DataFrame
+    """
+    if not save_path:
+        yield from chunks
+        return
+    with TableWriter(save_path) as writer:
+        for chunk in chunks:
+            writer.write(chunk)
+            yield chunk
@@ -0,0 +1,192 @@
+# -*- coding: utf-8 -*-
+"""
+transport.py
+-----------
+
+Shared HTTP transport for all remote table downloads.
+
+A single `requests.Session` is reused by `get_ascii` (and therefore by every
+data getter and the `getters` service), so repeated downloads from the same
+publisher host reuse pooled keep-alive connections instead of paying a new
+TCP/TLS handshake per table. Transient failures (timeouts, connection errors
+and 5xx responses) are retried with exponential backoff and random jitter.
+Callers that handle failures themselves (e.g. the proxy fallback of the
+`getters` service) can lower the retries and timeouts of their own requests
+with `transport_options`.
+"""
+
+import contextlib
+import contextvars
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Transport settings, see `configure_transport`
+_config = {
+    'retries': 2,
+    'backoff_factor': 0.5,
+    'backoff_max': 8.0,
+    'jitter': 0.25,
+    'pool_connections': 10,
+    'pool_maxsize': 10,
+    'timeout': 10,
+}
+_RETRY_STATUS = (500, 502, 503, 504)
+_DEFAULT_HEADERS = {
+    'User-Agent': 'python-requests/2.x',
+    'Accept-Encoding': 'gzip, deflate',
+}
+
+# Overrides of the current `transport_options` block
+_overrides = contextvars.ContextVar('maguniverse_transport', default={})
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def _build_session():
+    """Create a session with per-host connection pools mounted for http(s)."""
+    session = requests.Session()
+    session.headers.update(_DEFAULT_HEADERS)
+    adapter = HTTPAdapter(pool_connections=_config['pool_connections'],
+                          pool_maxsize=_config['pool_maxsize'],
+                          max_retries=0)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def get_session():
+    """Return the process-wide pooled `requests.Session`."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = _build_session()
+        return _session
+
+
+def configure_transport(retries=2, backoff_factor=0.5, backoff_max=8.0, jitter=0.25,
+                        pool_connections=10, pool_maxsize=10, timeout=10):
+    """
+    Configure the shared HTTP transport.
+
+    Parameters
+    ----------
+    retries : int, optional
+        Number of retries after the first attempt on timeouts, connection
+        errors and 5xx responses.
+    backoff_factor : float, optional
+        Base delay (s); retry k waits ``backoff_factor * 2**k`` seconds.
+    backoff_max : float, optional
+        Upper bound (s) of the exponential delay.
+    jitter : float, optional
+        Maximum random delay (s) added to every backoff.
+    pool_connections : int, optional
+        Number of per-host connection pools kept alive.
+    pool_maxsize : int, optional
+        Maximum number of connections kept per host.
+    timeout : float, optional
+        Default request timeout (s).
+    """
+    global _session
+    _config.update(retries=retries, backoff_factor=backoff_factor,
+                   backoff_max=backoff_max, jitter=jitter,
+                   pool_connections=pool_connections, pool_maxsize=pool_maxsize,
+                   timeout=timeout)
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+        _session = None
+
+
+@contextlib.contextmanager
+def transport_options(retries=None, timeout=None, connect_timeout=None):
+    """
+    Override the transport settings for requests made inside a ``with`` block.
+
+    The overrides only apply in the current thread (or asyncio task); the
+    process-wide settings of `configure_transport` are left untouched.
+
+    Parameters
+    ----------
+    retries : int or None
+        Number of retries after the first attempt. None keeps the configured
+        value.
+    timeout : float or None
+        Read timeout (s). None keeps the configured value.
+    connect_timeout : float or None
+        Connect timeout (s), so unreachable hosts fail fast while slow but
+        live downloads still get the full read timeout. None uses `timeout`.
+
+    Examples
+    --------
+    >>> with transport_options(retries=0, connect_timeout=3):
+    ...     resp = http_get(url)
+    """
+    overrides = dict(_overrides.get())
+    for name, value in (('retries', retries), ('timeout', timeout),
+                        ('connect_timeout', connect_timeout)):
+        if value is not None:
+            overrides[name] = value
+    token = _overrides.set(overrides)
+    try:
+        yield
+    finally:
+        _overrides.reset(token)
+
+
+def _backoff(attempt):
+    delay = min(_config['backoff_factor'] * (2 ** attempt), _config['backoff_max'])
+    return delay + random.uniform(0, _config['jitter'])
+
+
+def http_get(url, headers=None, timeout=None, **kwargs):
+    """
+    GET `url` through the shared session, retrying transient failures.
+
+    Parameters
+    ----------
+    url : str
+        Resource to fetch.
+    headers : dict or None
+        Extra request headers merged over the session defaults.
+    timeout : float or None
+        Request timeout (s). Defaults to the configured timeout (and to the
+        active `transport_options`).
+    **kwargs : dict
+        Additional keyword arguments passed to `requests.Session.get`.
+
+    Returns
+    -------
+    requests.Response
+        The final response. 5xx responses are returned (not raised) once the
+        retries are exhausted.
+
+    Raises
+    ------
+    requests.RequestException
+        If the last attempt fails with a timeout or connection error.
+    """
+    session = get_session()
+    overrides = _overrides.get()
+    retries = overrides.get('retries', _config['retries'])
+    if timeout is None:
+        timeout = overrides.get('timeout', _config['timeout'])
+        if 'connect_timeout' in overrides:
+            timeout = (overrides['connect_timeout'], timeout)
+    for attempt in range(retries + 1):
+        last_attempt = attempt == retries
+        try:
+            resp = session.get(url, headers=headers, timeout=timeout,
+                               allow_redirects=True, **kwargs)
+        except (requests.Timeout, requests.ConnectionError):
+            if last_attempt:
+                raise
+        else:
+            if resp.status_code not in _RETRY_STATUS or last_attempt:
+                return resp
+            resp.close()
+        time.sleep(_backoff(attempt))
@@ -7,6 +7,11 @@ setup(
     long_description_content_type="text/markdown",
     packages=find_packages(),
     install_requires=["requests", "pandas", "jinja2"],
+    extras_require={
+        "arrow": ["pyarrow"],
+        "analysis": ["scipy"],
+        "all": ["pyarrow", "scipy"],
+    },
     author="X. Li",
     description="A Python-based data manager for working with tabulated data from publications of observational surveys of cosmic magnetic fields.",
     url="https://github.com/xli2522/maguniverse",
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""
+conftest.py
+-----------
+
+Shared fixtures: every test session uses a fresh cache directory, so cached
+tables, indexes and CDFs of earlier runs never leak into the results, and
+remote fetches can be answered by canned responses instead of the network.
+"""
+
+import pytest
+
+from maguniverse.utils.cache import configure_cache
+
+
+@pytest.fixture(autouse=True, scope='session')
+def isolated_cache(tmp_path_factory):
+    """Point the raw and parsed-table caches at a temporary directory."""
+    cache_dir = tmp_path_factory.mktemp('cache')
+    configure_cache(cache_dir=str(cache_dir))
+    yield cache_dir
+    configure_cache()
+
+
+class FakeResponse():
+    """Minimal stand-in for a `requests.Response` returned by `http_get`."""
+
+    def __init__(self, content=b'', status_code=200, headers=None, encoding=None) -> None:
+        self.content = content
+        self.status_code = status_code
+        self.headers = headers if headers is not None else {}
+        # requests guesses ISO-8859-1 for text/* responses without a charset
+        content_type = self.headers.get('Content-Type', '')
+        if encoding is None and 'charset=' in content_type:
+            encoding = content_type.split('charset=')[-1]
+        elif encoding is None and content_type.startswith('text/'):
+            encoding = 'ISO-8859-1'
+        self.encoding = encoding
+        return
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise OSError(f"HTTP {self.status_code}")
+
+    def iter_content(self, chunk_size=1):
+        for start in range(0, len(self.content), chunk_size):
+            yield self.content[start:start + chunk_size]
+
+
+class FakeHTTP():
+    """Canned `http_get`: answers each URL from `routes` and logs every call."""
+
+    def __init__(self) -> None:
+        self.routes = {}
+        self.calls = []
+        return
+
+    def __call__(self, url, headers=None, stream=False, **kwargs):
+        self.calls.append({'url': url, 'headers': dict(headers or {}), 'stream': stream})
+        answer = self.routes[url]
+        return answer(headers or {}) if callable(answer) else answer
+
+
+@pytest.fixture
+def fake_http(monkeypatch):
+    """Replace the `http_get` used by `get_ascii` with a `FakeHTTP`."""
+    http = FakeHTTP()
+    monkeypatch.setattr('maguniverse.utils.fetch_ascii.http_get', http)
+    return http
+
+
+@pytest.fixture
+def raw_cache(tmp_path, isolated_cache):
+    """A fresh, empty raw cache for one test."""
+    configure_cache(cache_dir=str(tmp_path / 'raw'))
+    yield tmp_path / 'raw'
+    configure_cache(cache_dir=str(isolated_cache))
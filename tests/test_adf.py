@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+"""
+test_adf.py
+-----------
+
+Angular dispersion functions against a brute-force loop over all pairs.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from maguniverse.analysis import adf
+from maguniverse.analysis.adf import angular_dispersion
+
+BINS = np.array([0.0, 5.0, 12.0, 20.0, 30.0])
+
+
+def brute_force(df, bins):
+    """ADF rows of every source, comparing each pair of vectors explicitly."""
+    rows = []
+    usable = df.dropna(subset=['ΔR.A.', 'ΔDecl.', 'theta', 'name_key'])
+    for key, group in usable.groupby('name_key', sort=False):
+        x, y = group['ΔR.A.'].to_numpy(), group['ΔDecl.'].to_numpy()
+        angle, error = group['theta'].to_numpy(), group['sigma(theta)'].to_numpy()
+        sums = np.zeros((len(bins) - 1, 5))
+        for i in range(len(group)):
+            for j in range(i + 1, len(group)):
+                lag = np.hypot(x[i] - x[j], y[i] - y[j])
+                if lag < bins[0] or lag > bins[-1]:
+                    continue
+                k = min(np.searchsorted(bins, lag, side='right') - 1, len(bins) - 2)
+                # axial angles: the difference wrapped to [-90°, 90°]
+                difference = (angle[i] - angle[j] + 90.0) % 180.0 - 90.0
+                sums[k] += [1, lag, 1.0 - np.cos(np.radians(difference)), difference ** 2,
+                            error[i] ** 2 + error[j] ** 2]
+        for k in range(len(bins) - 1):
+            with np.errstate(invalid='ignore', divide='ignore'):
+                means = sums[k, 1:] / sums[k, 0]
+            rows.append([group['ID'].iloc[0], key, bins[k], bins[k + 1], int(sums[k, 0]),
+                         *means])
+    return pd.DataFrame(rows, columns=['source', 'name_key', 'lag_min', 'lag_max', 'pairs',
+                                       'lag', 'one_minus_cos', 'structure_deg2',
+                                       'sigma2_deg2'])
+
+
+@pytest.fixture
+def vectors():
+    rng = np.random.default_rng(11)
+    n = 180
+    df = pd.DataFrame({
+        'ID': rng.choice(['OMC-1', 'W3', 'L 1527'], n),
+        'ΔR.A.': np.round(rng.uniform(-25, 25, n), 1),
+        'ΔDecl.': np.round(rng.uniform(-25, 25, n), 1),
+        'theta': rng.uniform(-90, 180, n),
+        'sigma(theta)': rng.uniform(1, 10, n),
+    })
+    df['name_key'] = df['ID'].str.lower().str.replace(r'[\s\-]', '', regex=True)
+    df.loc[[3, 50], 'theta'] = np.nan
+    df.loc[7, 'ΔR.A.'] = np.nan
+    # coincident vectors fall in the first bin
+    df.loc[9, ['ΔR.A.', 'ΔDecl.', 'name_key']] = df.loc[8, ['ΔR.A.', 'ΔDecl.', 'name_key']]
+    return df
+
+
+def check(result, expected):
+    pd.testing.assert_frame_equal(result.reset_index(drop=True), expected,
+                                  check_dtype=False, rtol=1e-9)
+
+
+def test_matches_brute_force(vectors):
+    check(angular_dispersion(vectors, bins=BINS), brute_force(vectors, BINS))
+
+
+def test_open_first_bin_and_irregular_edges(vectors):
+    bins = np.array([2.0, 3.0, 9.5, 31.0])
+    check(angular_dispersion(vectors, bins=bins), brute_force(vectors, bins))
+
+
+def test_window_scan_matches_brute_force(vectors, monkeypatch):
+    # the path taken without scipy, in blocks of a few candidate pairs
+    monkeypatch.setattr(adf, '_HAS_SCIPY', False)
+    monkeypatch.setattr(adf, '_MAX_PAIRS', 50)
+    check(angular_dispersion(vectors, bins=BINS), brute_force(vectors, BINS))
+
+
+def test_invalid_bins(vectors):
+    with pytest.raises(ValueError):
+        angular_dispersion(vectors, bins=[10.0, 5.0])
+    with pytest.raises(ValueError):
+        angular_dispersion(vectors, catalog='unknown')
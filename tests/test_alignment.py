@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+"""
+test_alignment.py
+-----------
+
+KS / AD statistics against `scipy.stats`, and the projected-angle models.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from maguniverse.analysis.alignment import (ReferenceCDF, projected_angles, reference_cdf,
+                                            ks_ad, angle_differences, alignment_test)
+from maguniverse.analysis import alignment
+
+stats = pytest.importorskip('scipy.stats')
+
+
+def uniform_cdf(angles):
+    return np.asarray(angles) / 90.0
+
+
+@pytest.mark.parametrize('power', [1.0, 0.9, 1.5])
+def test_ks_ad_match_scipy(power):
+    angles = 90.0 * np.random.default_rng(1).random(200) ** power
+    result = ks_ad(angles, uniform_cdf)
+    ks = stats.kstest(angles, stats.uniform(0, 90).cdf)
+    assert result['n'] == 200
+    assert result['ks'] == pytest.approx(ks.statistic, rel=1e-12)
+    assert result['ks_pvalue'] == pytest.approx(ks.pvalue, rel=1e-9)
+    ad = stats.goodness_of_fit(stats.uniform, angles, known_params={'loc': 0, 'scale': 90},
+                               statistic='ad', n_mc_samples=2000, rng=0)
+    assert result['ad'] == pytest.approx(ad.statistic, rel=1e-9)
+    # the asymptotic p-value against the simulated null distribution
+    assert result['ad_pvalue'] == pytest.approx(ad.pvalue, abs=0.03)
+
+
+def test_ks_pvalue_without_scipy(monkeypatch):
+    angles = 90.0 * np.random.default_rng(2).random(400) ** 1.1
+    expected = stats.kstest(angles, stats.uniform(0, 90).cdf).pvalue
+    monkeypatch.setattr(alignment, '_HAS_SCIPY', False)
+    assert ks_ad(angles, uniform_cdf)['ks_pvalue'] == pytest.approx(expected, abs=0.01)
+
+
+def test_anderson_darling_critical_values():
+    # asymptotic 10%, 5% and 1% points of A²
+    for a2, p in [(1.933, 0.10), (2.492, 0.05), (3.857, 0.01)]:
+        assert alignment._anderson_darling_sf(a2) == pytest.approx(p, abs=1e-3)
+
+
+def test_ks_ad_ignores_nan():
+    result = ks_ad([np.nan, 10.0, 45.0, np.nan, 80.0], uniform_cdf)
+    assert result['n'] == 3
+    assert np.isnan(ks_ad([np.nan], uniform_cdf)['ks'])
+
+
+def test_random_model_is_uniform():
+    # independent isotropic vectors project to independent uniform angles
+    angles = projected_angles(200000, (0.0, 90.0), seed=4)
+    assert angles.min() >= 0.0 and angles.max() <= 90.0
+    assert stats.kstest(angles, stats.uniform(0, 90).cdf).pvalue > 1e-3
+
+
+def test_parallel_model_against_rotation():
+    # direct construction: rotate a random vector by γ about a random axis
+    rng = np.random.default_rng(8)
+    n = 100000
+    a = rng.normal(size=(n, 3))
+    a /= np.linalg.norm(a, axis=1)[:, None]
+    cos_gamma = rng.uniform(np.cos(np.radians(20.0)), 1.0, n)
+    perpendicular = np.cross(a, rng.normal(size=(n, 3)))
+    perpendicular /= np.linalg.norm(perpendicular, axis=1)[:, None]
+    b = cos_gamma[:, None] * a + np.sqrt(1 - cos_gamma ** 2)[:, None] * perpendicular
+    # angle between the projections on the x-y plane, folded to [0°, 90°]
+    difference = np.degrees(np.arctan2(a[:, 1], a[:, 0]) - np.arctan2(b[:, 1], b[:, 0]))
+    difference = np.abs(difference) % 180.0
+    expected = np.minimum(difference, 180.0 - difference)
+    found = projected_angles(n, (0.0, 20.0), seed=9)
+    assert stats.ks_2samp(found, expected).pvalue > 1e-3
+
+
+def test_reference_cdf_is_seeded_and_cached():
+    first = reference_cdf((70.0, 90.0), n_samples=300000, seed=1)
+    assert first.n_samples == 300000
+    assert first(0.0) == 0.0 and first(90.0) == pytest.approx(1.0)
+    again = reference_cdf((70.0, 90.0), n_samples=300000, seed=1)
+    np.testing.assert_array_equal(first.counts, again.counts)
+
+
+def test_reference_cdf_round_trip(tmp_path):
+    cdf = ReferenceCDF((0.0, 90.0), np.ones(alignment._N_BINS, dtype=np.int64))
+    cdf.save(tmp_path / 'cdf.npz')
+    loaded = ReferenceCDF.load(tmp_path / 'cdf.npz')
+    assert loaded(45.0) == pytest.approx(0.5)
+    assert ReferenceCDF.load(tmp_path / 'missing.npz') is None
+
+
+def test_angle_differences_are_folded():
+    df = pd.DataFrame({'theta': [10.0, 170.0, -80.0, np.nan], 'phi': [0.0, 0.0, 95.0, 1.0]})
+    np.testing.assert_allclose(angle_differences(df), [10.0, 10.0, 5.0, np.nan])
+
+
+def test_alignment_test_prefers_the_true_model():
+    angles = projected_angles(300, (70.0, 90.0), seed=12)
+    df = pd.DataFrame({'theta': angles, 'phi': 0.0})
+    result = alignment_test(df, models=['parallel', 'perpendicular'],
+                            n_samples=200000).set_index('model')
+    assert result.loc['perpendicular', 'ks_pvalue'] > 0.01
+    assert result.loc['parallel', 'ks_pvalue'] < 1e-6
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""
+test_cache.py
+-----------
+
+Raw ASCII cache: conditional revalidation and proxy-independent keys.
+"""
+
+import pandas as pd
+
+from maguniverse.service.get import getters
+from maguniverse.utils.cache import (configure_cache, get_cache_stats, get_default_cache,
+                                     reset_cache_stats)
+from maguniverse.utils.fetch_ascii import cache_as, get_ascii
+
+from conftest import FakeResponse
+
+URL = 'https://example.org/table1.txt'
+TEXT = 'a b\n1 2\n'
+
+
+def _etag_route(text, etag='"v1"'):
+    """Answer 304 when the request carries the current ETag, else the full table."""
+    def answer(headers):
+        if headers.get('If-None-Match') == etag:
+            return FakeResponse(status_code=304, headers={'ETag': etag})
+        return FakeResponse(text.encode('utf-8'), headers={'ETag': etag})
+    return answer
+
+
+def test_miss_then_revalidated_hit(raw_cache, fake_http):
+    fake_http.routes[URL] = _etag_route(TEXT)
+    reset_cache_stats()
+
+    assert get_ascii(file_url=URL) == TEXT
+    assert fake_http.calls[0]['headers'] == {}
+    assert get_ascii(file_url=URL) == TEXT
+    assert fake_http.calls[1]['headers'] == {'If-None-Match': '"v1"'}
+    assert get_cache_stats() == {'hits': 1, 'misses': 1, 'revalidated': 1}
+
+
+def test_changed_table_replaces_cached_copy(raw_cache, fake_http):
+    fake_http.routes[URL] = _etag_route(TEXT)
+    get_ascii(file_url=URL)
+    fake_http.routes[URL] = _etag_route('a b\n3 4\n', etag='"v2"')
+
+    assert get_ascii(file_url=URL) == 'a b\n3 4\n'
+    assert get_default_cache().lookup(URL)['etag'] == '"v2"'
+
+
+def test_fresh_entry_skips_the_network(tmp_path, fake_http, isolated_cache):
+    configure_cache(cache_dir=str(tmp_path), max_age=3600)
+    try:
+        fake_http.routes[URL] = _etag_route(TEXT)
+        get_ascii(file_url=URL)
+        assert get_ascii(file_url=URL) == TEXT
+        assert len(fake_http.calls) == 1
+    finally:
+        configure_cache(cache_dir=str(isolated_cache))
+
+
+def test_streamed_copy_is_cached(raw_cache, fake_http):
+    fake_http.routes[URL] = _etag_route(TEXT)
+    path = get_ascii(file_url=URL, stream=True)
+    assert open(path, encoding='utf-8').read() == TEXT
+    assert get_ascii(file_url=URL, stream=True) == path
+    assert fake_http.calls[1]['headers'] == {'If-None-Match': '"v1"'}
+
+
+def test_cache_key_is_independent_of_proxy(raw_cache, fake_http):
+    for proxy in ('https://proxy-a/?u=', 'https://proxy-b/?u='):
+        fake_http.routes[proxy + URL] = _etag_route(TEXT)
+
+    with cache_as(URL):
+        get_ascii(file_url='https://proxy-a/?u=' + URL)
+    get_ascii(file_url='https://proxy-b/?u=' + URL, cache_key=URL)
+
+    assert fake_http.calls[1]['headers'] == {'If-None-Match': '"v1"'}
+    assert get_default_cache().lookup(URL) is not None
+    assert get_default_cache().lookup('https://proxy-a/?u=' + URL) is None
+
+
+def test_service_warm_run_hits_cache_through_another_proxy(raw_cache, fake_http, tmp_path):
+    service = getters(datafile_path=str(tmp_path))
+    proxies = ['https://proxy-a/?u=', 'https://proxy-b/?u=']
+    for proxy in proxies:
+        fake_http.routes[proxy + URL] = _etag_route(TEXT)
+
+    def fetcher(file_url):
+        return pd.DataFrame({'text': [get_ascii(file_url=file_url)]})
+
+    reset_cache_stats()
+    service._timed_attempt(fetcher, proxies[0], URL, [])
+    service._timed_attempt(fetcher, proxies[1], URL, [])
+    assert get_cache_stats()['revalidated'] == 1
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""
+test_captcha.py
+-----------
+
+CAPTCHA pages: `CaptchaRequired` in headless mode and the stale fallback of
+the `getters` service.
+"""
+
+import os
+
+import pandas as pd
+import pytest
+
+from maguniverse.service.get import getters
+from maguniverse.utils import fetch_ascii
+from maguniverse.utils.cache import get_default_cache
+from maguniverse.utils.fetch_ascii import (CaptchaRequired, get_ascii, headless_mode,
+                                           is_headless)
+
+from conftest import FakeResponse
+
+URL = 'https://example.org/table3.txt'
+TEXT = 'a b\n1 2\n3 4\n'
+CAPTCHA = FakeResponse(b'<html><div class="h-captcha" data-sitekey="x"></div></html>')
+PROXIES = ['', 'https://a.test/?u=']
+
+
+def _parse(file_path=None, file_url=None):
+    """Tiny data getter: whitespace table from a local file or URL."""
+    text = get_ascii(file_path=file_path, file_url=file_url)
+    rows = [line.split() for line in text.splitlines()]
+    return pd.DataFrame(rows[1:], columns=rows[0])
+
+
+def test_headless_captcha_carries_cached_copy(raw_cache, fake_http):
+    fake_http.routes[URL] = FakeResponse(TEXT.encode('utf-8'))
+    get_ascii(file_url=URL)
+    fake_http.routes[URL] = CAPTCHA
+
+    for stream in (False, True):
+        with headless_mode(), pytest.raises(CaptchaRequired) as info:
+            get_ascii(file_url=URL, stream=stream)
+        assert info.value.url == URL
+        assert open(info.value.cached_path, encoding='utf-8').read() == TEXT
+    # the rejected streamed download leaves no partial file behind
+    assert len(os.listdir(get_default_cache().objects_dir)) == 1
+
+
+def test_interactive_captcha_opens_browser_and_exits(raw_cache, fake_http, monkeypatch):
+    opened = []
+    monkeypatch.setattr(fetch_ascii.webbrowser, 'open', opened.append)
+    fake_http.routes[URL] = CAPTCHA
+    with headless_mode(False), pytest.raises(SystemExit):
+        get_ascii(file_url=URL)
+    assert opened == [URL]
+
+
+def test_headless_mode_is_scoped():
+    before = is_headless()
+    with headless_mode(not before):
+        assert is_headless() is (not before)
+    assert is_headless() is before
+
+
+def test_service_serves_stale_copy(raw_cache, fake_http, tmp_path):
+    service = getters(datafile_path=str(tmp_path), headless=True)
+    service.configure_proxies(PROXIES)
+    source = {'data_link': {'t3': URL}}
+    fake_http.routes[URL] = FakeResponse(TEXT.encode('utf-8'))
+    fresh = service._try_with_proxy_fallback(_parse, source, 't3')
+    assert not fresh.attrs.get('stale', False)
+
+    for proxy in PROXIES:
+        fake_http.routes[proxy + URL] = CAPTCHA
+    stale = service._try_with_proxy_fallback(_parse, source, 't3')
+    assert stale.attrs['stale']
+    assert open(stale.attrs['stale_source'], encoding='utf-8').read() == TEXT
+    pd.testing.assert_frame_equal(stale, fresh)
+    # every pair is now cooling down; the stale copy is served without a request
+    calls = len(fake_http.calls)
+    assert service._try_with_proxy_fallback(_parse, source, 't3').attrs['stale']
+    assert len(fake_http.calls) == calls
+
+
+def test_service_raises_without_stale_copy(raw_cache, fake_http, tmp_path):
+    service = getters(datafile_path=str(tmp_path), headless=True)
+    service.configure_proxies(PROXIES)
+    for proxy in PROXIES:
+        fake_http.routes[proxy + URL] = CAPTCHA
+    with pytest.raises(Exception, match='proxy options failed'):
+        service._try_with_proxy_fallback(_parse, {'data_link': {'t3': URL}}, 't3')
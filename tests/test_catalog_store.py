@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+"""
+test_catalog_store.py
+-----------
+
+The partitioned catalog store: canonical rows, incremental updates and
+partitions kept when a table cannot be refreshed.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip('pyarrow')
+
+from maguniverse.service.catalog import CatalogStore  # noqa: E402
+from maguniverse.utils.names import add_name_key  # noqa: E402
+
+
+class OfflineFetcher():
+    """Stands in for `getters`: every table not passed in fails to load."""
+
+    def __getattr__(self, name):
+        def fetch():
+            raise OSError(f"{name} is offline")
+        return fetch
+
+
+def _tables():
+    rng = np.random.default_rng(5)
+    dotson_t1 = add_name_key(pd.DataFrame({
+        'Source': ['OMC-1', 'W3', 'DR21'],
+        'ra_deg': [83.8, 36.4, 309.75],
+        'dec_deg': [-5.4, 61.9, 42.3],
+        'Peak Intensity': [120.0, np.nan, 45.0],
+    }), 'Source')
+    dotson_t2 = add_name_key(pd.DataFrame({
+        'ID': ['OMC-1', 'OMC-1', 'W3', 'DR21'],
+        'ΔR.A.': [0.0, 20.0, -10.0, 5.0],
+        'ΔDecl.': [0.0, -20.0, 10.0, 5.0],
+        'P': [2.5, 3.1, 1.0, np.nan],
+        'sigma(P)': [0.3, 0.4, 0.2, np.nan],
+        'theta': [10.0, 25.0, 170.0, np.nan],
+        'sigma(theta)': [3.0, 4.0, 6.0, np.nan],
+        'Intensity': [1.0, 0.5, 0.8, 0.2],
+        'sigma(Intensity)': [0.1, 0.1, 0.1, 0.1],
+    }), 'ID')
+    harris = add_name_key(pd.DataFrame({
+        'Object': [f"HRS {k}" for k in range(6)],
+        'ra_deg': rng.uniform(0, 360, 6),
+        'dec_deg': rng.uniform(-30, 60, 6),
+        'I_peak': rng.uniform(1, 50, 6),
+        'I_int': rng.uniform(1, 50, 6),
+        'P_peak': rng.uniform(0, 5, 6),
+        'P_int': rng.uniform(0, 5, 6),
+    }), 'Object')
+    matthews = add_name_key(pd.DataFrame({
+        'ID': ['M1', 'M2'],
+        'ra_deg': [10.0, 20.0],
+        'dec_deg': [5.0, -5.0],
+        'Int': [3.0, 4.0], 'e_Int': [0.1, 0.2],
+        'Pol': [2.0, 6.0], 'e_Pol': [0.5, 0.5],
+        'theta': [45.0, 90.0], 'e_theta': [5.0, 5.0],
+    }), 'ID')
+    crutcher = add_name_key(pd.DataFrame({
+        'Name': ['W3', 'HRS 2', 'Nowhere'],
+        'B_Z (muG)': [-50.0, 12.0, 30.0],
+        'sigma (muG)': [5.0, 3.0, 10.0],
+        'n_H (cm^-3)': [1e4, np.nan, 3e3],
+    }), 'Name')
+    return {'dotson2010_t1': dotson_t1, 'dotson2010_t2': dotson_t2,
+            'harris2018_t2': harris, 'matthews2009_t6': matthews,
+            'crutcher2010_t1': crutcher}
+
+
+@pytest.fixture
+def store(tmp_path):
+    return CatalogStore(str(tmp_path / 'catalog'), fetcher=OfflineFetcher())
+
+
+def test_update_and_open(store):
+    tables = _tables()
+    status = store.update(tables=tables, catalogs=list(tables))
+    assert status == {name: 'written' for name in tables}
+    assert store.manifest['crutcher2010_t1']['rows'] == 5
+
+    df = store.open(quantities=['B_los'])
+    assert set(df['catalog']) == {'crutcher2010_t1'}
+    assert list(df['row']) == [0, 1, 2] and list(df['value']) == [-50.0, 12.0, 30.0]
+    assert list(df['error']) == [5.0, 3.0, 10.0]
+    assert (df['located_by'] == 'name').all()
+    # W3 from the mean of the Dotson et al. (2010) rows naming it, HRS 2 from
+    # Harris et al. (2018), Nowhere unplaced
+    assert df.loc[0, 'ra_deg'] == pytest.approx(36.4, abs=0.01)
+    assert df.loc[1, 'dec_deg'] == pytest.approx(tables['harris2018_t2'].loc[2, 'dec_deg'])
+    assert np.isnan(df.loc[2, 'ra_deg'])
+
+    dotson = store.open(catalogs=['dotson2010_t1'])
+    # missing values are left out, absent errors are NaN
+    assert list(dotson['row']) == [0, 2] and dotson['error'].isna().all()
+    assert list(dotson.columns[:3]) == ['catalog', 'module', 'reference']
+
+    matthews = store.open(catalogs=['matthews2009_t6'], quantities=['p'],
+                          columns=['source', 'value', 'error'])
+    assert matthews.to_dict('list') == {'source': ['M1', 'M2'], 'value': [2.0, 6.0],
+                                        'error': [0.5, 0.5]}
+
+
+def test_only_changed_partitions_are_rewritten(store):
+    tables = _tables()
+    store.update(tables=tables, catalogs=list(tables))
+    first = store.manifest
+    assert set(store.update(tables=tables, catalogs=list(tables)).values()) == {'unchanged'}
+
+    tables['matthews2009_t6'].loc[1, 'Pol'] = 7.0
+    status = store.update(tables=tables, catalogs=list(tables))
+    assert status['matthews2009_t6'] == 'written'
+    assert [name for name, state in status.items() if state == 'written'] == ['matthews2009_t6']
+    assert store.manifest['harris2018_t2'] == first['harris2018_t2']
+    assert store.open(catalogs=['matthews2009_t6'], quantities=['p'])['value'].tolist() == [2.0, 7.0]
+
+    status = store.update(tables=tables, catalogs=list(tables), force=True)
+    assert set(status.values()) == {'written'}
+
+
+def test_failed_tables_keep_their_partitions(store):
+    tables = _tables()
+    store.update(tables=tables, catalogs=list(tables))
+    before = store.open(catalogs=['crutcher2010_t1'])
+
+    tables['crutcher2010_t1'].loc[0, 'B_Z (muG)'] = -60.0
+    del tables['dotson2010_t1']
+    status = store.update(tables=tables, catalogs=list(_tables()))
+    assert isinstance(status['dotson2010_t1'], OSError)
+    # name lookups would lose the table 1 positions, so the old rows stay
+    assert isinstance(status['crutcher2010_t1'], RuntimeError)
+    assert status['harris2018_t2'] == 'unchanged'
+    pd.testing.assert_frame_equal(store.open(catalogs=['crutcher2010_t1']), before)
+    assert len(store.open(catalogs=['dotson2010_t1'])) == 2
+
+
+def test_unknown_catalog(store):
+    with pytest.raises(ValueError):
+        store.update(catalogs=['nope'])
+    assert store.manifest == {}
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""
+test_chunked.py
+-----------
+
+Chunked getters and the incremental `TableWriter`.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from maguniverse.data.zeeman import get_crutcher2010, iter_crutcher2010
+from maguniverse.utils.table_cache import TableWriter, split_frame, write_chunks
+
+N_ROWS = 250
+
+
+@pytest.fixture
+def crutcher_file(tmp_path):
+    """Synthetic copy of the tab-separated Crutcher et al. (2010) table."""
+    header = ['Table 1', 'Zeeman observations', '', 'Name\tSpecies\tRef\tn_H\tB_Z\tsigma', '']
+    rows = []
+    for k in range(N_ROWS):
+        density = f"{k + 1} x 10^3" if k % 4 == 0 else f"{(k + 1) * 100.0:.1f}"
+        field = '...' if k % 9 == 0 else f"{k * 0.5 - 20:.1f}"
+        rows.append(f"Cloud {k}\t\tOH\t\t{k % 5}\t{density}\t{field}\t{k % 7 + 1}")
+    footer = ['', 'Note: synthetic table', 'References: none']
+    path = tmp_path / 'crutcher2010.txt'
+    path.write_text('\n'.join(header + rows + footer) + '\n', encoding='utf-8')
+    return str(path)
+
+
+def test_chunks_concatenate_to_whole_table(crutcher_file):
+    whole = get_crutcher2010(file_path=crutcher_file)
+    chunks = list(iter_crutcher2010(file_path=crutcher_file, chunksize=64))
+    assert [len(chunk) for chunk in chunks] == [64, 64, 64, 58]
+    assert chunks[0].attrs['units'] == whole.attrs['units']
+    pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), whole,
+                                  check_dtype=False)
+    assert whole['n_H (cm^-3)'].iloc[0] == 1000.0
+    assert np.isnan(whole['B_Z (muG)'].iloc[9])
+
+
+@pytest.mark.parametrize('extension', ['.csv', '.parquet', '.feather'])
+def test_chunks_are_written_as_they_are_yielded(crutcher_file, tmp_path, extension):
+    if extension != '.csv':
+        pytest.importorskip('pyarrow')
+    save_path = str(tmp_path / f'crutcher{extension}')
+    chunks = list(iter_crutcher2010(file_path=crutcher_file, save_path=save_path,
+                                    chunksize=100))
+    reader = {'.csv': pd.read_csv, '.parquet': pd.read_parquet,
+              '.feather': pd.read_feather}[extension]
+    written = reader(save_path)
+    expected = pd.concat(chunks, ignore_index=True)
+    assert len(written) == N_ROWS
+    np.testing.assert_array_equal(written['B_Z (muG)'], expected['B_Z (muG)'])
+    assert written['Name'].tolist() == expected['Name'].tolist()
+
+
+def test_writer_takes_all_missing_first_chunk_as_text(tmp_path):
+    pytest.importorskip('pyarrow')
+    save_path = str(tmp_path / 'table.parquet')
+    with TableWriter(save_path) as writer:
+        writer.write(pd.DataFrame({'x': [1.0], 'note': [None]}))
+        writer.write(pd.DataFrame({'x': [2.0], 'note': ['flagged']}))
+    assert writer.rows == 2
+    assert pd.read_parquet(save_path)['note'].tolist()[1] == 'flagged'
+
+
+def test_empty_table_writes_empty_csv(tmp_path):
+    save_path = tmp_path / 'empty.csv'
+    assert list(write_chunks(iter([]), str(save_path))) == []
+    assert save_path.exists()
+
+
+def test_split_frame():
+    df = pd.DataFrame({'x': range(5)})
+    parts = list(split_frame(df, 2))
+    assert [len(part) for part in parts] == [2, 2, 1]
+    assert parts[2].index.tolist() == [4]
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""
+test_compact.py
+-----------
+
+Memory-compact dtypes: lossless float32 downcasts and the memory report.
+"""
+
+import numpy as np
+import pandas as pd
+
+from maguniverse.service.get import getters
+from maguniverse.utils.compact import compact_frame
+
+
+def _table(n_rows=2000, seed=3):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'Name': [f"Src-{k}" for k in range(n_rows)],
+        'Inst': pd.Series(rng.choice(['JCMT', 'SMA', 'CSO'], n_rows), dtype=object),
+        # catalog values with at most 4 significant digits
+        'B': np.round(rng.uniform(1, 999, n_rows), 1),
+        'n': np.round(10.0 ** rng.uniform(2, 7, n_rows), -1),
+        # full double precision must be kept
+        'ra': rng.uniform(0, 360, n_rows),
+        'count': rng.integers(0, 100, n_rows),
+    })
+
+
+def test_float32_round_trip_keeps_published_digits():
+    df = _table()
+    df.loc[5, 'B'] = np.nan
+    out = compact_frame(df)
+    assert out['B'].dtype == np.float32 and out['ra'].dtype == np.float64
+    for name in ('B', 'n'):
+        restored = out[name].astype(np.float64)
+        assert [f"{v:.6g}" for v in restored] == [f"{v:.6g}" for v in df[name]]
+    np.testing.assert_array_equal(out['ra'], df['ra'])
+
+
+def test_text_and_integer_columns():
+    out = compact_frame(_table())
+    assert isinstance(out['Inst'].dtype, pd.CategoricalDtype)
+    assert not isinstance(out['Name'].dtype, pd.CategoricalDtype)
+    assert out['Name'].tolist() == _table()['Name'].tolist()
+    assert out['count'].dtype == np.int8
+
+
+def test_no_downcast_and_attrs():
+    df = _table()
+    df.attrs['units'] = {'B': 'μG'}
+    out = compact_frame(df, downcast=False)
+    assert out['B'].dtype == np.float64 and out['count'].dtype == df['count'].dtype
+    assert out.attrs['units'] == {'B': 'μG'}
+    assert out.attrs['memory_usage']['after'] < out.attrs['memory_usage']['before']
+
+
+def test_memory_report():
+    plain = _table()
+    compacted = compact_frame(plain)
+    report = getters.memory_report({'plain': plain, 'compact': compacted})
+    assert report.loc['plain', 'bytes_before'] == report.loc['plain', 'bytes']
+    assert report.loc['compact', 'bytes'] < report.loc['compact', 'bytes_before']
+    assert report.loc['total', 'rows'] == 2 * len(plain)
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""
+test_converters.py
+-----------
+
+Publisher notations, typed CSV reads and canonical units, including the
+units attached to the Liu et al. (2022) table.
+"""
+
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from maguniverse.data.processed import get_liu2022
+from maguniverse.utils.converters import (attach_units, canonical_unit, coerce_float,
+                                          normalize_sci_notation, read_csv_typed)
+
+SEPARATOR = '-' * 80
+# (label, first byte, last byte, format, units) of the Liu et al. (2022) table
+LIU_COLUMNS = [
+    ('Name', 1, 17, 'A17', '---'), ('Inst', 19, 24, 'A6', '---'),
+    ('Method', 26, 30, 'A5', '---'), ('r', 32, 37, 'F6.3', 'pc'),
+    ('M', 39, 47, 'F9.2', 'solMass'), ('nH2', 49, 53, 'E5.1', 'cm-3'),
+    ('NH2', 55, 60, 'E6.1', 'cm-2'), ('deltavlos', 62, 65, 'F4.2', 'km/s'),
+    ('deltaphi', 67, 70, 'F4.1', 'deg'), ('Ratio', 72, 74, 'F3.1', '---'),
+    ('Nadf', 76, 79, 'F4.1', '---'), ('deltaadf', 81, 85, 'F5.1', 'mpc'),
+    ('Bu,ref', 87, 91, 'I5', 'ugauss'), ('Bu,est', 93, 97, 'I5', 'ugauss'),
+    ('Btot,est', 99, 103, 'I5', 'ugauss'), ('alphaB', 105, 109, 'F5.2', '---'),
+    ('BibCode', 111, 129, 'A19', '---'),
+]
+LIU_ROWS = [
+    ['SMM-NW', 'JCMT', 'DCF', '1.190', '54422.38', '4.E+04', '6.E+22', '3.13', '3.9',
+     '---', '25.7', '234.1', '7705', '', '7805', '3.57', '2019ApJ...000..000A'],
+    ['CB26', 'SMA', 'DCF', '0.010', '', '', '', '0.50', '10.2', '0.5', '', '',
+     '120', '95', '150', '', '2009ApJ...707..921Z'],
+]
+
+
+def _liu_lines():
+    lines = []
+    for values in LIU_ROWS:
+        line = ''
+        for (_, first, last, fmt, _), value in zip(LIU_COLUMNS, values):
+            width = last - first + 1
+            field = value.ljust(width) if fmt[0] == 'A' else value.rjust(width)
+            line = line.ljust(first - 1) + field
+        lines.append(line)
+    return lines
+
+
+def _liu_header():
+    rows = [f"{first:4d}-{last:3d} {fmt:<6} {units:<7} {label:<9} ? Value"
+            for label, first, last, fmt, units in LIU_COLUMNS]
+    return ['Title: DCF compilation', 'Byte-by-byte Description of file: table1.txt',
+            SEPARATOR, '   Bytes Format Units   Label     Explanations', SEPARATOR,
+            *rows, SEPARATOR]
+
+
+def test_sci_notation_on_bytes_and_text():
+    assert normalize_sci_notation(b'3 x 10^4, 2.5\xc3\x9710^-2, 10^3') == b'3e4, 2.5e-2, 1e3'
+    values = coerce_float(['3 x 10^4', '2.5', '---', 'abc'])
+    np.testing.assert_array_equal(values.to_numpy(), [3e4, 2.5, np.nan, np.nan])
+
+
+def test_read_csv_typed_falls_back_to_coercion():
+    df = read_csv_typed(io.StringIO('a,b\n1,2 x 10^3\n---,4\n'), {'a': 'float64', 'b': 'float64'})
+    assert df['a'].dtype == 'float64' and np.isnan(df['a'].iloc[1])
+    assert df['b'].tolist() == [2000.0, 4.0]
+
+
+def test_canonical_units():
+    assert canonical_unit(' muG ') == 'μG'
+    assert canonical_unit('cm-3') == 'cm^-3'
+    assert canonical_unit('solMass') == 'solMass'
+    assert canonical_unit(None) is None
+    df = attach_units(pd.DataFrame({'B': [1.0]}), {'B': 'uGauss', 'missing': 'pc'})
+    assert df.attrs['units'] == {'B': 'μG'}
+
+
+@pytest.mark.parametrize('with_header', [False, True])
+def test_liu2022_units(tmp_path, with_header):
+    path = tmp_path / 'liu2022.txt'
+    lines = (_liu_header() if with_header else []) + _liu_lines()
+    path.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+    df = get_liu2022(file_path=str(path))
+    assert df['Name'].tolist() == ['SMM-NW', 'CB26']
+    assert df['Bu_est'].isna().tolist() == [True, False]
+    assert df.attrs['units'] == {
+        'r': 'pc', 'M': 'solMass', 'nH2': 'cm^-3', 'NH2': 'cm^-2',
+        'deltavlos': 'km/s', 'deltaphi': 'deg', 'deltaadf': 'mpc',
+        'Bu_ref': 'μG', 'Bu_est': 'μG', 'Btot_est': 'μG'}
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+"""
+test_coordinates.py
+-----------
+
+Sexagesimal decoding against the per-value reference loop.
+"""
+
+import numpy as np
+import pytest
+
+from maguniverse.utils.coordinates import (hms_to_deg, dms_to_deg, parse_sexagesimal,
+                                           equatorial_to_galactic, deproject_offsets,
+                                           _parse_sexagesimal_loop)
+
+
+def test_formats():
+    values = ['05:35:17.1', '-05 22 31', '16h26m26.39s', '-24°24′30″', '−00 30 00',
+              '12 30', '7']
+    expected = [5 + 35 / 60 + 17.1 / 3600, -(5 + 22 / 60 + 31 / 3600),
+                16 + 26 / 60 + 26.39 / 3600, -(24 + 24 / 60 + 30 / 3600), -0.5, 12.5, 7.0]
+    np.testing.assert_allclose(parse_sexagesimal(values), expected, rtol=1e-12)
+    np.testing.assert_allclose(parse_sexagesimal(values[:1], hours=True), [15 * expected[0]])
+
+
+def test_matches_reference_loop():
+    rng = np.random.default_rng(0)
+    values = [f"{'-' if s else ''}{d:02d}:{m:02d}:{x:05.2f}"
+              for s, d, m, x in zip(rng.random(500) < 0.5, rng.integers(0, 90, 500),
+                                    rng.integers(0, 60, 500), rng.uniform(0, 60, 500))]
+    np.testing.assert_allclose(parse_sexagesimal(values), _parse_sexagesimal_loop(values),
+                               rtol=1e-12)
+
+
+def test_invalid_values_give_nan():
+    values = [None, '', '---', '...', 'J2000', '05:61:00', '05:30:75', '25 00 00',
+              '361 00 00', '12:30:00']
+    result = parse_sexagesimal(values, hours=False)
+    assert np.isnan(result[:7]).all()
+    assert result[7] == pytest.approx(25.0)
+    assert np.isnan(result[8])
+    assert result[9] == pytest.approx(12.5)
+    hours = parse_sexagesimal(['24:00:01', '24:00:00', '23:59:60.00'], hours=True)
+    assert np.isnan(hours[0])
+    np.testing.assert_allclose(hours[1:], [360.0, 360.0])
+
+
+def test_split_components():
+    np.testing.assert_allclose(hms_to_deg([5, None], [30, 0], [0, 0]), [82.5, np.nan])
+    np.testing.assert_allclose(dms_to_deg(['-', '+', None], [0, 10, 10], [30, 0, 0], [0, 0, 36]),
+                               [-0.5, 10.0, 10.01])
+
+
+def test_galactic_reference_points():
+    # Galactic centre and north Galactic pole (ICRS)
+    l, b = equatorial_to_galactic([266.40499, 192.85948], [-28.93617, 27.12825])
+    assert l[0] == pytest.approx(0.0, abs=1e-3) or l[0] == pytest.approx(360.0, abs=1e-3)
+    assert b[0] == pytest.approx(0.0, abs=1e-3)
+    assert b[1] == pytest.approx(90.0, abs=1e-3)
+
+
+def test_deproject_offsets_small_angles():
+    ra, dec = deproject_offsets(83.8, -5.4, [36.0, 0.0], [0.0, 36.0])
+    assert ra[0] == pytest.approx(83.8 + 0.01 / np.cos(np.radians(5.4)), rel=1e-7)
+    assert dec[0] == pytest.approx(-5.4, abs=1e-7)
+    assert dec[1] == pytest.approx(-5.39, abs=1e-7)
@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+"""
+test_crossmatch.py
+-----------
+
+Positional cross-matching against brute-force great-circle separations.
+"""
+
+import importlib
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from maguniverse.utils.crossmatch import crossmatch
+
+# the module, which `maguniverse.utils` shadows with the function
+cm = importlib.import_module('maguniverse.utils.crossmatch')
+
+
+def separation_arcsec(ra1, dec1, ra2, dec2):
+    """Great-circle separations of every pair (haversine), shape (n1, n2)."""
+    ra1, dec1, ra2, dec2 = (np.radians(np.asarray(v, dtype=np.float64))
+                            for v in (ra1, dec1, ra2, dec2))
+    d_ra = ra1[:, None] - ra2[None, :]
+    d_dec = dec1[:, None] - dec2[None, :]
+    h = np.sin(d_dec / 2) ** 2 + np.cos(dec1)[:, None] * np.cos(dec2)[None, :] \
+        * np.sin(d_ra / 2) ** 2
+    return np.degrees(2 * np.arcsin(np.sqrt(np.minimum(h, 1.0)))) * 3600.0
+
+
+def catalog(rng, n, labels):
+    # a field across RA = 0 and a field near the pole
+    ra = np.where(rng.random(n) < 0.5, rng.uniform(-0.05, 0.05, n) % 360.0,
+                  rng.uniform(0.0, 360.0, n))
+    dec = np.where(ra < 1.0, rng.uniform(-0.05, 0.05, n), rng.uniform(89.9, 90.0, n))
+    df = pd.DataFrame({'ra_deg': ra, 'dec_deg': dec}, index=labels)
+    df.iloc[2] = np.nan
+    return df
+
+
+@pytest.fixture(params=['tree', 'zones'])
+def index_kind(request, monkeypatch):
+    if request.param == 'tree':
+        pytest.importorskip('scipy.spatial')
+    else:
+        monkeypatch.setattr(cm, '_HAS_SCIPY', False)
+    return request.param
+
+
+@pytest.fixture
+def catalogs():
+    rng = np.random.default_rng(5)
+    left = catalog(rng, 300, [f"a{i}" for i in range(300)])
+    right = catalog(rng, 400, np.arange(1000, 1400))
+    return left, right
+
+
+def test_radius_matches_brute_force(catalogs, index_kind):
+    left, right = catalogs
+    radius = 40.0
+    pairs = crossmatch(left, right, radius_arcsec=radius, nearest=False)
+    separation = separation_arcsec(left['ra_deg'], left['dec_deg'],
+                                   right['ra_deg'], right['dec_deg'])
+    i, j = np.nonzero(separation <= radius)
+    expected = pd.DataFrame({'left': left.index[i], 'right': right.index[j],
+                             'sep_arcsec': separation[i, j]})
+    found = pairs.sort_values(['left', 'right']).reset_index(drop=True)
+    expected = expected.sort_values(['left', 'right']).reset_index(drop=True)
+    assert len(found) > 100
+    pd.testing.assert_frame_equal(found, expected, check_dtype=False, rtol=0, atol=1e-6)
+
+
+@pytest.mark.parametrize('radius', [None, 25.0])
+def test_nearest_matches_brute_force(catalogs, index_kind, radius):
+    left, right = catalogs
+    pairs = crossmatch(left, right, radius_arcsec=radius).set_index('left')
+    separation = separation_arcsec(left['ra_deg'], left['dec_deg'],
+                                   right['ra_deg'], right['dec_deg'])
+    separation[np.isnan(separation)] = np.inf
+    for row, label in enumerate(left.index):
+        best = np.argmin(separation[row])
+        if not np.isfinite(separation[row, best]) or \
+                (radius is not None and separation[row, best] > radius):
+            assert label not in pairs.index
+            continue
+        assert pairs.loc[label, 'right'] == right.index[best]
+        assert pairs.loc[label, 'sep_arcsec'] == pytest.approx(separation[row, best],
+                                                               abs=1e-6)
+
+
+def test_radius_is_required_for_all_pairs(catalogs):
+    with pytest.raises(ValueError):
+        crossmatch(*catalogs, nearest=False)
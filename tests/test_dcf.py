@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+"""
+test_dcf.py
+-----------
+
+DCF estimates against the closed-form expressions, and the Monte Carlo
+percentiles against direct sampling.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from maguniverse.analysis.dcf import (dcf_inputs, dcf_field, dcf_table, dcf_monte_carlo,
+                                      default_scatter)
+
+M_H = 1.6735575e-24
+MU = 2.8
+
+
+def reference_field(n_h2, sigma_v, delta_phi, ratio, variant, q=0.5):
+    """Field strength (μG) written out in cgs units, one row at a time."""
+    rho = MU * M_H * n_h2
+    sigma = sigma_v * 1e5
+    phi = np.radians(delta_phi)
+    if variant == 'classical':
+        b = q * np.sqrt(4 * np.pi * rho) * sigma / phi
+    elif variant == 'falceta':
+        b = q * np.sqrt(4 * np.pi * rho) * sigma / np.tan(phi)
+    elif variant == 'skalidis':
+        b = np.sqrt(2 * np.pi * rho) * sigma / np.sqrt(phi)
+    else:
+        b = np.sqrt(4 * np.pi * rho) * sigma / ratio
+    return b * 1e6
+
+
+@pytest.fixture
+def table():
+    return pd.DataFrame({
+        'nH2': [1e4, 3.2e5, 2e3, np.nan, -1.0, 5e6],
+        'deltavlos': [1.0, 0.45, 2.3, 1.0, 1.0, 0.8],
+        'deltaphi': [10.0, 27.5, 4.0, 10.0, 10.0, np.nan],
+        'Ratio': [0.3, np.nan, 1.2, 0.3, 0.3, 0.5],
+    })
+
+
+@pytest.mark.parametrize('variant', ['classical', 'falceta', 'skalidis', 'adf'])
+def test_point_values(table, variant):
+    result = dcf_table(table, variants=[variant])[f"B_{variant}"].to_numpy()
+    for row in (0, 2):
+        expected = reference_field(*table.iloc[row].to_numpy(), variant=variant)
+        assert result[row] == pytest.approx(expected, rel=1e-12)
+
+
+def test_missing_inputs_only_affect_their_variants(table):
+    result = dcf_table(table)
+    # missing or non-positive density: every variant
+    assert result.iloc[3].isna().all()
+    assert result.iloc[4].isna().all()
+    # missing Ratio: the ADF form only
+    assert np.isnan(result.loc[1, 'B_adf'])
+    assert result.loc[1, ['B_classical', 'B_falceta', 'B_skalidis']].notna().all()
+    # missing angular dispersion: all but the ADF form
+    assert result.loc[5, ['B_classical', 'B_falceta', 'B_skalidis']].isna().all()
+    assert np.isfinite(result.loc[5, 'B_adf'])
+
+
+def test_nullable_columns_and_custom_names():
+    df = pd.DataFrame({
+        'n': pd.array([1e4, None], dtype='Float64'),
+        'v': pd.array([1.0, 1.0], dtype='Float64'),
+        'phi': pd.array([10.0, 10.0], dtype='Float64'),
+    })
+    result = dcf_table(df, variants=['classical'],
+                       columns={'n_h2': 'n', 'sigma_v': 'v', 'delta_phi': 'phi'})
+    assert result['B_classical'].iloc[0] == pytest.approx(
+        reference_field(1e4, 1.0, 10.0, np.nan, 'classical'))
+    assert np.isnan(result['B_classical'].iloc[1])
+
+
+def test_field_of_arrays_broadcasts():
+    b = dcf_field(np.array([[1e4], [1e5]]), 1.0, [5.0, 10.0, 20.0], variant='skalidis', q=1.0)
+    assert b.shape == (2, 3)
+    assert b[1, 2] == pytest.approx(reference_field(1e5, 1.0, 20.0, np.nan, 'skalidis'))
+
+
+def test_falceta_past_right_angle_is_finite():
+    assert dcf_field(1e4, 1.0, 120.0, variant='falceta') < 1e-3
+
+
+def test_unknown_variant():
+    with pytest.raises(ValueError):
+        dcf_table(pd.DataFrame({'nH2': [1.0]}), variants=['davis'])
+
+
+@pytest.mark.parametrize('variant', ['classical', 'falceta', 'adf'])
+def test_monte_carlo_matches_direct_sampling(table, variant):
+    n_samples = 20000
+    mc = dcf_monte_carlo(table, n_samples=n_samples, variants=[variant], seed=3)
+    # the engine shares one block of draws between rows, in input order
+    draws = np.random.default_rng(3).standard_normal((len(dcf_inputs), n_samples),
+                                                     dtype=np.float32)
+    scale = np.array([default_scatter[name] for name in dcf_inputs])[:, None]
+    for row in (0, 2):
+        x = table.iloc[row].to_numpy()[:, None] * np.exp(scale * draws)
+        expected = np.percentile(dcf_field(*x, variant=variant), [16, 50, 84])
+        found = mc.iloc[row][[f"B_{variant}_p16", f"B_{variant}_p50",
+                              f"B_{variant}_p84"]].to_numpy(dtype=np.float64)
+        np.testing.assert_allclose(found, expected, rtol=1e-3)
+
+
+def test_monte_carlo_nan_rows_and_zero_scatter(table):
+    mc = dcf_monte_carlo(table, n_samples=500, variants=['classical'],
+                         scatter={name: 0.0 for name in dcf_inputs})
+    point = dcf_table(table, variants=['classical'])['B_classical']
+    for column in ('B_classical', 'B_classical_p16', 'B_classical_p84'):
+        np.testing.assert_allclose(mc[column], point, rtol=1e-5)
+    assert mc.iloc[3].isna().all()
+
+
+def test_monte_carlo_is_seeded(table):
+    first = dcf_monte_carlo(table, n_samples=1000, seed=7)
+    pd.testing.assert_frame_equal(first, dcf_monte_carlo(table, n_samples=1000, seed=7))
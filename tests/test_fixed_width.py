@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+"""
+test_fixed_width.py
+-----------
+
+`FixedWidthSchema` against `pandas.read_fwf` on a synthetic fixture.
+"""
+
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from maguniverse.utils import fixed_width
+from maguniverse.utils.fixed_width import FixedWidthSchema
+
+NAMES = ['Name', 'Ra', 'Flux', 'Count', 'Ref']
+COLSPECS = [(0, 10), (11, 18), (19, 27), (28, 32), (33, 45)]
+DTYPES = ['str', 'float', 'float', 'int', 'str']
+
+
+def _fixture(n_rows=500, seed=1, accents=False):
+    rng = np.random.default_rng(seed)
+    lines = []
+    for k in range(n_rows):
+        name = f"Src-{k}" if k % 7 else ''
+        ra = f"{rng.uniform(0, 360):7.3f}" if k % 5 else '    ---'
+        flux = f"{rng.uniform(-1, 1) * 10.0 ** rng.integers(-5, 5):8.1E}"
+        count = f"{rng.integers(0, 9999):4d}" if k % 3 else '    '
+        ref = 'Ångström' if accents and k % 11 == 0 else f"2019ApJ{k:05d}"
+        lines.append(f"{name:<10} {ra:>7} {flux:>8} {count:>4} {ref:<12}")
+    return '\n'.join(lines) + '\n'
+
+
+def _read_fwf(text):
+    df = pd.read_fwf(io.StringIO(text), colspecs=COLSPECS, names=NAMES, header=None,
+                     na_values=['---', '...'])
+    df['Count'] = df['Count'].astype('Int64')
+    return df
+
+
+@pytest.fixture
+def schema():
+    return FixedWidthSchema(NAMES, COLSPECS, DTYPES)
+
+
+@pytest.mark.parametrize('accents', [False, True])
+@pytest.mark.parametrize('arrow', [True, False])
+def test_decode_matches_read_fwf(schema, monkeypatch, arrow, accents):
+    if not arrow:
+        monkeypatch.setattr(fixed_width, '_HAS_ARROW', False)
+        monkeypatch.setattr(fixed_width, '_ARROW_TEXT', False)
+    text = _fixture(accents=accents)
+    decoded = schema.decode(text)
+    assert decoded['Count'].dtype == 'Int64'
+    pd.testing.assert_frame_equal(decoded, _read_fwf(text), check_dtype=False)
+
+
+def test_uniform_lines_are_viewed_without_copy():
+    body = _fixture(20).encode('utf-8')
+    matrix = fixed_width._uniform_matrix(body, 45)
+    assert matrix.shape == (20, 45)
+    assert np.shares_memory(matrix, np.frombuffer(body, dtype=np.uint8))
+
+
+def test_irregular_lines_match_read_fwf(schema):
+    lines = _fixture(50).splitlines()
+    lines[3] = lines[3].rstrip()          # short line
+    lines.insert(10, '')                  # empty line
+    lines.insert(20, ' ' * len(lines[0]))  # line of blanks
+    text = '\r\n'.join(lines)
+    expected = _read_fwf('\n'.join(line for line in lines if line.strip()))
+    pd.testing.assert_frame_equal(schema.decode(text), expected, check_dtype=False)
+
+
+def test_crlf_and_skiprows(schema, tmp_path):
+    text = _fixture(40)
+    path = tmp_path / 'table.txt'
+    path.write_bytes(('header line\r\n' + text.replace('\n', '\r\n')).encode('utf-8'))
+    pd.testing.assert_frame_equal(schema.decode_file(str(path), skiprows=1),
+                                  schema.decode(text))
+
+
+def test_chunks_concatenate_to_whole_table(schema, tmp_path):
+    path = tmp_path / 'table.txt'
+    path.write_text(_fixture(), encoding='utf-8')
+    chunks = list(schema.iter_decode_file(str(path), chunksize=64))
+    assert len(chunks) == 8
+    pd.testing.assert_frame_equal(pd.concat(chunks), schema.decode_file(str(path)))
+
+
+def test_markers_and_malformed_fields():
+    schema = FixedWidthSchema(['x', 'y'], [(0, 9), (10, 15)], ['float', 'float'],
+                              column_na={'y': ('-99',)})
+    rows = [('1.5', '-99'), ('2 x 10^3', '4.5'), ('abc', '...')]
+    decoded = schema.decode(''.join(f"{x:>9} {y:>5}\n" for x, y in rows))
+    assert decoded['x'].tolist()[:2] == [1.5, 2000.0]
+    assert np.isnan(decoded['x'].iloc[2])
+    assert np.isnan(decoded['y'].iloc[0]) and decoded['y'].iloc[1] == 4.5
+
+
+def test_schema_validation():
+    with pytest.raises(ValueError, match='same length'):
+        FixedWidthSchema(['a'], [(0, 1), (1, 2)], ['str'])
+    with pytest.raises(ValueError, match='Unknown dtypes'):
+        FixedWidthSchema(['a'], [(0, 1)], ['date'])
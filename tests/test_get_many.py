@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""
+test_get_many.py
+-----------
+
+Concurrent batch fetches of preset tables.
+"""
+
+import threading
+
+import pandas as pd
+import pytest
+
+from maguniverse.service.get import getters
+
+
+@pytest.fixture
+def service(tmp_path):
+    return getters(datafile_path=str(tmp_path))
+
+
+def _table(name):
+    return lambda: pd.DataFrame({'name': [name]})
+
+
+def test_tables_are_fetched_concurrently(service, monkeypatch):
+    barrier = threading.Barrier(2, timeout=5)
+
+    def waiting(name):
+        def fetch():
+            barrier.wait()  # only returns once both fetches are running
+            return pd.DataFrame({'name': [name]})
+        return fetch
+
+    for name in ('dotson2010_t2', 'liu2022_t1'):
+        monkeypatch.setattr(service, name, waiting(name))
+
+    tables, errors = service.get_many(['dotson2010_t2', 'liu2022_t1'], max_workers=2)
+    assert errors == {}
+    assert tables['liu2022_t1']['name'].iloc[0] == 'liu2022_t1'
+
+
+def test_failures_do_not_abort_the_batch(service, monkeypatch):
+    def captcha_exit():
+        raise SystemExit("Request aborted due to human-verification requirement.")
+
+    def broken():
+        raise OSError("connection reset")
+
+    monkeypatch.setattr(service, 'dotson2010_t2', _table('dotson2010_t2'))
+    monkeypatch.setattr(service, 'harris2018_t2', captcha_exit)
+    monkeypatch.setattr(service, 'liu2022_t1', broken)
+
+    for workers in (1, 3):
+        tables, errors = service.get_many(['dotson2010_t2', 'harris2018_t2', 'liu2022_t1'],
+                                          max_workers=workers)
+        assert list(tables) == ['dotson2010_t2']
+        assert isinstance(errors['harris2018_t2'], SystemExit)
+        assert isinstance(errors['liu2022_t1'], OSError)
+
+
+def test_fetch_all_covers_every_preset(service, monkeypatch):
+    for name in service.preset_tables:
+        monkeypatch.setattr(service, name, _table(name))
+    tables, errors = service.fetch_all(max_workers=2)
+    assert sorted(tables) == sorted(service.preset_tables)
+    assert errors == {}
+
+
+def test_unknown_names_are_rejected(service):
+    with pytest.raises(ValueError, match='Unknown preset tables'):
+        service.get_many(['dotson2010_t2', 'configure_proxies'])
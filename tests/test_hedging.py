@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""
+test_hedging.py
+-----------
+
+Hedged proxy racing: the first valid response wins.
+"""
+
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+from maguniverse.service.get import getters
+
+URL = 'https://example.org/table2.txt'
+SOURCE = {'data_link': {'t2': URL}}
+SLOW, FAST = 'https://slow.test/?u=', 'https://fast.test/?u='
+BROKEN, DEAD = 'https://broken.test/?u=', 'https://dead.test/?u='
+
+
+@pytest.fixture
+def service(tmp_path):
+    service = getters(datafile_path=str(tmp_path))
+    service.configure_proxies([SLOW, FAST, BROKEN])
+    return service
+
+
+def _fetcher(delays, calls):
+    """Fake data getter whose latency (or failure) depends on the proxy prefix."""
+    lock = threading.Lock()
+
+    def fetch(file_url, save_path=None):
+        proxy = file_url[:-len(URL)]
+        with lock:
+            calls.append((proxy, save_path))
+        delay = delays[proxy]
+        if delay is None:
+            raise OSError(f"{proxy} unreachable")
+        time.sleep(delay)
+        return pd.DataFrame({'proxy': [proxy]})
+    return fetch
+
+
+def test_fast_hedge_beats_slow_first_option(service, tmp_path):
+    service.configure_hedging(0.05)
+    calls = []
+    save_path = str(tmp_path / 'table2.csv')
+    fetch = _fetcher({SLOW: 2.0, FAST: 0.01, BROKEN: None}, calls)
+
+    start = time.time()
+    result = service._try_with_proxy_fallback(fetch, SOURCE, 't2', save_path=save_path)
+    assert time.time() - start < 1.0
+    assert result['proxy'].iloc[0] == FAST
+    # attempts never write the table; the winner is written exactly once
+    assert all(path is None for _, path in calls)
+    assert pd.read_csv(save_path)['proxy'].tolist() == [FAST]
+
+
+def test_failure_starts_next_option_without_waiting(service):
+    service.configure_hedging(5.0)
+    service.configure_proxies([BROKEN, FAST])
+    calls = []
+    fetch = _fetcher({FAST: 0.0, BROKEN: None}, calls)
+
+    start = time.time()
+    result = service._try_with_proxy_fallback(fetch, SOURCE, 't2')
+    assert time.time() - start < 1.0
+    assert result['proxy'].iloc[0] == FAST
+
+
+def test_all_options_failing_raises(service):
+    service.configure_hedging(0)
+    service.configure_proxies([BROKEN, DEAD])
+    fetch = _fetcher({BROKEN: None, DEAD: None}, [])
+    with pytest.raises(Exception, match='All 2 proxy options failed'):
+        service._try_with_proxy_fallback(fetch, SOURCE, 't2')
+
+
+def test_sequential_fallback_when_hedging_is_off(service):
+    calls = []
+    service.configure_proxies([BROKEN, FAST])
+    fetch = _fetcher({FAST: 0.0, BROKEN: None}, calls)
+    result = service._try_with_proxy_fallback(fetch, SOURCE, 't2')
+    assert result['proxy'].iloc[0] == FAST
+    assert [proxy for proxy, _ in calls] == [BROKEN, FAST]
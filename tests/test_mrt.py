@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+"""
+test_mrt.py
+-----------
+
+Table layouts derived from MRT byte-by-byte headers.
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from maguniverse.utils.mrt import parse_mrt_header, read_mrt_schema, read_mrt, iter_mrt
+
+SEPARATOR = '-' * 80
+HEADER = f"""Title: Submillimeter polarization of test regions
+Authors: Nobody A.
+Table: Polarization
+{'=' * 80}
+Byte-by-byte Description of file: table.txt
+{SEPARATOR}
+   Bytes Format Units   Label   Explanations
+{SEPARATOR}
+   1- 10 A10    ---     ID      Object/Region identification
+      12 A1     ---   f_ID      [bc] Flag on ID
+  14- 19 F6.1   arcsec  RAOff   ? Offset in Right Ascension
+  21- 25 F5.2   %       Pol     ?=-9.99 Polarization percentage
+  27- 29 I3     deg     theta   Position angle of the
+                                polarization vector
+{SEPARATOR}
+Note (1): Flags are explained in the text.
+{SEPARATOR}
+"""
+ROWS = [
+    'OMC-1      b  -12.5  3.10  45',
+    'W3            100.0 -9.99 170',
+    'L1527      c         0.55   5',
+]
+
+
+@pytest.fixture
+def mrt_file(tmp_path):
+    path = tmp_path / 'table.txt'
+    path.write_text(HEADER + '\n'.join(ROWS) + '\n', encoding='utf-8')
+    return str(path)
+
+
+def test_header_layout():
+    schema = parse_mrt_header(HEADER.splitlines())
+    assert schema.labels == ['ID', 'f_ID', 'RAOff', 'Pol', 'theta']
+    assert schema.colspecs == [(0, 10), (11, 12), (13, 19), (20, 25), (26, 29)]
+    assert schema.formats == ['A10', 'A1', 'F6.1', 'F5.2', 'I3']
+    assert schema.units['RAOff'] == 'arcsec'
+    assert schema.nullable == {'ID': False, 'f_ID': False, 'RAOff': True, 'Pol': True,
+                               'theta': False}
+    assert schema.null_values == {'Pol': '-9.99'}
+    assert schema.explanations['theta'] == 'Position angle of the polarization vector'
+    assert schema.data_start == len(HEADER.splitlines())
+
+
+def test_read_against_fixed_width_reader(mrt_file):
+    df = read_mrt(mrt_file)
+    assert df.attrs['units']['Pol'] == '%'
+    assert list(df['ID']) == ['OMC-1', 'W3', 'L1527']
+    np.testing.assert_allclose(df['RAOff'].to_numpy(dtype=float, na_value=np.nan),
+                               [-12.5, 100.0, np.nan])
+    # explicit null value
+    np.testing.assert_allclose(df['Pol'].to_numpy(dtype=float, na_value=np.nan),
+                               [3.10, np.nan, 0.55])
+    assert list(df['theta']) == [45, 170, 5]
+    expected = pd.read_fwf(mrt_file, colspecs=[(0, 10), (26, 29)], names=['ID', 'theta'],
+                           skiprows=len(HEADER.splitlines()))
+    assert list(expected['theta']) == list(df['theta'])
+
+
+def test_rename_and_chunks(mrt_file):
+    whole = read_mrt(mrt_file, rename={'RAOff': 'dx'})
+    assert 'dx' in whole and whole.attrs['units']['dx'] == 'arcsec'
+    chunks = list(iter_mrt(mrt_file, rename={'RAOff': 'dx'}, chunksize=2))
+    assert [len(chunk) for chunk in chunks] == [2, 1]
+    pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), whole,
+                                  check_dtype=False)
+
+
+def test_schema_is_cached_per_header(mrt_file, tmp_path):
+    other = tmp_path / 'copy.txt'
+    other.write_text(HEADER + ROWS[0] + '\n', encoding='utf-8')
+    assert read_mrt_schema(mrt_file) is read_mrt_schema(str(other))
+
+
+def test_missing_description(tmp_path):
+    path = tmp_path / 'plain.txt'
+    path.write_text('a b c\n1 2 3\n', encoding='utf-8')
+    with pytest.raises(ValueError):
+        read_mrt_schema(str(path))
+
+
+def test_headerless_file_fails_fast(tmp_path):
+    path = tmp_path / 'headerless.txt'
+    path.write_text('\n'.join(ROWS * 33334) + '\n', encoding='utf-8')
+    start = time.perf_counter()
+    with pytest.raises(ValueError, match='No MRT byte-by-byte description'):
+        read_mrt_schema(str(path))
+    assert time.perf_counter() - start < 0.5
+
+
+def test_header_split_by_notes_and_missing_data(tmp_path):
+    path = tmp_path / 'empty.txt'
+    path.write_text(HEADER, encoding='utf-8')
+    assert read_mrt_schema(str(path)).data_start == len(HEADER.splitlines())
+    # a note block that is never closed leaves the header incomplete
+    path.write_text(HEADER.rsplit(SEPARATOR, 1)[0], encoding='utf-8')
+    with pytest.raises(ValueError):
+        read_mrt_schema(str(path))
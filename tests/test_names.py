@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+"""
+test_names.py
+-----------
+
+Canonical source-name keys, aliases and name joins against a nested loop.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from maguniverse.utils.names import normalize_names, AliasTable, name_key, join_names
+
+
+def test_normalized_variants():
+    keys = normalize_names(['L1527', 'L 1527', 'Lynds 1527', 'IRAS_16293-2422',
+                            'IRAS 16293−2422', 'B059', 'Barnard 59', 'ＯＭＣ-1', None, '  '])
+    assert list(keys) == ['l1527', 'l1527', 'l1527', 'iras162932422', 'iras162932422',
+                          'b59', 'b59', 'omc1', None, None]
+
+
+def test_alias_chains_collapse(tmp_path):
+    path = str(tmp_path / 'aliases.json')
+    aliases = AliasTable(path)
+    aliases.add({'Orion KL': 'OMC-1'})
+    aliases.add({'OMC-1': 'Orion A'})
+    assert list(name_key(['Orion KL', 'OMC 1', 'Orion A', 'W3'], aliases)) == \
+        ['oriona', 'oriona', 'oriona', 'w3']
+    # persisted and reloaded
+    assert len(AliasTable(path)) == 2
+
+
+@pytest.mark.parametrize('how', ['inner', 'left'])
+def test_join_matches_nested_loop(how):
+    rng = np.random.default_rng(3)
+    spellings = ['L1527', 'L 1527', 'B059', 'Barnard 59', 'OMC-1', 'Orion KL', 'W3', None]
+    left = pd.DataFrame({'Name': rng.choice(spellings, 40)}, index=[f"l{i}" for i in range(40)])
+    right = pd.DataFrame({'Source': rng.choice(spellings[:-2] + ['NGC 1333'], 30)},
+                         index=np.arange(100, 130))
+    aliases = AliasTable()
+    aliases.add({'Orion KL': 'OMC-1'}, save=False)
+
+    pairs = join_names(left, right, left_on='Name', right_on='Source', how=how,
+                       aliases=aliases)
+
+    left_keys = name_key(left['Name'], aliases)
+    right_keys = name_key(right['Source'], aliases)
+    expected = []
+    for i, key in zip(left.index, left_keys):
+        matches = [j for j, other in zip(right.index, right_keys)
+                   if key is not None and key == other]
+        expected += [(i, j) for j in matches]
+        if how == 'left' and not matches:
+            expected.append((i, None))
+    found = [(i, None if pd.isna(j) else j) for i, j in zip(pairs['left'], pairs['right'])]
+    assert sorted(found, key=str) == sorted(expected, key=str)
+
+
+def test_invalid_join():
+    df = pd.DataFrame({'name_key': ['a']})
+    with pytest.raises(ValueError):
+        join_names(df, df, how='outer', aliases=AliasTable())
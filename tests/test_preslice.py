@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+"""
+test_preslice.py
+-----------
+
+Pre-sliced C-engine parsing against pandas' Python-engine ``skipfooter``.
+"""
+
+import pandas as pd
+import pytest
+
+from maguniverse.utils.preslice import preslice, stream_preslice
+
+HEADER = ['Table 1. Zeeman measurements', 'Source\tn_H\tB_Z', 'units', '----']
+BODY = ['L1544\t\t1.0e5\t10.8', 'B1\t2.0e4\t\t\t-27.4', 'OMC-1\t3e6\t-360', 'W3 OH\t1e7\t3.1']
+FOOTER = ['----', 'Notes: references in the text.']
+
+
+@pytest.fixture(params=['\n', '\r\n'])
+def table_file(tmp_path, request):
+    path = tmp_path / 'table.txt'
+    # no newline after the last footer line
+    path.write_bytes(request.param.join(HEADER + BODY + FOOTER).encode('utf-8'))
+    return str(path)
+
+
+def python_engine(path):
+    return pd.read_csv(path, sep=r'\t+', engine='python', header=None, skiprows=len(HEADER),
+                       skipfooter=2)
+
+
+def test_matches_python_engine(table_file):
+    expected = python_engine(table_file)
+    found = pd.read_csv(preslice(table_file, len(HEADER), 2, collapse_tabs=True), sep='\t',
+                        header=None, engine='c')
+    pd.testing.assert_frame_equal(found, expected)
+
+
+def test_stream_matches_python_engine(table_file):
+    expected = python_engine(table_file)
+    chunks = pd.read_csv(stream_preslice(table_file, len(HEADER), 2, collapse_tabs=True),
+                         sep='\t', header=None, engine='c', chunksize=3)
+    pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), expected)
+
+
+def test_transform_and_short_files(tmp_path):
+    path = tmp_path / 'short.txt'
+    path.write_bytes(b'head\n1 2\n3 4\nfoot\n')
+
+    def comma(body):
+        return body.replace(b' ', b',')
+
+    for reader in (preslice, stream_preslice):
+        body = reader(str(path), 1, 1, transform=comma).read()
+        assert body.splitlines() == [b'1,2', b'3,4']
+    assert preslice(str(path), 3, 3).read() == b''
+    assert stream_preslice(str(path), 3, 3).read() == b''
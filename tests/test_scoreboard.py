@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+"""
+test_scoreboard.py
+-----------
+
+Proxy scoreboard: ranking, decay, circuit breaker and persistence, and the
+preset getters listed in the manifest.
+"""
+
+import json
+from pathlib import Path
+
+import pytest
+
+import maguniverse
+from maguniverse.service import scoreboard as scoreboard_module
+from maguniverse.service.get import getters
+from maguniverse.service.scoreboard import ProxyScoreboard
+from maguniverse.utils.fetch_ascii import CaptchaRequired
+from maguniverse.utils.generate_manifest import parse_getters_class
+
+URL = 'https://example.org/table.txt'
+PROXIES = ['', 'https://a.test/?u=', 'https://b.test/?u=']
+
+
+class Clock():
+    """Controllable replacement of the `time` module used by the scoreboard."""
+
+    def __init__(self, now=1.0e9) -> None:
+        self.now = now
+        return
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(scoreboard_module, 'time', clock)
+    return clock
+
+
+def test_unseen_pairs_keep_configured_order():
+    board = ProxyScoreboard()
+    assert board.rank(PROXIES, URL) == list(enumerate(PROXIES))
+    assert board.stats('', URL)['success_rate'] == 0.5
+
+
+def test_fast_reliable_proxy_is_ranked_first(clock):
+    board = ProxyScoreboard()
+    for _ in range(3):
+        board.record('', URL, 5.0, 'failure')
+        board.record(PROXIES[2], URL, 0.2, 'success')
+    ranked = [proxy for _, proxy in board.rank(PROXIES, URL)]
+    assert ranked == [PROXIES[2], PROXIES[1], '']
+
+
+def test_counts_decay_with_half_life(clock):
+    board = ProxyScoreboard(half_life=100.0)
+    for _ in range(4):
+        board.record('', URL, 1.0, 'failure')
+    assert board.stats('', URL)['attempts'] == pytest.approx(4.0)
+
+    clock.now += 100.0
+    assert board.stats('', URL)['attempts'] == pytest.approx(2.0)
+    clock.now += 1.0e6
+    # an old failure streak drifts back to the neutral prior
+    assert board.stats('', URL)['success_rate'] == pytest.approx(0.5)
+
+
+def test_circuit_breaker_skips_pair_until_cooldown(clock):
+    board = ProxyScoreboard()
+    board.trip(PROXIES[1], URL, 60.0)
+    assert board.is_tripped(PROXIES[1], URL)
+    assert PROXIES[1] not in [proxy for _, proxy in board.rank(PROXIES, URL)]
+    # other hosts behind the same proxy are unaffected
+    assert not board.is_tripped(PROXIES[1], 'https://other.org/t.txt')
+
+    clock.now += 61.0
+    assert not board.is_tripped(PROXIES[1], URL)
+
+
+def test_statistics_persist(tmp_path):
+    store_path = str(tmp_path / 'proxy_scores.json')
+    ProxyScoreboard(store_path).record(PROXIES[1], URL, 0.5, 'captcha')
+    reloaded = ProxyScoreboard(store_path)
+    assert reloaded.stats(PROXIES[1], URL)['captcha_rate'] == 1.0
+    assert list(json.load(open(store_path))) == [f"{PROXIES[1]}|example.org"]
+
+
+def test_service_records_captcha_and_trips_breaker(tmp_path):
+    service = getters(datafile_path=str(tmp_path))
+    service.configure_proxies(PROXIES)
+
+    def fetch(file_url):
+        raise CaptchaRequired(file_url)
+
+    with pytest.raises(CaptchaRequired):
+        service._timed_attempt(fetch, PROXIES[1], URL, [])
+    assert service.proxy_stats(URL)[PROXIES[1]]['captcha_rate'] == 1.0
+    assert service.scoreboard.is_tripped(PROXIES[1], URL)
+
+
+def test_manifest_lists_only_preset_tables():
+    service_path = Path(maguniverse.__file__).parent / 'service' / 'get.py'
+    listed = parse_getters_class(service_path)
+    assert sorted(listed) == sorted(getters.preset_tables)
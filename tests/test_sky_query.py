@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+"""
+test_sky_query.py
+-----------
+
+Cone and box searches over synthetic catalogs, checked against a brute-force
+scan of every row.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from maguniverse.service.sky import SkyQuery
+from maguniverse.utils.names import add_name_key
+
+
+class OfflineFetcher():
+    """Stands in for `getters`: every catalog not passed in fails to load."""
+
+    def __getattr__(self, name):
+        def fetch():
+            raise OSError(f"{name} is offline")
+        return fetch
+
+
+def _catalog(n_rows, seed, prefix):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        'Name': [f"{prefix} {k}" for k in range(n_rows)],
+        'ra_deg': rng.uniform(0, 360, n_rows),
+        # uniform on the sphere
+        'dec_deg': np.degrees(np.arcsin(rng.uniform(-1, 1, n_rows))),
+        'P': rng.uniform(0, 20, n_rows),
+    })
+    return add_name_key(df, 'Name')
+
+
+def _separation(ra, dec, ra0, dec0):
+    ra, dec, ra0, dec0 = map(np.radians, (ra, dec, ra0, dec0))
+    cos_sep = np.sin(dec) * np.sin(dec0) + np.cos(dec) * np.cos(dec0) * np.cos(ra - ra0)
+    return np.degrees(np.arccos(np.clip(cos_sep, -1, 1)))
+
+
+@pytest.fixture(scope='module')
+def tables():
+    return {'harris2018_t2': _catalog(3000, 1, 'HRS'),
+            'matthews2009_t6': _catalog(2000, 2, 'MTW')}
+
+
+@pytest.fixture
+def query(tables):
+    return SkyQuery(tables=tables, fetcher=OfflineFetcher(),
+                    catalogs=['harris2018_t2', 'matthews2009_t6'])
+
+
+@pytest.mark.parametrize('centre', [(68.0, 26.0), (359.5, -3.0), (120.0, 88.5)])
+def test_cone_matches_brute_force(query, tables, centre):
+    result = query.cone(*centre, 5.0)
+    for name, df in tables.items():
+        sep = _separation(df['ra_deg'], df['dec_deg'], *centre)
+        hits = result[result['catalog'] == name]
+        assert sorted(hits['row']) == sorted(df.index[sep <= 5.0])
+        assert np.all(np.diff(hits['sep_deg']) >= 0)
+        np.testing.assert_allclose(hits['sep_deg'], sep[hits['row']], atol=1e-9)
+        assert (hits['located_by'] == 'table').all()
+    assert list(result.columns[:8]) == ['catalog', 'module', 'reference', 'doi', 'row',
+                                        'located_by', 'sep_deg', 'ra_deg']
+    assert {'Name', 'P'} <= set(result.columns)
+
+
+def test_box_wraps_through_ra_zero(query, tables):
+    result = query.box(350.0, 10.0, -20.0, 20.0, catalogs=['harris2018_t2'])
+    df = tables['harris2018_t2']
+    inside = ((df['ra_deg'] >= 350.0) | (df['ra_deg'] <= 10.0)) \
+        & df['dec_deg'].between(-20.0, 20.0)
+    assert list(result['row']) == list(df.index[inside])
+    assert set(result['catalog']) == {'harris2018_t2'}
+    assert 'sep_deg' not in result
+
+
+def test_empty_region_keeps_provenance_columns(query):
+    result = query.box(10.0, 10.0, 95.0, 99.0)
+    assert result.empty and list(result.columns[:6]) == ['catalog', 'module', 'reference',
+                                                         'doi', 'row', 'located_by']
+
+
+def test_catalogs_located_by_name(tables):
+    harris = tables['harris2018_t2']
+    crutcher = add_name_key(pd.DataFrame({
+        'Cloud': ['HRS 7', 'hrs-7', 'Nowhere 1'],
+        'Blos': [10.0, 12.0, 30.0],
+    }), 'Cloud')
+    query = SkyQuery(tables={**tables, 'crutcher2010_t1': crutcher},
+                     fetcher=OfflineFetcher(), catalogs=['crutcher2010_t1'])
+
+    located = query.located('crutcher2010_t1')
+    np.testing.assert_allclose(located.loc[0, ['ra_deg', 'dec_deg']].astype(float),
+                               harris.loc[7, ['ra_deg', 'dec_deg']].astype(float), atol=1e-9)
+    assert located.loc[1, 'ra_deg'] == located.loc[0, 'ra_deg']
+    assert np.isnan(located.loc[2, 'ra_deg'])
+
+    result = query.cone(harris.loc[7, 'ra_deg'], harris.loc[7, 'dec_deg'], 0.01)
+    assert list(result['row']) == [0, 1]
+    assert (result['located_by'] == 'name').all()
+    # positional catalogs that could not be fetched are left out, not fatal
+    assert isinstance(query.errors['dotson2010_t1'], OSError)
+
+
+def test_unavailable_and_unknown_catalogs(tables):
+    query = SkyQuery(tables=tables, fetcher=OfflineFetcher())
+    with pytest.raises(OSError, match='offline'):
+        query.located('jijina1999_t2')
+    with pytest.raises(ValueError):
+        SkyQuery(catalogs=['nope'])
+    with pytest.raises(ValueError):
+        query.cone(0.0, 0.0, 1.0, catalogs=['nope'])
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""
+test_stokes.py
+-----------
+
+Stokes conversion, debiasing and regridding against per-cell loops.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from maguniverse.analysis.stokes import debias_p, stokes_table, regrid_stokes
+
+
+@pytest.fixture
+def vectors():
+    rng = np.random.default_rng(21)
+    n = 300
+    df = pd.DataFrame({
+        'ID': rng.choice(['OMC-1', 'W3', 'DR21'], n),
+        'Δx': rng.uniform(-50, 50, n),
+        'Δy': rng.uniform(-50, 50, n),
+        'P': rng.uniform(0.5, 12.0, n),
+        'sigma(P)': rng.uniform(0.1, 2.0, n),
+        'theta': rng.uniform(0, 180, n),
+        'sigma(theta)': rng.uniform(1, 15, n),
+    })
+    df['name_key'] = df['ID'].str.lower().str.replace('-', '')
+    df.loc[[4, 40], 'P'] = np.nan
+    df.loc[8, 'sigma(P)'] = np.nan
+    df.loc[12, 'name_key'] = None
+    return df
+
+
+def test_debias_estimators():
+    p = np.array([0.5, 1.0, 2.0, 5.0, np.nan])
+    sigma = np.ones(5)
+    np.testing.assert_allclose(debias_p(p, sigma, 'wk'),
+                               [0.0, 0.0, np.sqrt(3.0), np.sqrt(24.0), np.nan])
+    expected = p - 0.5 * sigma ** 2 / p * (1 - np.exp(-p ** 2 / sigma ** 2))
+    np.testing.assert_allclose(debias_p(p, sigma), expected)
+    np.testing.assert_allclose(debias_p(p, sigma, 'none'), p)
+    with pytest.raises(ValueError):
+        debias_p(p, sigma, 'median')
+
+
+def test_stokes_round_trip(vectors):
+    table = stokes_table(vectors)
+    p = np.hypot(table['q'], table['u']) * 100.0
+    np.testing.assert_allclose(p, vectors['P'])
+    angle = np.degrees(0.5 * np.arctan2(table['u'], table['q'])) % 180.0
+    valid = vectors['P'].notna()
+    np.testing.assert_allclose(angle[valid], vectors['theta'][valid])
+
+
+@pytest.mark.parametrize('weight', ['inverse_variance', 'uniform'])
+def test_regrid_matches_cell_loop(vectors, weight):
+    cell = 20.0
+    grid = regrid_stokes(vectors, cell, weight=weight)
+    table = stokes_table(vectors).join(vectors[['name_key', 'Δx', 'Δy']])
+    # uniform weights keep vectors without errors
+    required = ['name_key', 'q', 'u'] + (['sigma_q', 'sigma_u'] if weight != 'uniform' else [])
+    table = table.dropna(subset=required)
+    assert grid['n'].sum() == len(table)
+    table['cx'] = (np.floor(table['Δx'] / cell) + 0.5) * cell
+    table['cy'] = (np.floor(table['Δy'] / cell) + 0.5) * cell
+    for (key, cx, cy), members in table.groupby(['name_key', 'cx', 'cy']):
+        row = grid[(grid['name_key'] == key) & np.isclose(grid['x'], cx)
+                   & np.isclose(grid['y'], cy)]
+        assert len(row) == 1 and row['n'].iloc[0] == len(members)
+        if weight == 'uniform':
+            q, u = members['q'].mean(), members['u'].mean()
+            sigma_q = np.sqrt(np.sum(members['sigma_q'].to_numpy() ** 2)) / len(members)
+        else:
+            w = 1.0 / members['sigma_q'] ** 2
+            q = (w * members['q']).sum() / w.sum()
+            u = (members['u'] / members['sigma_u'] ** 2).sum() \
+                / (1.0 / members['sigma_u'] ** 2).sum()
+            sigma_q = 1.0 / np.sqrt(w.sum())
+        assert row['q'].iloc[0] == pytest.approx(q, rel=1e-9)
+        assert row['u'].iloc[0] == pytest.approx(u, rel=1e-9)
+        assert row['sigma_q'].iloc[0] == pytest.approx(sigma_q, rel=1e-9, nan_ok=True)
+        assert row['p'].iloc[0] == pytest.approx(np.hypot(q, u), rel=1e-9)
+
+
+def test_invalid_arguments(vectors):
+    with pytest.raises(ValueError):
+        regrid_stokes(vectors, 0.0)
+    with pytest.raises(ValueError):
+        regrid_stokes(vectors, 10.0, weight='median')
+    with pytest.raises(ValueError):
+        stokes_table(vectors, catalog='unknown')
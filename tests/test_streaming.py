@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+"""
+test_streaming.py
+-----------
+
+Streamed downloads, charset handling and saved copies of `get_ascii`.
+"""
+
+import os
+import threading
+
+from maguniverse.utils import fetch_ascii
+from maguniverse.utils.cache import get_default_cache
+from maguniverse.utils.fetch_ascii import get_ascii
+
+from conftest import FakeResponse
+
+URL = 'https://example.org/angstrom.txt'
+TEXT = 'name  size\nÅngström  1.5\n' * 5000
+
+
+def test_stream_matches_in_memory_copy(raw_cache, fake_http, monkeypatch):
+    monkeypatch.setattr(fetch_ascii, '_STREAM_CHUNK_SIZE', 7)  # split multibyte characters
+    fake_http.routes[URL] = FakeResponse(TEXT.encode('utf-8'),
+                                         headers={'Content-Type': 'text/plain'})
+    path = get_ascii(file_url=URL, stream=True)
+    assert fake_http.calls[0]['stream']
+    assert open(path, encoding='utf-8').read() == TEXT
+    digest = get_default_cache().lookup(URL)['sha256']
+
+    get_default_cache().clear()
+    assert get_ascii(file_url=URL) == TEXT
+    assert get_default_cache().lookup(URL)['sha256'] == digest
+
+
+def test_text_without_charset_is_utf8(raw_cache, fake_http):
+    fake_http.routes[URL] = FakeResponse(TEXT.encode('utf-8'),
+                                         headers={'Content-Type': 'text/plain'})
+    assert fake_http.routes[URL].encoding == 'ISO-8859-1'
+    assert get_ascii(file_url=URL, use_cache=False) == TEXT
+
+
+def test_declared_charset_is_stored_as_utf8(raw_cache, fake_http):
+    fake_http.routes[URL] = FakeResponse(
+        TEXT.encode('latin-1'), headers={'Content-Type': 'text/plain; charset=ISO-8859-1'})
+    path = get_ascii(file_url=URL, stream=True)
+    with open(path, 'rb') as f:
+        assert f.read() == TEXT.encode('utf-8')
+
+
+def test_uncached_stream_goes_to_private_dir(fake_http, tmp_path):
+    fake_http.routes[URL] = FakeResponse(TEXT.encode('utf-8'))
+    path = get_ascii(file_url=URL, stream=True, use_cache=False)
+    assert os.path.dirname(path) == fetch_ascii._get_stream_dir()
+    assert get_ascii(file_url=URL, stream=True, use_cache=False) == path
+
+    save_path = str(tmp_path / 'table.txt')
+    assert get_ascii(file_url=URL, stream=True, use_cache=False,
+                     save_path=save_path) == save_path
+    assert open(save_path, encoding='utf-8').read() == TEXT
+
+
+def test_local_file_is_copied_to_save_path(tmp_path):
+    source = tmp_path / 'local.txt'
+    source.write_text(TEXT, encoding='utf-8')
+    save_path = tmp_path / 'copy.txt'
+    assert get_ascii(file_path=str(source), stream=True,
+                     save_path=str(save_path)) == str(source)
+    assert save_path.read_text(encoding='utf-8') == TEXT
+
+
+def test_concurrent_saves_do_not_clobber(tmp_path):
+    sources = []
+    for i in range(8):
+        source = tmp_path / f'source{i}.txt'
+        source.write_text(f'{i}\n' * 20000, encoding='utf-8')
+        sources.append(str(source))
+    save_path = str(tmp_path / 'out' / 'table.txt')
+    os.makedirs(os.path.dirname(save_path))
+    errors = []
+
+    def save(path):
+        try:
+            fetch_ascii._save_file(path, save_path, 'txt')
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=save, args=(path,)) for path in sources]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert os.listdir(os.path.dirname(save_path)) == ['table.txt']
+    lines = open(save_path, encoding='utf-8').read().splitlines()
+    assert len(lines) == 20000 and len(set(lines)) == 1
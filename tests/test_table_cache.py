@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+"""
+test_table_cache.py
+-----------
+
+Parsed-table cache: keys follow the raw content and the parser source.
+"""
+
+import importlib
+import sys
+
+import pandas as pd
+import pytest
+
+pytest.importorskip('pyarrow')
+
+from maguniverse.utils import table_cache
+from maguniverse.utils.table_cache import (TableCache, cached_parse, get_default_table_cache,
+                                           get_table_cache_stats)
+
+PARSER = '''
+import pandas as pd
+from maguniverse.utils.sky_tiles import sky_tiles
+
+
+def parse(src, scale=1):
+    df = pd.read_csv(src)
+    df['x'] = df['x'] * scale
+    df.attrs['units'] = {'x': 'pc'}
+    return df
+'''
+
+
+@pytest.fixture
+def parser_module(tmp_path, monkeypatch):
+    """Import a throwaway parser module; returns a function rewriting its source."""
+    monkeypatch.syspath_prepend(str(tmp_path))
+    path = tmp_path / 'throwaway_parser.py'
+    path.write_text(PARSER, encoding='utf-8')
+
+    def rewrite(source):
+        path.write_text(source, encoding='utf-8')
+        sys.modules.pop('throwaway_parser', None)
+        return importlib.import_module('throwaway_parser')
+
+    yield rewrite
+    sys.modules.pop('throwaway_parser', None)
+
+
+@pytest.fixture
+def raw_file(tmp_path):
+    path = tmp_path / 'table.csv'
+    path.write_text('x\n1\n2\n', encoding='utf-8')
+    return path
+
+
+def test_key_changes_with_parser_source(parser_module, raw_file, tmp_path):
+    module = parser_module(PARSER)
+    key = TableCache(str(tmp_path)).key(str(raw_file), module.parse)
+    assert TableCache(str(tmp_path)).key(str(raw_file), module.parse) == key
+
+    module = parser_module(PARSER.replace('* scale', '* scale * 1.0'))
+    assert TableCache(str(tmp_path)).key(str(raw_file), module.parse) != key
+
+
+def test_key_changes_with_content_and_arguments(parser_module, raw_file, tmp_path):
+    parse = parser_module(PARSER).parse
+    cache = TableCache(str(tmp_path))
+    key = cache.key(str(raw_file), parse)
+    assert cache.key(str(raw_file), parse, (2,)) != key
+    raw_file.write_text('x\n1\n3\n', encoding='utf-8')
+    assert cache.key(str(raw_file), parse) != key
+
+
+def test_used_utils_modules_are_part_of_the_key(parser_module):
+    module = parser_module(PARSER)
+    assert 'maguniverse.utils.sky_tiles' in table_cache._utils_dependencies(module.__name__)
+    # fetching and caching code does not change a parse
+    assert 'maguniverse.utils.fetch_ascii' not in \
+        table_cache._utils_dependencies('maguniverse.data.processed.liu2022')
+
+
+def test_cached_parse_round_trip(parser_module, raw_file, raw_cache):
+    parse = parser_module(PARSER).parse
+    first = cached_parse(str(raw_file), parse, 3)
+    second = cached_parse(str(raw_file), parse, 3)
+    assert get_table_cache_stats() == {'hits': 1, 'misses': 1}
+    pd.testing.assert_frame_equal(first, second)
+    assert second.attrs['units'] == {'x': 'pc'}
+    assert second.attrs['cache_key'] == first.attrs['cache_key']
+    assert get_default_table_cache().cache_dir == str(raw_cache / 'tables')
+
+
+def test_disabled_cache_always_parses(parser_module, raw_file, raw_cache):
+    parse = parser_module(PARSER).parse
+    table_cache.configure_table_cache(enabled=False)
+    try:
+        df = cached_parse(str(raw_file), parse)
+    finally:
+        table_cache.configure_table_cache()
+    assert 'cache_key' not in df.attrs
+    assert get_table_cache_stats() == {'hits': 0, 'misses': 0}
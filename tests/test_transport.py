@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+"""
+test_transport.py
+-----------
+
+Shared HTTP transport: retries, backoff and per-block overrides.
+"""
+
+import pytest
+import requests
+
+from maguniverse.utils import transport
+from maguniverse.utils.transport import http_get, transport_options
+
+URL = 'https://example.org/table.txt'
+
+
+class FakeSession():
+    """Session whose successive GETs return (or raise) the queued `answers`."""
+
+    def __init__(self, answers) -> None:
+        self.answers = list(answers)
+        self.calls = []
+        return
+
+    def get(self, url, headers=None, timeout=None, **kwargs):
+        self.calls.append({'url': url, 'timeout': timeout})
+        answer = self.answers.pop(0)
+        if isinstance(answer, Exception):
+            raise answer
+        return answer
+
+
+class Status():
+    def __init__(self, status_code) -> None:
+        self.status_code = status_code
+        self.closed = False
+        return
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Record backoff delays instead of sleeping; no jitter."""
+    delays = []
+    monkeypatch.setattr(transport.time, 'sleep', delays.append)
+    monkeypatch.setattr(transport.random, 'uniform', lambda low, high: 0.0)
+    return delays
+
+
+def _use(monkeypatch, session):
+    monkeypatch.setattr(transport, 'get_session', lambda: session)
+    return session
+
+
+def test_server_errors_are_retried_with_backoff(monkeypatch, sleeps):
+    first = Status(503)
+    session = _use(monkeypatch, FakeSession([first, Status(502), Status(200)]))
+    assert http_get(URL).status_code == 200
+    assert len(session.calls) == 3
+    assert sleeps == [0.5, 1.0]
+    assert first.closed
+
+
+def test_last_server_error_is_returned(monkeypatch, sleeps):
+    _use(monkeypatch, FakeSession([Status(500)] * 3))
+    assert http_get(URL).status_code == 500
+
+
+def test_client_errors_are_not_retried(monkeypatch, sleeps):
+    session = _use(monkeypatch, FakeSession([Status(404)]))
+    assert http_get(URL).status_code == 404
+    assert len(session.calls) == 1 and sleeps == []
+
+
+def test_connection_errors_raise_after_retries(monkeypatch, sleeps):
+    session = _use(monkeypatch, FakeSession([requests.ConnectionError('refused')] * 3))
+    with pytest.raises(requests.ConnectionError):
+        http_get(URL)
+    assert len(session.calls) == 3
+
+
+def test_backoff_is_capped(monkeypatch):
+    monkeypatch.setattr(transport.random, 'uniform', lambda low, high: high)
+    monkeypatch.setitem(transport._config, 'backoff_max', 2.0)
+    assert transport._backoff(0) == 0.5 + transport._config['jitter']
+    assert transport._backoff(10) == 2.0 + transport._config['jitter']
+
+
+def test_transport_options_apply_inside_block_only(monkeypatch, sleeps):
+    session = _use(monkeypatch, FakeSession([requests.Timeout('slow')] + [Status(200)] * 2))
+    with transport_options(retries=0, connect_timeout=3.0):
+        with pytest.raises(requests.Timeout):
+            http_get(URL)
+        assert session.calls[0]['timeout'] == (3.0, transport._config['timeout'])
+    http_get(URL)
+    assert session.calls[1]['timeout'] == transport._config['timeout']
+
+
+def test_session_is_shared_until_reconfigured():
+    session = transport.get_session()
+    assert transport.get_session() is session
+    assert session.get_adapter(URL) is session.get_adapter('https://other.org/')
+    try:
+        transport.configure_transport(retries=1)
+        assert transport.get_session() is not session
+        assert transport._config['retries'] == 1
+    finally:
+        transport.configure_transport()
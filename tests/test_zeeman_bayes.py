@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+"""
+test_zeeman_bayes.py
+-----------
+
+Grid likelihood of the Crutcher et al. (2010) model against direct
+quadrature of the per-measurement likelihood.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from maguniverse.analysis.zeeman_bayes import (zeeman_columns, zeeman_parameters,
+                                               projection_table, fit_zeeman)
+
+stats = pytest.importorskip('scipy.stats')
+integrate = pytest.importorskip('scipy.integrate')
+
+
+def kernel(b, b_z, sigma):
+    """Density of the measured B_Z for a total field b of isotropic direction."""
+    t = abs(b_z)
+    return (stats.norm.cdf((b - t) / sigma) - stats.norm.cdf((-b - t) / sigma)) / (2.0 * b)
+
+
+def direct_log_likelihood(n, b_z, sigma, b0, n0, alpha, f):
+    """Summed ln L, integrating the uniform B between f B_max and B_max by quadrature."""
+    total = 0.0
+    for n_i, b_z_i, sigma_i in zip(n, b_z, sigma):
+        b_max = b0 * (n_i / n0) ** alpha if n_i >= n0 else b0
+        value, _ = integrate.quad(kernel, f * b_max, b_max, args=(b_z_i, sigma_i),
+                                  points=[abs(b_z_i)], epsabs=0.0, epsrel=1e-10, limit=200)
+        total += np.log(value / ((1.0 - f) * b_max))
+    return total
+
+
+@pytest.fixture
+def measurements():
+    return pd.DataFrame({
+        zeeman_columns['n']: [50.0, 300.0, 2e3, 1.5e4, 8e4, 4e5, 1e3, 6e2],
+        zeeman_columns['b_z']: [4.0, -12.0, 25.0, 70.0, -3.0, 480.0, 8.0, np.nan],
+        zeeman_columns['sigma']: [1.5, 4.0, 6.0, 20.0, 9.0, 60.0, np.nan, 2.0],
+    }, index=[f"r{i}" for i in range(8)])
+
+
+def test_projection_table_matches_quadrature():
+    b_z = np.array([0.0, 5.0, -40.0, 300.0])
+    sigma = np.array([2.0, 1.0, 10.0, 50.0])
+    table = projection_table(b_z, sigma)
+    for row, (b_z_i, sigma_i) in enumerate(zip(b_z, sigma)):
+        for b in (0.5, 3.0, 47.0, 1e3):
+            expected, _ = integrate.quad(kernel, 0.0, b, args=(b_z_i, sigma_i),
+                                         points=[abs(b_z_i)] if abs(b_z_i) < b else None,
+                                         epsabs=0.0, epsrel=1e-10, limit=200)
+            found = table.lookup(np.array([[np.log(b)]]), rows=np.array([row]))[0, 0]
+            assert found == pytest.approx(expected, rel=1e-4)
+
+
+def test_grid_likelihood_matches_quadrature(measurements):
+    grid = {'B0': [5.0, 20.0], 'n0': [100.0, 1e4], 'alpha': [0.5, 0.7], 'f': [0.0, 0.6]}
+    fit = fit_zeeman(measurements, grid=grid)
+    usable = measurements.dropna()
+    n, b_z, sigma = (usable[zeeman_columns[name]].to_numpy() for name in ('n', 'b_z', 'sigma'))
+    for point in np.ndindex(fit.log_likelihood.shape):
+        values = [grid[name][i] for name, i in zip(zeeman_parameters, point)]
+        expected = direct_log_likelihood(n, b_z, sigma, *values)
+        assert fit.log_likelihood[point] == pytest.approx(expected, abs=1e-3)
+
+
+def test_unusable_rows_are_left_out(measurements):
+    fit = fit_zeeman(measurements, grid={'B0': [10.0], 'n0': [300.0], 'alpha': [0.65],
+                                         'f': [0.0]})
+    assert list(fit.rows) == ['r0', 'r1', 'r2', 'r3', 'r4', 'r5']
+    assert np.isfinite(fit.log_likelihood).all()
+
+
+def test_summary_and_best(measurements):
+    fit = fit_zeeman(measurements, grid={'B0': np.geomspace(2.0, 50.0, 9),
+                                         'n0': np.geomspace(50.0, 5e3, 7),
+                                         'alpha': np.linspace(0.4, 0.9, 6),
+                                         'f': [0.0, 0.5]})
+    assert fit.posterior.sum() == pytest.approx(1.0)
+    best = fit.best
+    assert fit.log_likelihood.max() == pytest.approx(
+        direct_log_likelihood(*(measurements.dropna()[zeeman_columns[name]].to_numpy()
+                                for name in ('n', 'b_z', 'sigma')),
+                              *(best[name] for name in zeeman_parameters)), abs=1e-3)
+    summary = fit.summary()
+    assert list(summary.index) == zeeman_parameters
+    assert (summary['p16'] <= summary['p84']).all()
+
+
+def test_invalid_grid(measurements):
+    with pytest.raises(ValueError):
+        fit_zeeman(measurements, grid={'f': [0.0, 1.0]})
+    with pytest.raises(ValueError):
+        fit_zeeman(measurements, grid={'B0': [0.0, 1.0]})